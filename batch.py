@@ -0,0 +1,132 @@
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tokenize
+from decimal import Decimal
+
+import sympy as sym
+
+from critical_points import GetCriticalPoints
+from expression_cache import expression_cache
+from float_interval import FloatInterval
+from interval import Interval
+
+
+# Формат задачи (одна строка JSON):
+# {"id": ..., "expression": "sin(x)", "interval": ["0", "3.5"], "e": "1e-8",
+#  "var": "x", "backend": "decimal" | "float", "adaptive_precision": true}
+# Обязательны expression, interval и e; концы и e лучше передавать строками - они разбираются как Decimal точно.
+BACKENDS = {'decimal': Interval, 'float': FloatInterval}
+
+# Ошибки разбора и решения одной задачи: записываются в её результат, обработка остальных задач продолжается
+PROBLEM_ERRORS = (ValueError, TypeError, KeyError, AttributeError, ArithmeticError, SyntaxError, tokenize.TokenError,
+                  sym.SympifyError)
+
+
+def _Endpoint(value):
+    # Точная десятичная запись конца: Decimal как есть, float - точное значение двоичного числа
+    if isinstance(value, float):
+        return str(Decimal(value))
+    return str(value)
+
+
+def SolveProblem(problem, cache=None):
+    """
+    Решает задачу problem (словарь в формате JSON Lines, см. выше) с помощью GetCriticalPoints(classify=True)
+    и возвращает словарь результата: id задачи, conversion, points - критические точки (концы интервалов
+    точными десятичными строками, тип экстремума, unique), parse_time и solve_time в секундах.
+    e используется как есть (без деления на 10, как в RunTest). Для backend = "decimal" по умолчанию
+    точность Interval выбирается по e (adaptive_precision), поэтому допустимы e меньше 1e-10.
+    """
+    if cache is None:
+        cache = expression_cache
+    start = time.perf_counter()
+    expression = cache.parse(problem['expression'])
+    var = sym.Symbol(problem.get('var', 'x'))
+    backend = BACKENDS[problem.get('backend', 'decimal')]
+    lower, upper = problem['interval']
+    interval = backend([str(lower), str(upper)])
+    e = Decimal(str(problem['e']))
+    if not e > 0:
+        raise ValueError("e must be positive")
+    parsed = time.perf_counter()
+
+    conversion, points = GetCriticalPoints(expression, interval, e, var, classify=True, cache=cache,
+                                           adaptive_precision=problem.get('adaptive_precision', True))
+    solved = time.perf_counter()
+    return {'id': problem.get('id'), 'conversion': conversion,
+            'points': [{'interval': [_Endpoint(point.interval[0]), _Endpoint(point.interval[1])],
+                        'type': str(point.type), 'unique': point.unique} for point in points],
+            'parse_time': parsed - start, 'solve_time': solved - parsed}
+
+
+def _SolveLine(numbered_line):
+    number, line = numbered_line
+    problem = {}
+    start = time.perf_counter()
+    try:
+        problem = json.loads(line)
+        if not isinstance(problem, dict):
+            raise TypeError("Problem must be a JSON object")
+        result = SolveProblem(problem)
+    except PROBLEM_ERRORS as error:
+        result = {'id': problem.get('id') if isinstance(problem, dict) else None,
+                  'error': f"{type(error).__name__}: {error}", 'time': time.perf_counter() - start}
+    result['line'] = number
+    return result
+
+
+def SolveStream(lines, workers=1, window=None):
+    """
+    Генератор результатов SolveProblem для задач из итерируемого lines (строки JSON; пустые строки
+    и строки, начинающиеся с #, пропускаются) в порядке входа. Ошибка в задаче не прерывает обработку:
+    её результат содержит поле error. В каждом результате есть номер строки line (с 1).
+    Входные строки читаются по мере обработки: при workers != 1 в работе одновременно не больше window
+    задач (по умолчанию 4 на процесс), поэтому память не зависит от размера входа. Следующая задача
+    отправляется в пул, как только выдан результат самой ранней, поэтому процессы не ждут самую трудную
+    задачу из группы, пока остальные задачи окна решаются.
+    """
+    numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip() and line[0] != '#')
+    if workers == 1:
+        yield from map(_SolveLine, numbered)
+        return
+
+    if window is None:
+        window = 4 * (workers or os.cpu_count())
+    with multiprocessing.Pool(workers) as pool:
+        pending = collections.deque()
+        for numbered_line in numbered:
+            pending.append(pool.apply_async(_SolveLine, (numbered_line,)))
+            if len(pending) >= window:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def RunBatch(input=sys.stdin, output=sys.stdout, workers=1):
+    """
+    Решает задачи JSON Lines из файла input и пишет в output по одной строке JSON на задачу сразу
+    после её решения. Возвращает количество задач с ошибками.
+    """
+    errors = 0
+    for result in SolveStream(input, workers):
+        errors += 'error' in result
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+    return errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Поиск критических точек для задач в формате JSON Lines")
+    parser.add_argument('input', nargs='?', default='-', help="файл задач (по умолчанию stdin)")
+    parser.add_argument('--output', '-o', default='-', help="файл результатов (по умолчанию stdout)")
+    parser.add_argument('--workers', type=int, default=1, help="количество процессов (0 - по числу ядер)")
+    args = parser.parse_args()
+    with (open(args.input) if args.input != '-' else sys.stdin) as input_file, \
+            (open(args.output, 'w') if args.output != '-' else sys.stdout) as output_file:
+        errors = RunBatch(input_file, output_file, args.workers or None)
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,611 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import sys
+import time
+import timeit
+
+from copy import deepcopy
+
+from decimal import *
+
+import sympy as sym
+
+import interval as interval_lib
+from interval import Interval
+from float_interval import FloatInterval
+from interval_array import IntervalArray
+from critical_points import (GetCriticalPoints, GetGlobalMinimum, SimpleNewtonInterval, HybridNewtonInterval, Extrema,
+                             CUSTOM_MODULES, ARRAY_MODULES)
+from intervals import Intervals
+from expression_tape import ExpressionTape, CompileFunctions
+from jet import JetDerivatives
+from expression_cache import ExpressionCache
+from multivariate import IntervalVector, GetCriticalPointsND
+from main import ReadTests, ParseTest
+
+
+def _LegacyDecPi():
+    curcontext = getcontext().copy()
+    getcontext().prec += 10
+    getcontext().rounding = ROUND_HALF_EVEN
+    three = Decimal("3")
+    lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+    while s != lasts:
+        lasts = s
+        n, na = n + na, na + 8
+        d, da = d + da, da + 32
+        t = (t * n) / d
+        s += t
+    setcontext(curcontext)
+    return +s
+
+
+def _LegacyDecSin(x):
+    curcontext = getcontext().copy()
+    getcontext().prec += 10
+    getcontext().rounding = ROUND_HALF_EVEN
+    while x > 0:
+        x -= Decimal("2") * _LegacyDecPi()
+    while x < 0:
+        x += Decimal("2") * _LegacyDecPi()
+    i, lasts, s, fact, num, sign = 1, 0, x, 1, x, 1
+    while s != lasts:
+        lasts = s
+        i += 2
+        fact *= i * (i - 1)
+        num *= x * x
+        sign *= -1
+        s += num / fact * sign
+    setcontext(curcontext)
+    return +s
+
+
+def _LegacyIntervalSin(x):
+    ed = Decimal(interval_lib.quantizestring(Interval.precision))
+    with localcontext(Context(prec=Interval.calcprecision, Emax=MAX_EMAX, Emin=MIN_EMIN, traps=[])):
+        getcontext().rounding = ROUND_FLOOR
+        yrd = [_LegacyDecSin(x[0]) - ed, _LegacyDecSin(x[1]) - ed]
+        getcontext().rounding = ROUND_CEILING
+        yru = [_LegacyDecSin(x[0]) + ed, _LegacyDecSin(x[1]) + ed]
+        pi2 = Decimal("2") * _LegacyDecPi()
+        pi05 = _LegacyDecPi() / Decimal("2")
+        if ((x[0] - pi05) / pi2).quantize(Decimal("1"), rounding=ROUND_CEILING) <= ((x[1] - pi05) / pi2).quantize(
+                Decimal("1"), rounding=ROUND_FLOOR):
+            b = Decimal("1")
+        else:
+            b = max(yru)
+        if ((x[0] + pi05) / pi2).quantize(Decimal("1"), rounding=ROUND_CEILING) <= ((x[1] + pi05) / pi2).quantize(
+                Decimal("1"), rounding=ROUND_FLOOR):
+            a = Decimal("-1")
+        else:
+            a = min(yrd)
+    return Interval([a, b])
+
+
+def _Measure(func, args, number):
+    return min(timeit.repeat(lambda: [func(arg) for arg in args], number=number, repeat=3)) / (number * len(args))
+
+
+def _PrintComparison(name, old, new):
+    print(f"{name:<32} old {old * 1e6:10.1f} us   new {new * 1e6:10.1f} us   speedup x{old / new:.1f}")
+
+
+def BenchTrigKernels(number=20):
+    """
+    Сравнивает время вычисления decsin и Interval.sin с реализацией на рядах Тейлора
+    без кэширования числа Пи и с приведением аргумента циклом
+    """
+    points = [Decimal(v) for v in ('0.3', '2.5', '-7.25', '18.6', '-42.01', '125.125')]
+    boxes = [Interval([v, v + Decimal('0.01')]) for v in points]
+
+    with localcontext(Context(prec=Interval.calcprecision)):
+        _PrintComparison("decpi", _Measure(lambda _: _LegacyDecPi(), [None], number),
+                         _Measure(lambda _: interval_lib.decpi(), [None], number))
+        _PrintComparison("decsin", _Measure(_LegacyDecSin, points, number),
+                         _Measure(interval_lib.decsin, points, number))
+    _PrintComparison("Interval.sin", _Measure(_LegacyIntervalSin, boxes, number),
+                     _Measure(Interval.sin, boxes, number))
+
+
+def _NewtonOperatorMix(box, point):
+    derivative = box * box * 3 - box * 2 + 1
+    value = point * point * point - point * point + point
+    return point - value / derivative
+
+
+_legacy_contexts = {}
+
+
+def _LegacyContexts():
+    if Interval.calcprecision not in _legacy_contexts:
+        _legacy_contexts[Interval.calcprecision] = (interval_lib.deccontext(Interval.calcprecision, ROUND_FLOOR),
+                                                    interval_lib.deccontext(Interval.calcprecision, ROUND_CEILING))
+    return _legacy_contexts[Interval.calcprecision]
+
+
+def _LegacyIntervalMul(x, y):
+    floor, ceil = _LegacyContexts()
+    y = Interval.valueToInterval(y)
+    vrd = [floor.multiply(x[0], y[0]), floor.multiply(x[0], y[1]),
+           floor.multiply(x[1], y[0]), floor.multiply(x[1], y[1])]
+    vru = [ceil.multiply(x[0], y[0]), ceil.multiply(x[0], y[1]),
+           ceil.multiply(x[1], y[0]), ceil.multiply(x[1], y[1])]
+    return Interval([min(vrd), max(vru)])
+
+
+def _LegacyNullType(x):
+    if x[0].is_nan() or x[1].is_nan():
+        return 4
+    if not x.isAround('0'):
+        return 0
+    return 3 if interval_lib.decsig(x[0]) != interval_lib.decsig(x[1]) else 2 if interval_lib.decsig(x[0]) == 1 else 1
+
+
+def _LegacyIntervalDiv(x, y):
+    # Только делители без нуля: ветка с четырьмя делениями
+    floor, ceil = _LegacyContexts()
+    y = Interval.valueToInterval(y)
+    _LegacyNullType(x), _LegacyNullType(y)
+    vrd = [floor.divide(x[0], y[0]), floor.divide(x[0], y[1]), floor.divide(x[1], y[0]), floor.divide(x[1], y[1])]
+    vru = [ceil.divide(x[0], y[0]), ceil.divide(x[0], y[1]), ceil.divide(x[1], y[0]), ceil.divide(x[1], y[1])]
+    vrd = [i for i in vrd if not i.is_nan()]
+    vru = [i for i in vru if not i.is_nan()]
+    return Interval([min(vrd), max(vru)])
+
+
+def _LegacyIntervalPow(x, n):
+    # Только целые степени с точкой в показателе
+    floor, ceil = _LegacyContexts()
+    n = Interval.valueToInterval(n)[0]
+    if interval_lib.deciseven(n) and interval_lib.decsig(x[0]) != interval_lib.decsig(x[1]):
+        return Interval([0, max(ceil.power(x[0], n), ceil.power(x[1], n))])
+    return Interval([min(floor.power(x[0], n), floor.power(x[1], n)), max(ceil.power(x[0], n), ceil.power(x[1], n))])
+
+
+def _LegacyNewtonOperatorMix(box, point):
+    derivative = _LegacyIntervalMul(_LegacyIntervalMul(box, box), 3) - _LegacyIntervalMul(box, 2) + 1
+    square = _LegacyIntervalMul(point, point)
+    value = _LegacyIntervalMul(square, point) - square + point
+    return point - _LegacyIntervalDiv(value, derivative)
+
+
+def BenchIntervalKernels(number=200):
+    """
+    Сравнивает умножение, деление и целую степень Interval по таблицам знаков концов
+    с вычислением всех произведений (частных, степеней) концов и выбором min/max,
+    а также смесь операций одного шага Ньютона
+    """
+    boxes = [Interval(ends) for ends in (['0.5', '0.75'], ['-0.75', '-0.5'], ['-0.25', '0.5'])]
+    pairs = [(x, y) for x in boxes for y in boxes]
+    divisors = [(x, y) for x, y in pairs if not y.isAround('0')]
+    powers = [(x, n) for x in boxes for n in (2, 3)]
+    _PrintComparison("Interval.__mul__", _Measure(lambda p: _LegacyIntervalMul(*p), pairs, number),
+                     _Measure(lambda p: p[0] * p[1], pairs, number))
+    _PrintComparison("Interval.__truediv__", _Measure(lambda p: _LegacyIntervalDiv(*p), divisors, number),
+                     _Measure(lambda p: p[0] / p[1], divisors, number))
+    _PrintComparison("Interval.__pow__", _Measure(lambda p: _LegacyIntervalPow(*p), powers, number),
+                     _Measure(lambda p: p[0] ** p[1], powers, number))
+    box = boxes[0]
+    point = Interval.valueToInterval(box.mid())
+    _PrintComparison("Newton operator mix", _Measure(lambda _: _LegacyNewtonOperatorMix(box, point), [None], number),
+                     _Measure(lambda _: _NewtonOperatorMix(box, point), [None], number))
+
+
+def _LegacyQuantizeString(cnt):
+    strquant = '0'
+    if (cnt <= 0):
+        return '1'
+    strquant = strquant + '.'
+    for i in range(cnt - 1):
+        strquant = strquant + '0'
+    strquant = strquant + '1'
+    return strquant
+
+
+def BenchQuantization(number=200):
+    """
+    Сравнивает получение единицы precision-го знака циклом со строками и из кэша decquantum,
+    а также смесь операций одного шага Ньютона и поиск критических точек с округлением концов
+    до precision знаков в каждой операции и с отложенным округлением (Interval.deferredquantization)
+    """
+    _PrintComparison("quantum", _Measure(lambda _: Decimal(_LegacyQuantizeString(Interval.precision)), [None], number),
+                     _Measure(lambda _: interval_lib.decquantum(Interval.precision), [None], number))
+
+    box = Interval(['0.5', '0.75'])
+    point = Interval.valueToInterval(box.mid())
+    eager = _Measure(lambda _: _NewtonOperatorMix(box, point), [None], number)
+    with Interval.deferredquantization():
+        lazy = _Measure(lambda _: _NewtonOperatorMix(box, point), [None], number)
+    _PrintComparison("Newton operator mix", eager, lazy)
+
+    x = sym.Symbol('x')
+    expression = sym.sin(x) + sym.sin(10 * x / 3)
+    for hybrid in (True, False):
+        eager, lazy = [_Measure(lambda _: GetCriticalPoints(expression, Interval(['-2.7', '7.5']), Decimal('1e-8'),
+                                                            hybrid=hybrid, lazy_quantization=deferred), [None], 1)
+                       for deferred in (False, True)]
+        _PrintComparison("Hybrid Newton" if hybrid else "Simple Newton", eager, lazy)
+
+
+def BenchBackends(number=200):
+    """
+    Сравнивает интервальную арифметику на Decimal (Interval) и на float (FloatInterval):
+    смесь операций одного шага Ньютона и полный поиск критических точек
+    """
+    for_backend = {}
+    for backend in (Interval, FloatInterval):
+        box = backend(['0.5', '0.75'])
+        point = backend.valueToInterval(box.mid())
+        for_backend[backend] = _Measure(lambda _: _NewtonOperatorMix(box, point), [None], number)
+    _PrintComparison("Newton operator mix", for_backend[Interval], for_backend[FloatInterval])
+
+    x = sym.Symbol('x')
+    problems = [(sym.sin(x) + sym.sin(10 * x / 3), ['-2.7', '7.5'], Decimal('1e-5')),
+                ((3 * x - sym.Rational(7, 5)) * sym.sin(18 * x), ['0', '1.2'], Decimal('1e-4')),
+                (-sym.exp(-x) * sym.sin(2 * sym.pi * x), ['0', '4'], Decimal('1e-4'))]
+    for expression, ends, e in problems:
+        for_backend = {}
+        for backend in (Interval, FloatInterval):
+            for_backend[backend] = _Measure(lambda _: GetCriticalPoints(expression, backend(ends), e), [None], 1)
+        _PrintComparison(str(expression)[:32], for_backend[Interval], for_backend[FloatInterval])
+
+
+def BenchIntervalArray(sizes=(100, 1000, 10000)):
+    """
+    Сравнивает вычисление второй производной sin(x) + sin(10x/3) на поколении из size подынтервалов:
+    по одному подынтервалу через Intervals из FloatInterval и одной операцией над IntervalArray
+    """
+    x = sym.Symbol('x')
+    second_diff = sym.diff(sym.sin(x) + sym.sin(10 * x / 3), x, 2)
+    scalar_func = sym.utilities.lambdify(x, second_diff, modules=CUSTOM_MODULES)
+    array_func = sym.utilities.lambdify(x, second_diff, modules=ARRAY_MODULES)
+    for size in sizes:
+        edges = [-2.7 + 10.2 * i / size for i in range(size + 1)]
+        boxes = [FloatInterval([edges[i], edges[i + 1]]) for i in range(size)]
+        array = IntervalArray.fromIntervals(boxes)
+        scalar = _Measure(lambda box: scalar_func(Intervals([box])), boxes, 1) * size
+        vectorized = _Measure(lambda _: array_func(array), [None], 5)
+        _PrintComparison(f"{size} boxes", scalar, vectorized)
+
+
+class _LegacyIntervals:
+    def __init__(self, intervals):
+        self.data = deepcopy(intervals)
+        self._normalize()
+
+    def union(self, intervals):
+        for interval in intervals:
+            self.data.append(type(interval)(interval.x.copy()))
+        self._normalize()
+
+    def intersect(self, intervals):
+        result = []
+        for new_interval in intervals:
+            for old_interval in self.data:
+                left_end = max(old_interval[0], new_interval[0])
+                right_end = min(old_interval[1], new_interval[1])
+                if left_end <= right_end:
+                    result.append(type(old_interval)([left_end, right_end]))
+        self.data = result
+        self._normalize()
+
+    def _normalize(self):
+        self.data.sort(key=lambda x: x[0])
+        normalized = []
+        for interval in self.data:
+            if normalized and normalized[-1][1] >= interval[0]:
+                normalized[-1] = type(interval)([normalized[-1][0], max(normalized[-1][1], interval[1])])
+            else:
+                normalized.append(interval)
+        self.data = normalized
+
+
+def _BuildAndIntersect(make, size):
+    boxes = [FloatInterval([4 * i, 4 * i + 1]) for i in range(size)]
+    random.Random(size).shuffle(boxes)
+    result = make([])
+    for box in boxes:
+        result.union([box])
+    mask = make([FloatInterval([8 * i + 0.5, 8 * i + 4.5]) for i in range(size // 2)])
+    result.intersect(mask.data)
+    return result
+
+
+def BenchIntervalsScaling(legacy_sizes=(500, 1000, 2000), sizes=(1000, 10000, 100000)):
+    """
+    Время построения Intervals из size подынтервалов поштучными union и пересечения
+    с набором из size / 2 подынтервалов: прежняя реализация (deepcopy, сортировка на каждую вставку,
+    декартово произведение при пересечении) и реализация со слиянием упорядоченных наборов
+    """
+    def make(intervals):
+        return Intervals(intervals, FloatInterval)
+
+    for size in legacy_sizes:
+        elapsed = _Measure(lambda _: _BuildAndIntersect(_LegacyIntervals, size), [None], 1)
+        print(f"legacy Intervals, {size:>6} boxes   {elapsed * 1e3:10.1f} ms")
+    for size in sizes:
+        elapsed = _Measure(lambda _: _BuildAndIntersect(make, size), [None], 1)
+        print(f"Intervals,        {size:>6} boxes   {elapsed * 1e3:10.1f} ms")
+
+
+def _CountCalls(func, counter):
+    def counted(x):
+        counter[0] += 1
+        return func(x)
+    return counted
+
+
+def BenchHybridNewton(backend=FloatInterval):
+    """
+    Сравнивает SimpleNewtonInterval (проход по всем подынтервалам поколения, остановка при отсутствии сужения)
+    и HybridNewtonInterval (очередь с приоритетом и деление пополам): сходимость, время
+    и количество вычислений производной
+    """
+    x = sym.Symbol('x')
+    problems = [(x**6 / 6 - x**5 * sym.Rational(52, 25) + x**4 * sym.Rational(39, 80) + x**3 * sym.Rational(71, 10)
+                 - x**2 * sym.Rational(79, 20) - x + sym.Rational(1, 10), ['-1.5', '11'], Decimal('1e-5')),
+                (-(x + sym.sin(x)) * sym.exp(-x**2), ['-10', '10'], Decimal('1e-4')),
+                (sym.sin(x) + sym.sin(10 * x / 3), ['-2.7', '7.5'], Decimal('1e-5')),
+                (x**6 - 15 * x**4 + 27 * x**2 + 250, ['-4', '4'], Decimal('1e-4'))]
+    for expression, ends, e in problems:
+        diff = sym.diff(expression, x)
+        func = sym.utilities.lambdify(x, diff, modules=CUSTOM_MODULES)
+        interval_diff = sym.utilities.lambdify(x, sym.diff(diff, x), modules=CUSTOM_MODULES)
+        report = []
+        for solver in (SimpleNewtonInterval, HybridNewtonInterval):
+            counter = [0]
+            counted = _CountCalls(func, counter)
+            conversion, _ = solver(counted, interval_diff, backend(ends), e)
+            elapsed = _Measure(lambda _: solver(func, interval_diff, backend(ends), e), [None], 1)
+            report.append(f"{conversion!s:>5} {counter[0]:6} evals {elapsed * 1e3:8.1f} ms")
+        print(f"{str(expression)[:32]:<32} simple {report[0]}   hybrid {report[1]}")
+
+
+def _MinimumFromCriticalPoints(expression, interval, e, var):
+    function = sym.utilities.lambdify(var, expression, modules=CUSTOM_MODULES)
+    _, points = GetCriticalPoints(expression, interval, e, var, classify=True)
+    candidates = [point.interval for point in points if point.type != Extrema.Maximum]
+    return min(candidates, key=lambda candidate: function(Intervals([candidate]))[0][0])
+
+
+def BenchGlobalMinimum(backend=Interval):
+    """
+    Сравнивает поиск глобального минимума через все критические точки (GetCriticalPoints с classify=True
+    и выбор наименьшего значения) и методом ветвей и границ GetGlobalMinimum на осциллирующих функциях
+    """
+    x = sym.Symbol('x')
+    problems = [(sym.sin(x) + sym.sin(10 * x / 3), ['-2.7', '7.5'], Decimal('1e-4')),
+                ((3 * x - sym.Rational(7, 5)) * sym.sin(18 * x), ['0', '1.2'], Decimal('1e-4')),
+                (-sym.exp(-x) * sym.sin(2 * sym.pi * x), ['0', '4'], Decimal('1e-4')),
+                (sym.sin(x) + sym.sin(2 * x / 3), ['3.1', '20.4'], Decimal('1e-4')),
+                (sym.sin(x) * sym.cos(7 * x) + x / 10, ['-10', '10'], Decimal('1e-4'))]
+    for expression, ends, e in problems:
+        old = _Measure(lambda _: _MinimumFromCriticalPoints(expression, backend(ends), e, x), [None], 1)
+        new = _Measure(lambda _: GetGlobalMinimum(expression, backend(ends), e, x), [None], 1)
+        _PrintComparison(str(expression)[:32], old, new)
+
+
+def BenchExpressionTape(backend=Interval, number=5):
+    """
+    Сравнивает вычисление f' и f'' на подынтервале двумя функциями lambdify и одним проходом ExpressionTape
+    (общие подвыражения, заранее переведённые константы); печатает также количество операций
+    """
+    x = sym.Symbol('x')
+    expressions = [-(x + sym.sin(x)) * sym.exp(-x**2), (3 * x - sym.Rational(7, 5)) * sym.sin(18 * x),
+                   -sym.exp(-x) * sym.sin(2 * sym.pi * x), sym.sin(x)**3 + sym.cos(x)**3,
+                   (x**2 - 5 * x + 6) / (x**2 + 1)]
+    boxes = [backend([Decimal(i) / 7, Decimal(i) / 7 + Decimal('0.01')]) for i in range(1, 8)]
+    for expression in expressions:
+        diff = sym.diff(expression, x)
+        second_diff = sym.diff(diff, x)
+        diff_func = sym.utilities.lambdify(x, diff, modules=CUSTOM_MODULES)
+        second_diff_func = sym.utilities.lambdify(x, second_diff, modules=CUSTOM_MODULES)
+        tape = ExpressionTape([diff, second_diff], x, backend)
+
+        old = _Measure(lambda box: (diff_func(Intervals([box])), second_diff_func(Intervals([box]))), boxes, number)
+        new = _Measure(lambda box: tape(Intervals([box])), boxes, number)
+        operations = sym.count_ops(diff) + sym.count_ops(second_diff)
+        _PrintComparison(f"{str(expression)[:20]:<20} {operations:3}->{tape.operations:3} ops", old, new)
+
+
+def BenchAutodiff(backends=(Interval, FloatInterval)):
+    """
+    Сравнивает символьные производные (sym.diff и ExpressionTape для f', f'') с прямым автоматическим
+    дифференцированием (JetDerivatives): время подготовки и полный поиск критических точек
+    """
+    x = sym.Symbol('x')
+    expressions = [(-(x + sym.sin(x)) * sym.exp(-x**2), ['-10', '10']),
+                   ((3 * x - sym.Rational(7, 5)) * sym.sin(18 * x), ['0', '1.2']),
+                   (-sym.exp(-x) * sym.sin(2 * sym.pi * x), ['0', '4']),
+                   (sym.exp(sym.sin(3 * x)) * sym.cos(x**2) / (x**2 + 1), ['-3', '3'])]
+
+    def symbolic(expression, backend):
+        diff = sym.diff(expression, x)
+        return CompileFunctions([diff, sym.diff(diff, x)], x, backend)
+
+    for expression, ends in expressions:
+        sym.core.cache.clear_cache()
+        old = _Measure(lambda _: symbolic(expression, Interval), [None], 1)
+        sym.core.cache.clear_cache()
+        new = _Measure(lambda _: JetDerivatives(expression, x, Interval), [None], 1)
+        _PrintComparison(f"setup {str(expression)[:26]}", old, new)
+        for backend in backends:
+            e = Decimal('1e-4')
+            old = _Measure(lambda _: GetCriticalPoints(expression, backend(ends), e, x), [None], 1)
+            new = _Measure(lambda _: GetCriticalPoints(expression, backend(ends), e, x, autodiff=True), [None], 1)
+            _PrintComparison(f"solve {backend.__name__}", old, new)
+
+
+def BenchExpressionCache(backend=FloatInterval):
+    """
+    Сравнивает повторный поиск критических точек одной и той же функции без кэша (производные и компиляция
+    каждый раз заново) и с ExpressionCache, в котором они уже есть
+    """
+    x = sym.Symbol('x')
+    expressions = [((x**2 - 5 * x + 6) / (x**2 + 1), ['-5', '5']),
+                   ((3 * x - sym.Rational(7, 5)) * sym.sin(18 * x), ['0', '1.2']),
+                   (sym.exp(sym.sin(3 * x)) * sym.cos(x**2) / (x**2 + 1), ['-3', '3'])]
+    e = Decimal('1e-4')
+    for expression, ends in expressions:
+        def cold(_):
+            sym.core.cache.clear_cache()
+            return GetCriticalPoints(expression, backend(ends), e, x, cache=ExpressionCache())
+        cache = ExpressionCache()
+        old = _Measure(cold, [None], 1)
+        new = _Measure(lambda _: GetCriticalPoints(expression, backend(ends), e, x, cache=cache), [None], 1)
+        _PrintComparison(f"cache {str(expression)[:26]}", old, new)
+
+
+def BenchMultivariate(dimensions=(2, 3, 4, 6, 8, 10), backend=FloatInterval, e=Decimal('1e-6')):
+    """
+    Масштабирование GetCriticalPointsND по размерности: количество обработанных брусов, найденных
+    критических точек и время для деления по самой широкой координате и по наибольшему изменению градиента.
+    (производные компилируются до замера). Функция Розенброка (узкий изогнутый овраг) считается
+    только до размерности 3: число брусов растет с размерностью слишком быстро
+    """
+    for n in dimensions:
+        variables = sym.symbols(f'x0:{n}')
+        problems = [('trid', sum((v - 1)**2 for v in variables)
+                     - sum(variables[i] * variables[i - 1] for i in range(1, n)), [-n * n, n * n]),
+                    ('cosmix', sum(v**2 for v in variables) / 2
+                     + sum(sym.cos(variables[i]) * sym.sin(variables[i - 1]) for i in range(1, n)) / 4, [-3, 3])]
+        if n <= 3:
+            problems.append(('rosenbrock', sum(100 * (variables[i + 1] - variables[i]**2)**2 + (1 - variables[i])**2
+                                               for i in range(n - 1)), [-2, 2]))
+        for name, expression, ends in problems:
+            GetCriticalPointsND(expression, IntervalVector([ends] * n, backend), e, variables, max_boxes=0)
+            report = []
+            for split in ('widest', 'smear'):
+                output = io.StringIO()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(output):
+                    conversion, points = GetCriticalPointsND(expression, IntervalVector([ends] * n, backend), e,
+                                                             variables, split=split, _debug=True)
+                elapsed = time.perf_counter() - start
+                boxes = int(output.getvalue().split()[1])
+                report.append(f"{conversion!s:>5} {boxes:6} boxes {len(points):3} points {elapsed * 1e3:9.1f} ms")
+            print(f"{name:<10} n = {n:<2}  widest {report[0]}   smear {report[1]}")
+
+
+def SyntheticProblems():
+    """
+    Масштабированные задачи для RunBenchmarkSuite: список (имя, выражение, [левый конец, правый конец], e) -
+    широкие интервалы, много критических точек, малое e и многочлены высокой степени
+    """
+    x = sym.Symbol('x')
+    return [('wide sin(x) + sin(10x/3)', sym.sin(x) + sym.sin(10 * x / 3), [-60.0, 60.0], Decimal('1e-6')),
+            ('wide -x*sin(x)', -x * sym.sin(x), [-100.0, 100.0], Decimal('1e-6')),
+            ('roots (x - 1/3)*sin(40x)', (x - sym.Rational(1, 3)) * sym.sin(40 * x), [0.0, 6.0], Decimal('1e-6')),
+            ('roots cos(x**2)', sym.cos(x**2), [0.0, 12.0], Decimal('1e-6')),
+            ('tight (x**2 - 5x + 6)/(x**2 + 1)', (x**2 - 5 * x + 6) / (x**2 + 1), [-5.0, 5.0], Decimal('1e-9')),
+            ('tight sin(x)**3 + cos(x)**3', sym.sin(x)**3 + sym.cos(x)**3, [-3.0, 3.0], Decimal('1e-9')),
+            ('degree 12 Chebyshev', sym.expand(sym.chebyshevt(12, x)), [-1.0, 1.0], Decimal('1e-7')),
+            ('degree 8 Wilkinson', sym.expand(sym.prod([x - k for k in range(1, 9)])), [0.0, 9.0], Decimal('1e-7'))]
+
+
+def CompareWithBaseline(report, baseline, threshold=0.25, min_time=0.005):
+    """
+    Сравнивает отчет RunBenchmarkSuite с сохраненным отчетом baseline (словарь или путь к файлу JSON).
+    Регрессия - рост времени, числа итераций, наибольшего числа подынтервалов или операций больше чем
+    в 1 + threshold раз (время сравнивается, только если в baseline оно не меньше min_time секунд),
+    а также потеря сходимости. Возвращает список (задача, метрика, было, стало).
+    """
+    if not isinstance(baseline, dict):
+        with open(baseline) as file:
+            baseline = json.load(file)
+    regressions = []
+    for name, result in report['problems'].items():
+        old = baseline['problems'].get(name)
+        if old is None:
+            continue
+        if old['conversion'] and not result['conversion']:
+            regressions.append((name, 'conversion', True, False))
+        for metric in ('time', 'iterations', 'peak_boxes', 'operations'):
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None or (metric == 'time' and before < min_time):
+                continue
+            if after > before * (1 + threshold):
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def RunBenchmarkSuite(file='all_tests.txt', output=None, baseline=None, threshold=0.25, backend=Interval, repeat=3,
+                      synthetic=True):
+    """
+    Запускает GetCriticalPoints на тестах из file и (synthetic = True) на SyntheticProblems и для каждой задачи
+    записывает время (лучшее из repeat запусков, производные уже скомпилированы), сходимость, число критических
+    точек, число итераций и наибольшее число подынтервалов в очереди HybridNewtonInterval и число выполненных
+    операций лент ExpressionTape. Отчет сохраняется в output (JSON), если он задан, и сравнивается с baseline
+    (см. CompareWithBaseline). Возвращает пару (report, regressions).
+    """
+    problems = []
+    for index, test in enumerate(ReadTests(file)):
+        expression, ends, e, _ = ParseTest(test)
+        problems.append((f"test {index}", expression, ends, e / 10))
+    if synthetic:
+        problems.extend(SyntheticProblems())
+
+    results = {}
+    for name, expression, ends, e in problems:
+        GetCriticalPoints(expression, backend(ends), e)
+        times = []
+        for _ in range(repeat):
+            stats = {}
+            executed = ExpressionTape.executed
+            start = time.perf_counter()
+            conversion, points = GetCriticalPoints(expression, backend(ends), e, stats=stats)
+            times.append(time.perf_counter() - start)
+        results[name] = {'expression': str(expression), 'interval': ends, 'e': str(e), 'conversion': conversion,
+                         'points': len(points) - 2, 'time': min(times), 'iterations': stats.get('iterations'),
+                         'peak_boxes': stats.get('peak_boxes'), 'operations': ExpressionTape.executed - executed}
+        result = results[name]
+        print(f"{name:<34} {conversion!s:>5} {result['points']:4} points {result['time'] * 1e3:9.1f} ms "
+              f"{result['iterations']:7} iterations {result['peak_boxes']:5} boxes {result['operations']:9} operations")
+
+    report = {'backend': backend.__name__, 'problems': results,
+              'total_time': math.fsum(result['time'] for result in results.values())}
+    print(f"Total time {report['total_time']:.3f} s")
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    regressions = []
+    if baseline is not None:
+        regressions = CompareWithBaseline(report, baseline, threshold)
+        for name, metric, before, after in regressions:
+            print(f"Regression {name}: {metric} {before} -> {after}")
+        if not regressions:
+            print("No regressions")
+    return report, regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Бенчмарки интервальных вычислений")
+    parser.add_argument('--suite', action='store_true', help="запустить RunBenchmarkSuite вместо микробенчмарков")
+    parser.add_argument('--tests', default='all_tests.txt', help="файл тестов для RunBenchmarkSuite")
+    parser.add_argument('--output', help="файл JSON для отчета")
+    parser.add_argument('--baseline', help="отчет JSON для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.25, help="допустимый относительный рост метрик")
+    parser.add_argument('--float', action='store_true', help="FloatInterval вместо Interval")
+    args = parser.parse_args()
+    if args.suite:
+        _, regressions = RunBenchmarkSuite(args.tests, args.output, args.baseline, args.threshold,
+                                           FloatInterval if args.float else Interval)
+        sys.exit(1 if regressions else 0)
+
+    BenchTrigKernels()
+    BenchIntervalKernels()
+    BenchQuantization()
+    BenchBackends()
+    BenchIntervalArray()
+    BenchIntervalsScaling()
+    BenchHybridNewton()
+    BenchGlobalMinimum()
+    BenchExpressionTape()
+    BenchAutodiff()
+    BenchExpressionCache()
+    BenchMultivariate()
@@ -1,34 +1,160 @@
 import collections
+import contextlib
 import enum
+import heapq
+import itertools
+import math
+import multiprocessing
+import os
+import queue as queue_lib
 
 import sympy as sym
 import numpy
 
 import interval as interval_lib
 from intervals import *
+from interval_array import IntervalArray, round_down, round_up, array_sin, array_cos, array_exp, array_log, \
+    array_sqrt, array_tan, array_atan, array_sinh, array_cosh
+from expression_cache import BackendPrecision, expression_cache
+from jet import JetDerivatives
+from instrumentation import IterationInfo
 
-CUSTOM_MODULES = [{'sin': intervals_sin, 'cos': intervals_cos, 'exp': intervals_exp, 'ln': intervals_ln}, 'numpy']
+CUSTOM_MODULES = [{'sin': intervals_sin, 'cos': intervals_cos, 'exp': intervals_exp, 'ln': intervals_ln,
+                   'log': intervals_ln, 'sqrt': intervals_sqrt, 'tan': intervals_tan, 'arctan': intervals_atan,
+                   'sinh': intervals_sinh, 'cosh': intervals_cosh, 'abs': abs}, 'numpy']
+ARRAY_MODULES = [{'sin': array_sin, 'cos': array_cos, 'exp': array_exp, 'log': array_log, 'sqrt': array_sqrt,
+                  'tan': array_tan, 'arctan': array_atan, 'sinh': array_sinh, 'cosh': array_cosh, 'abs': abs}, 'numpy']
 
+# Наименьшая точность e, при которой решение по умолчанию (DefaultBackend) ведется во FloatInterval:
+# погрешность float64 (около 1e-16 относительно значений) намного меньше e, а операции FloatInterval
+# быстрее Decimal. Для более мелких e нужна управляемая точность Interval
+FLOAT_BACKEND_MIN_E = Decimal('1e-10')
 
-def SimpleNewtonInterval(func, interval_diff, interval, e, _debug=False):
+
+def DefaultBackend(e):
+    """
+    Класс интервалов по умолчанию для точности e: FloatInterval при e >= FLOAT_BACKEND_MIN_E, иначе Interval
+    """
+    return FloatInterval if Decimal(str(e)) >= FLOAT_BACKEND_MIN_E else interval_lib.Interval
+
+
+def _NewtonImage(func, interval_diff, result_interval, point, area=None, value=None):
+    # N(X) = m - f(m) / f'(X); если f'(X) содержит 0, деление расширенное и N(X) - два луча со щелью
+    backend = type(result_interval)
+    if area is None:
+        area = interval_diff(value_to_intervals(result_interval))
+    area = value_to_intervals(area, backend)
+
+    middle = value_to_intervals(point, backend)
+    if value is None:
+        value = func(middle)
+    value = value_to_intervals(value, backend)
+    part_to_intersect = -value / area
+    part_to_intersect = part_to_intersect + middle
+    return part_to_intersect, value, area
+
+
+def _KrawczykImage(func, interval_diff, result_interval, point, area=None, value=None):
+    # K(X) = m - Y f(m) + (1 - Y f'(X))(X - m), Y = 1 / mid f'(X). Если f'(X) содержит 0, K(X) не уже X,
+    # поэтому используется N(X) с расширенным делением: подынтервал делится по щели вокруг m
+    backend = type(result_interval)
+    if area is None:
+        area = interval_diff(value_to_intervals(result_interval))
+    area = value_to_intervals(area, backend)
+    lower, upper = _Hull(area)
+    if not (math.isfinite(lower) and math.isfinite(upper)) or lower <= 0 <= upper:
+        return _NewtonImage(func, interval_diff, result_interval, point, area, value)
+
+    middle = value_to_intervals(point, backend)
+    if value is None:
+        value = func(middle)
+    value = value_to_intervals(value, backend)
+    inverse = 1 / value_to_intervals(backend([lower, upper]).mid(), backend)
+    image = middle - inverse * value + (1 - inverse * area) * (value_to_intervals(result_interval) - middle)
+    return image, value, area
+
+
+# В одномерном случае шаг Гаусса-Зейделя Хансена-Сенгупты совпадает с шагом Ньютона с расширенным делением
+OPERATORS = {'newton': _NewtonImage, 'hansen-sengupta': _NewtonImage, 'krawczyk': _KrawczykImage}
+
+
+def _NewtonOperator(func, interval_diff, result_interval, point, area=None, value=None):
+    part_to_intersect, value, area = _NewtonImage(func, interval_diff, result_interval, point, area, value)
+    result_part = value_to_intervals(result_interval)
+    result_part.intersect(part_to_intersect)
+    return result_part, value, area
+
+
+def _StrictlyInside(image, box):
+    # Образ подынтервала под оператором Ньютона или Кравчика строго внутри него: в box ровно один корень
+    return len(image) == 1 and box[0] < image[0][0] and image[0][1] < box[1]
+
+
+def NewtonStep(func, interval_diff, result_interval, point=None):
+    if point is None:
+        point = result_interval.mid()
+    return _NewtonOperator(func, interval_diff, result_interval, point)[0]
+
+
+def _Intersected(natural, form):
+    result = Intervals._from_sorted(list(natural.data), natural.get_backend())
+    result.intersect(form)
+    # Обе оценки содержат область значений, пустое пересечение возможно только из-за NaN
+    return result if result else natural
+
+
+def CenteredDerivatives(diff_func, second_diff_func, third_diff_func, backend, box_values=None):
+    """
+    Оценки f' и f'' на подынтервале в форме среднего значения.
+
+    Возвращает функцию (X, m) -> [f'(X), f''(X), f'(m)] для HybridNewtonInterval (box_func), где
+    f''(X) = естественная оценка ∩ (f''(m) + f'''(X)(X - m)),
+    f'(X) = естественная оценка ∩ (f'(m) + f''(X)(X - m)),
+    m - точка шага Ньютона (по умолчанию середина X), поэтому f'(m) используется и в самом шаге.
+    Форма среднего для f'' вычисляется только если естественная оценка содержит 0 (иначе шаг Ньютона
+    и так сужает подынтервал), а если естественная оценка f' не содержит 0, подынтервал отбрасывается
+    без вычислений в точке (f'(m) = None).
+    box_values(X) - необязательная функция, возвращающая естественные [f'(X), f''(X)] за одно вычисление.
+    """
+    if box_values is None:
+        def box_values(x):
+            return [diff_func(x), second_diff_func(x)]
+
+    def centered(x, point=None):
+        x = value_to_intervals(x, backend)
+        diff_range, second_range = (value_to_intervals(value, backend) for value in box_values(x))
+        lower, upper = _Hull(x)
+        if not (diff_range.isAround(0) and lower < upper and math.isfinite(lower) and math.isfinite(upper)):
+            return [diff_range, second_range, None]
+        if point is None:
+            point = backend([lower, upper]).mid()
+        middle = value_to_intervals(point, backend)
+        diff_value = value_to_intervals(diff_func(middle), backend)
+        offset = x - middle
+        if second_range.isAround(0):
+            second_value = value_to_intervals(second_diff_func(middle), backend)
+            third_range = value_to_intervals(third_diff_func(x), backend)
+            second_range = _Intersected(second_range, second_value + third_range * offset)
+        diff_range = _Intersected(diff_range, diff_value + second_range * offset)
+        return [diff_range, second_range, diff_value]
+    return centered
+
+
+def SimpleNewtonInterval(func, interval_diff, interval, e, callback=None, _debug=False):
     result = Intervals([interval])
+    iteration = 0
 
     while result and result.max_width() > e:
         if _debug:
             print(result)
-        new_result = Intervals([])
+        new_result = Intervals([], result.get_backend())
         for result_interval in result:
-            area = interval_diff(value_to_intervals(result_interval))
-            area = value_to_intervals(area)
-
-            part_to_intersect = -func(value_to_intervals(result_interval.mid()))
-            part_to_intersect = value_to_intervals(part_to_intersect) / area
-            part_to_intersect = part_to_intersect + value_to_intervals(result_interval.mid())
-
-            result_part = value_to_intervals(result_interval)
-            result_part.intersect(part_to_intersect)
-
-            new_result.union(result_part)
+            new_result.union(NewtonStep(func, interval_diff, result_interval))
+        iteration += 1
+        if callback is not None:
+            width = new_result.sum_width()
+            callback(IterationInfo(iteration, len(new_result), new_result.max_width() if new_result else 0, width,
+                                   width / result.sum_width()))
 
         if result == new_result:
             return False, result
@@ -37,69 +163,722 @@ def SimpleNewtonInterval(func, interval_diff, interval, e, _debug=False):
     return True, result
 
 
-def GetCriticalPoints(func, interval, e, var=sym.Symbol('x'), classify=False):
-    diff = sym.diff(func, var)
-    second_diff = sym.diff(diff, var)
+def _Hull(intervals):
+    return intervals[0][0], intervals[-1][1]
 
-    diff_func = sym.utilities.lambdify(var, diff, modules=CUSTOM_MODULES)
-    second_diff_func = sym.utilities.lambdify(var, second_diff, modules=CUSTOM_MODULES)
 
-    conversion, result = SimpleNewtonInterval(diff_func, second_diff_func, interval, e)
-    if classify:
-        result = DiffClassification(result, second_diff_func)
+def _HullWidth(intervals):
+    lower, upper = _Hull(intervals)
+    return upper - lower
 
-        left_end = value_to_intervals(interval[0])
-        if diff_func(left_end) > 0:
-            left_end_type = Extrema.Minimum
-        elif diff_func(left_end) < 0:
-            left_end_type = Extrema.Maximum
-        else:
-            left_end_type = Extrema.Unknown
-        left_end_point = CriticalPoint(x=interval[0], interval=left_end[0], type=left_end_type)
-        result.append(left_end_point)
-
-        right_end = value_to_intervals(interval[1])
-        if diff_func(right_end) > 0:
-            right_end_type = Extrema.Maximum
-        elif diff_func(right_end) < 0:
-            right_end_type = Extrema.Minimum
+
+def _PointNewtonHint(point, value, area):
+    # Точечный шаг Ньютона m - f(m) / f'(X) по серединам интервалов: оценка положения нуля без новых вычислений
+    area_lower, area_upper = _Hull(area)
+    if not (math.isfinite(area_lower) and math.isfinite(area_upper)):
+        return None
+    slope = (area_lower + area_upper) / 2
+    value_lower, value_upper = _Hull(value)
+    if slope == 0 or not (math.isfinite(value_lower) and math.isfinite(value_upper)):
+        return None
+    return point - (value_lower + value_upper) / 2 / slope
+
+
+def _EvaluationPoint(box, hint):
+    # Оценка нуля, если она лежит в средней половине подынтервала, иначе середина
+    if hint is not None:
+        quarter = box.width() / 4
+        if box[0] + quarter <= hint <= box[1] - quarter:
+            return hint
+    return box.mid()
+
+
+def _Priority(order, box, value):
+    if order == 'width':
+        return -box.width()
+    if order == 'promise':
+        # Сначала подынтервалы, в которых |f| в точке вычисления у родителя меньше
+        value_lower, value_upper = _Hull(value)
+        if value_lower > 0 or value_upper < 0:
+            return min(abs(value_lower), abs(value_upper))
+        return 0
+    raise ValueError(f"Unknown order {order}")
+
+
+def _Bisect(box):
+    middle = box.mid()
+    if not (box[0] < middle < box[1]):
+        return None
+    return [type(box).fromEndpoints(box[0], middle), type(box).fromEndpoints(middle, box[1])]
+
+
+def HybridNewtonInterval(func, interval_diff, interval, e, order='width', max_boxes=100000, box_func=None,
+                         operator='newton', unique=None, stats=None, callback=None, _debug=False):
+    """
+    Интервальный метод Ньютона с делением пополам и очередью с приоритетом.
+
+    Вместо прохода по всем подынтервалам поколения подынтервалы берутся по одному из очереди с приоритетом:
+    order = 'width' - сначала самые широкие, order = 'promise' - сначала те, где |f| в точке вычисления
+    у родителя меньше. Если шаг Ньютона не сузил подынтервал (производная содержит 0), подынтервал
+    отбрасывается, когда интервальная оценка func на нём не содержит 0, и делится пополам в противном случае,
+    поэтому метод не останавливается там, где останавливается SimpleNewtonInterval.
+    Точка вычисления шага - точечная оценка нуля по предыдущему шагу, если она лежит в средней половине
+    подынтервала, иначе середина.
+    box_func - необязательная функция (X, m) -> [func(X), interval_diff(X), func(m) или None], вычисляющая
+    оценки на подынтервале за одно вычисление (лента ExpressionTape) или в форме среднего (CenteredDerivatives):
+    тогда подынтервалы, на которых func не содержит 0, отбрасываются до шага Ньютона.
+    interval - начальный интервал или Intervals из нескольких начальных подынтервалов.
+    operator - 'newton' (по умолчанию) или 'hansen-sengupta' (в одномерном случае то же самое):
+    шаг Ньютона с расширенным делением; 'krawczyk' - оператор Кравчика, а если производная содержит 0 -
+    шаг Ньютона, делящий подынтервал по щели расширенного деления.
+    Если образ подынтервала под оператором лежит строго внутри него, в подынтервале ровно один корень:
+    такой подынтервал и его части дальше только сужаются оператором, без проверки значений func и деления
+    пополам. Если передан список unique, в него добавляются подынтервалы результата с таким доказательством.
+    Если передан словарь stats, к stats['iterations'] прибавляется количество обработанных подынтервалов
+    (шагов Ньютона), а stats['peak_boxes'] - наибольшая длина очереди.
+    callback - необязательная функция, которая после обработки каждого подынтервала получает IterationInfo:
+    очередь после шага и отношение суммарной ширины частей после шага Ньютона к ширине подынтервала.
+
+    Возвращает пару (conversion, result): conversion = True, если все подынтервалы сужены до ширины e
+    (в result соседние подынтервалы могут объединиться); False, если подынтервал больше нельзя разделить
+    при текущей точности, значения func на нём неотличимы от 0 из-за погрешности вычислений
+    или обработано больше max_boxes подынтервалов. Такие подынтервалы остаются в result.
+    """
+    backend = interval.get_backend() if isinstance(interval, Intervals) else type(interval)
+    conversion = True
+    result = Intervals([], backend)
+    for box, proven, converged in _HybridNewtonBoxes(func, interval_diff, interval, e, order, max_boxes, box_func,
+                                                     operator, stats, callback, _debug):
+        conversion = conversion and converged
+        result.append(box)
+        if proven and unique is not None:
+            unique.append(box)
+    return conversion, result
+
+
+def _HybridNewtonStep(func, interval_diff, box, point, proven, order, box_func, image_operator, backend):
+    # Один шаг HybridNewtonInterval для подынтервала box шире e. Возвращает (queued, stalled, pieces):
+    # queued - записи (priority, piece, point, proven) для очереди, stalled - части, которые больше
+    # нельзя обработать, pieces - части box после шага Ньютона
+    queued, stalled = [], []
+    box_range = area = value = hint = None
+    if box_func is not None:
+        box_range, area, value = box_func(value_to_intervals(box), point)
+        box_range = value_to_intervals(box_range, backend)
+    if box_range is not None and not (proven or box_range.isAround(0)):
+        pieces = Intervals([], backend)
+    else:
+        image, value, area = image_operator(func, interval_diff, box, point, area, value)
+        proven = proven or _StrictlyInside(image, box)
+        pieces = value_to_intervals(box)
+        pieces.intersect(image)
+        hint = _PointNewtonHint(point, value, area)
+    for piece in pieces:
+        if 4 * piece.width() <= 3 * box.width():
+            queued.append((_Priority(order, piece, value), piece, _EvaluationPoint(piece, hint), proven))
+            continue
+
+        # Шаг Ньютона оставил часть шире 3/4 подынтервала: если на ней может быть ноль, делим её пополам
+        if piece is box and box_range is not None:
+            piece_range = box_range
         else:
-            right_end_type = Extrema.Unknown
-        right_end_point = CriticalPoint(x=interval[1], interval=right_end[0], type=right_end_type)
-        result.append(right_end_point)
+            piece_range = value_to_intervals(func(value_to_intervals(piece)), backend)
+        if not piece_range.isAround(0):
+            continue
+        # Значение в точке содержит 0 и почти так же широко, как оценка на всей части:
+        # разброс func определяется погрешностью вычислений, деление пополам ничего не даст
+        halves = None
+        if not (value.isAround(0) and _HullWidth(piece_range) <= 2 * _HullWidth(value)):
+            halves = _Bisect(piece)
+        if halves is None:
+            stalled.append(piece)
+            continue
+        for half in halves:
+            queued.append((_Priority(order, half, value), half, _EvaluationPoint(half, hint), False))
+    return queued, stalled, pieces
+
+
+def _HybridNewtonBoxes(func, interval_diff, interval, e, order='width', max_boxes=100000, box_func=None,
+                       operator='newton', stats=None, callback=None, _debug=False):
+    # Генератор HybridNewtonInterval: выдает тройки (box, proven, converged), как только подынтервал box
+    # окончателен - сужен до ширины e (converged = True, proven - доказана единственность корня)
+    # или больше не может быть обработан (converged = False). Статистика записывается и при досрочной остановке
+    if isinstance(interval, Intervals):
+        backend, boxes = interval.get_backend(), list(interval)
     else:
-        result.append(Interval.valueToInterval(interval[0]))
-        result.append(Interval.valueToInterval(interval[1]))
+        backend, boxes = type(interval), [interval]
+    counter = itertools.count()
+    queue = [(0, next(counter), box, box.mid(), False) for box in boxes]
+    image_operator = OPERATORS[operator]
+    processed = 0
+    peak = len(queue)
+
+    try:
+        while queue:
+            peak = max(peak, len(queue))
+            if processed >= max_boxes:
+                while queue:
+                    _, _, box, _, _ = heapq.heappop(queue)
+                    yield box, False, False
+                break
+            _, _, box, point, proven = heapq.heappop(queue)
+            if box.width() <= e:
+                yield box, proven, True
+                continue
+            processed += 1
+
+            queued, stalled, pieces = _HybridNewtonStep(func, interval_diff, box, point, proven, order, box_func,
+                                                        image_operator, backend)
+            for priority, piece, piece_point, piece_proven in queued:
+                heapq.heappush(queue, (priority, next(counter), piece, piece_point, piece_proven))
+            for piece in stalled:
+                yield piece, False, False
+
+            if callback is not None:
+                widths = [entry[2].width() for entry in queue]
+                callback(IterationInfo(processed, len(queue), max(widths, default=0), sum(widths),
+                                       pieces.sum_width() / box.width()))
+    finally:
+        if _debug:
+            print(f"Processed {processed} boxes")
+        if stats is not None:
+            stats['iterations'] = stats.get('iterations', 0) + processed
+            stats['peak_boxes'] = max(stats.get('peak_boxes', 0), peak)
+
+
+_worker_state = None
+
+
+def _InitNewtonWorker(func, var, backend, autodiff, centered, order, operator, precision, calcprecision,
+                      multiintervalmode, lazyquantization):
+    global _worker_state
+    interval_lib.Interval.eagerquantize()
+    interval_lib.Interval.setprecision(precision)
+    interval_lib.Interval.setcalcprecision(calcprecision)
+    interval_lib.Interval.multiintervalmode = multiintervalmode
+    FloatInterval.multiintervalmode = multiintervalmode
+    # Функции строятся, как в GetCriticalPoints, до включения отложенного округления
+    _, _, diff_func, _, interval_second_diff, box_func = \
+        _DerivativeFunctions(func, var, backend, expression_cache, autodiff, centered)
+    interval_lib.Interval.lazyquantization = lazyquantization
+    _worker_state = (diff_func, interval_second_diff, box_func, order, OPERATORS[operator], backend)
+
+
+def _NewtonWorkerSteps(entries):
+    # Для каждого подынтервала: (queued, stalled, коэффициент сжатия шага для IterationInfo)
+    func, interval_diff, box_func, order, image_operator, backend = _worker_state
+    steps = []
+    for box, point, proven in entries:
+        queued, stalled, pieces = _HybridNewtonStep(func, interval_diff, box, point, proven, order, box_func,
+                                                    image_operator, backend)
+        steps.append((queued, stalled, pieces.sum_width() / box.width()))
+    return steps
+
+
+def ParallelNewtonInterval(func, interval, e, var=sym.Symbol('x'), workers=None, chunksize=8, order='width',
+                           max_boxes=100000, autodiff=False, centered=False, operator='newton', unique=None,
+                           stats=None, callback=None, _debug=False):
+    """
+    Параллельный вариант HybridNewtonInterval для критических точек func (нулей её производной):
+    шаги подынтервалов выполняются в пуле из workers процессов.
+
+    Функция передается символьным выражением, каждый процесс один раз строит по нему те же интервальные
+    функции, что и последовательный GetCriticalPoints (с теми же autodiff и centered). Очередь с приоритетом
+    общая и хранится в текущем процессе: освободившийся процесс получает следующие подынтервалы из неё
+    (не больше chunksize за раз и не больше доли очереди на процесс), а части, полученные шагом Ньютона
+    и делением пополам, возвращаются в общую очередь. Поэтому трудное поддерево делится между всеми
+    процессами, а результат совпадает с последовательным HybridNewtonInterval (кроме порядка обработки
+    при остановке по max_boxes). Точности и режим округления Interval текущего потока передаются процессам.
+    Параметры order, max_boxes, operator, unique, stats и callback - как у HybridNewtonInterval
+    (callback вызывается в текущем процессе по мере получения шагов от процессов пула).
+    """
+    workers = workers or os.cpu_count()
+    backend = type(interval)
+    initargs = (func, var, backend, autodiff, centered, order, operator, interval_lib.Interval.precision,
+                interval_lib.Interval.calcprecision, interval_lib.Interval.multiintervalmode,
+                interval_lib.Interval.lazyquantization)
+    counter = itertools.count()
+    queue = [(0, next(counter), interval, interval.mid(), False)]
+    conversion = True
+    result = Intervals([], backend)
+    processed = pending = completed = 0
+    peak = len(queue)
+
+    with multiprocessing.Pool(workers, initializer=_InitNewtonWorker, initargs=initargs) as pool:
+        finished = queue_lib.SimpleQueue()
+        while queue or pending:
+            peak = max(peak, len(queue))
+            while queue and pending < workers:
+                size = max(1, min(chunksize, len(queue) // workers))
+                entries = []
+                while queue and len(entries) < size:
+                    _, _, box, point, proven = heapq.heappop(queue)
+                    if box.width() <= e:
+                        result.append(box)
+                        if proven and unique is not None:
+                            unique.append(box)
+                    elif processed >= max_boxes:
+                        conversion = False
+                        result.append(box)
+                    else:
+                        processed += 1
+                        entries.append((box, point, proven))
+                if entries:
+                    pool.apply_async(_NewtonWorkerSteps, (entries,), callback=finished.put,
+                                     error_callback=finished.put)
+                    pending += 1
+            if not pending:
+                continue
+            steps = finished.get()
+            pending -= 1
+            if isinstance(steps, BaseException):
+                raise steps
+            for queued, stalled, contraction in steps:
+                for priority, piece, piece_point, piece_proven in queued:
+                    heapq.heappush(queue, (priority, next(counter), piece, piece_point, piece_proven))
+                for piece in stalled:
+                    conversion = False
+                    result.append(piece)
+                completed += 1
+                if callback is not None:
+                    widths = [entry[2].width() for entry in queue]
+                    callback(IterationInfo(completed, len(queue), max(widths, default=0), sum(widths), contraction))
+
+    if _debug:
+        print(f"Processed {processed} boxes")
+    if stats is not None:
+        stats['iterations'] = stats.get('iterations', 0) + processed
+        stats['peak_boxes'] = max(stats.get('peak_boxes', 0), peak)
     return conversion, result
 
 
+def _BroadcastArray(value, size):
+    value = IntervalArray.valueToIntervalArray(value)
+    return IntervalArray(numpy.broadcast_to(value.lower, size), numpy.broadcast_to(value.upper, size))
+
+
+def _MergeBoxes(lower, upper):
+    keep = lower <= upper
+    lower, upper = lower[keep], upper[keep]
+    if len(lower) == 0:
+        return lower, upper
+    order = numpy.argsort(lower, kind='stable')
+    lower, upper = lower[order], upper[order]
+    reach = numpy.maximum.accumulate(upper)
+    starts = numpy.ones(len(lower), dtype=bool)
+    starts[1:] = lower[1:] > reach[:-1]
+    ends = numpy.append(numpy.flatnonzero(starts)[1:] - 1, len(lower) - 1)
+    return lower[starts], reach[ends]
+
+
+def _ArrayNewtonStep(func, interval_diff, lower, upper):
+    boxes = IntervalArray(lower, upper)
+    size = len(boxes)
+    middle = boxes.mid()
+    area = _BroadcastArray(interval_diff(boxes), size)
+    value = _BroadcastArray(func(IntervalArray(middle)), size)
+
+    with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Обычный случай: производная не содержит 0
+        quotient = value / area
+        first_lower, first_upper = quotient.lower, quotient.upper
+        second_lower = numpy.full(size, numpy.inf)
+        second_upper = numpy.full(size, -numpy.inf)
+
+        # Производная содержит 0, значение не содержит 0: результат деления - одна или две полупрямые
+        negative = value.upper < 0
+        numerator = numpy.where(negative, value.upper, value.lower)
+        towards_minus = numpy.where(negative, area.upper > 0, area.lower < 0)
+        towards_plus = numpy.where(negative, area.lower < 0, area.upper > 0)
+        minus_end = round_up(numerator / numpy.where(negative, area.upper, area.lower))
+        plus_end = round_down(numerator / numpy.where(negative, area.lower, area.upper))
+
+        zero_area = (area.lower <= 0) & (area.upper >= 0)
+        zero_value = (value.lower <= 0) & (value.upper >= 0)
+        extended = zero_area & ~zero_value & (towards_minus | towards_plus)
+        if not FloatInterval.multiintervalmode:
+            extended &= ~(towards_minus & towards_plus)
+        entire = zero_area & ~extended
+
+        first_lower = numpy.where(extended, numpy.where(towards_minus, -numpy.inf, plus_end), first_lower)
+        first_upper = numpy.where(extended, numpy.where(towards_minus, minus_end, numpy.inf), first_upper)
+        second_lower = numpy.where(extended & towards_minus & towards_plus, plus_end, second_lower)
+        second_upper = numpy.where(extended & towards_minus & towards_plus, numpy.inf, second_upper)
+        first_lower = numpy.where(entire, -numpy.inf, first_lower)
+        first_upper = numpy.where(entire, numpy.inf, first_upper)
+
+        # N(X) = m - f(m) / f'(X), пересечённое с X
+        pieces_lower, pieces_upper = [], []
+        for quotient_lower, quotient_upper in ((first_lower, first_upper), (second_lower, second_upper)):
+            empty = quotient_lower > quotient_upper
+            newton_lower = round_down(middle - quotient_upper)
+            newton_upper = round_up(middle - quotient_lower)
+            pieces_lower.append(numpy.where(empty, numpy.inf, numpy.maximum(lower, newton_lower)))
+            pieces_upper.append(numpy.where(empty, -numpy.inf, numpy.minimum(upper, newton_upper)))
+
+    return _MergeBoxes(numpy.concatenate(pieces_lower), numpy.concatenate(pieces_upper))
+
+
+def VectorizedNewtonInterval(func, interval_diff, interval, e):
+    interval = FloatInterval([interval[0], interval[1]])
+    lower, upper = numpy.array([interval[0]]), numpy.array([interval[1]])
+
+    conversion = True
+    while len(lower) and numpy.max(upper - lower) > float(e):
+        new_lower, new_upper = _ArrayNewtonStep(func, interval_diff, lower, upper)
+        if numpy.array_equal(lower, new_lower) and numpy.array_equal(upper, new_upper):
+            conversion = False
+            break
+        lower, upper = new_lower, new_upper
+
+    return conversion, Intervals(IntervalArray(lower, upper).toIntervals(), FloatInterval)
+
+
+def _JetDerivativesOrNone(func, var, backend):
+    try:
+        return JetDerivatives(func, var, backend)
+    except NotImplementedError:
+        return None
+
+
+def _DerivativeFunctions(func, var, backend, cache, autodiff=False, centered=False):
+    # Возвращает (diff, second_diff, diff_func, second_diff_func, interval_second_diff, box_func):
+    # символьные производные (None для Jet) и интервальные функции для решателей
+    jets = None
+    if autodiff:
+        jets = cache.get(('jets', sym.srepr(func), sym.srepr(var), backend, BackendPrecision(backend)),
+                         lambda: _JetDerivativesOrNone(func, var, backend))
+    diff = second_diff = box_values = None
+    if jets is not None:
+        diff_func, second_diff_func, box_values = jets.diff, jets.second_diff, jets.derivatives
+    else:
+        _, diff, second_diff, *functions = cache.derivatives(func, var, 3 if centered else 2)
+        functions = [diff, second_diff] + functions
+        tape, functions = cache.compile(functions, var, backend, CUSTOM_MODULES)
+        diff_func, second_diff_func = functions[:2]
+        if tape is not None:
+            box_values = tape.outputs([0, 1])
+
+    interval_second_diff = second_diff_func
+    if centered and jets is None:
+        box_func = CenteredDerivatives(diff_func, second_diff_func, functions[2], backend, box_values)
+
+        def interval_second_diff(x):
+            return box_func(x)[1]
+    elif box_values is not None:
+        def box_func(x, point):
+            return box_values(x) + [None]
+    else:
+        box_func = None
+    return diff, second_diff, diff_func, second_diff_func, interval_second_diff, box_func
+
+
+def AdaptivePrecision(e, interval, width=None):
+    """
+    Точности (precision, calcprecision) для Interval, достаточные для поиска подынтервалов ширины e на interval.
+
+    precision - на 3 знака после запятой больше порядка e (или ширины width, если она меньше e),
+    calcprecision - precision плюс количество знаков целой части концов interval и 10 запасных знаков.
+    """
+    e = Decimal(e)
+    if width is not None:
+        e = min(e, Decimal(width))
+    digits = max(-e.adjusted(), 0) + 3
+    magnitude = max(abs(Decimal(interval[0])).adjusted(), abs(Decimal(interval[1])).adjusted(), 0) + 1
+    return digits, digits + magnitude + 10
+
+
+def _AdaptivePrecisionNewtonInterval(func, var, interval, e, cache, autodiff, centered, max_precision, operator,
+                                     unique, stats, callback):
+    # Решение HybridNewtonInterval с возрастающей точностью Interval: начинаем с AdaptivePrecision(e, interval)
+    # и, пока остаются подынтервалы, которые не удалось сузить до e, решаем заново только на них
+    # с точностью на 10 знаков больше (но не меньше нужной для их ширины); сошедшиеся подынтервалы
+    # остаются в результате. Точности задаются workingprecision только в текущем потоке.
+    # Возвращает conversion, result и функции последнего раунда вместе с его точностями.
+    precision, calcprecision = AdaptivePrecision(e, interval)
+    boxes = [interval]
+    result = Intervals([], interval_lib.Interval)
+    while True:
+        pending = []
+        with interval_lib.Interval.workingprecision(precision, calcprecision):
+            _, _, diff_func, second_diff_func, interval_second_diff, box_func = \
+                _DerivativeFunctions(func, var, interval_lib.Interval, cache, autodiff, centered)
+            start = Intervals([interval_lib.Interval([box[0], box[1]]) for box in boxes], interval_lib.Interval)
+            for box, proven, converged in _HybridNewtonBoxes(diff_func, interval_second_diff, start, e,
+                                                             box_func=box_func, operator=operator, stats=stats,
+                                                             callback=callback):
+                if not converged:
+                    pending.append(box)
+                    continue
+                result.append(box)
+                if proven and unique is not None:
+                    unique.append(box)
+        if not pending or precision >= max_precision:
+            for box in pending:
+                result.append(box)
+            return not pending, result, diff_func, second_diff_func, (precision, calcprecision)
+        boxes = pending
+        narrowest = min(box.width() for box in boxes)
+        guard = calcprecision - precision
+        next_precision, _ = AdaptivePrecision(e, interval, narrowest)
+        precision = min(max(precision + 10, next_precision), max_precision)
+        calcprecision = precision + guard
+
+
+def _EndPoints(interval, diff_func, backend):
+    left_end = value_to_intervals(interval[0], backend)
+    if diff_func(left_end) > 0:
+        left_end_type = Extrema.Minimum
+    elif diff_func(left_end) < 0:
+        left_end_type = Extrema.Maximum
+    else:
+        left_end_type = Extrema.Unknown
+    left_end_point = CriticalPoint(x=interval[0], interval=left_end[0], type=left_end_type)
+
+    right_end = value_to_intervals(interval[1], backend)
+    if diff_func(right_end) > 0:
+        right_end_type = Extrema.Maximum
+    elif diff_func(right_end) < 0:
+        right_end_type = Extrema.Minimum
+    else:
+        right_end_type = Extrema.Unknown
+    right_end_point = CriticalPoint(x=interval[1], interval=right_end[0], type=right_end_type)
+    return [left_end_point, right_end_point]
+
+
+def _Quantized(result, unique):
+    # Подынтервалы, найденные с отложенным округлением Interval, округляются до precision знаков на выходе
+    unique[:] = [box.quantized() for box in unique]
+    return Intervals([box.quantized() for box in result], interval_lib.Interval)
+
+
+def _WithEnds(conversion, result, interval, classify, diff_func, second_diff_func, backend, unique=None):
+    if classify:
+        result = DiffClassification(result, second_diff_func, unique)
+        result.extend(_EndPoints(interval, diff_func, backend))
+    else:
+        result.append(backend.valueToInterval(interval[0]))
+        result.append(backend.valueToInterval(interval[1]))
+    return conversion, result
+
+
+def GetCriticalPoints(func, interval, e, var=sym.Symbol('x'), classify=False, backend=None, vectorized=False,
+                      workers=1, chunksize=8, hybrid=True, autodiff=False, centered=False, cache=None,
+                      adaptive_precision=False, max_precision=60, operator='newton', stats=None, callback=None,
+                      lazy_quantization=False):
+    if cache is None:
+        cache = expression_cache
+    if vectorized:
+        backend = FloatInterval
+    if backend is None and not isinstance(interval, INTERVAL_TYPES):
+        backend = DefaultBackend(e)
+    if backend is None:
+        backend = type(interval)
+    else:
+        interval = backend([interval[0], interval[1]])
+
+    # interval: объект Interval/FloatInterval или пара концов; для пары концов без backend класс интервалов
+    # выбирается по e (DefaultBackend)
+    # autodiff: f' и f'' прямым автоматическим дифференцированием (Jet) по ленте самой func,
+    # без символьных производных; векторизованный режим работает с символьными
+    # centered: оценки f' и f'' на подынтервалах в форме среднего (CenteredDerivatives) для символьных производных
+    # cache: ExpressionCache для производных и скомпилированных функций, по умолчанию общий expression_cache
+    # adaptive_precision: для Interval и HybridNewtonInterval точность выбирается по e (AdaptivePrecision)
+    # и повышается до max_precision знаков, пока подынтервалы не удается сузить до e
+    # operator: оператор HybridNewtonInterval ('newton', 'hansen-sengupta', 'krawczyk'); при classify
+    # у критических точек из подынтервалов с доказанной единственностью корня f' поле unique равно True
+    # stats: словарь для статистики HybridNewtonInterval (iterations, peak_boxes)
+    # callback: функция, получающая IterationInfo после каждой итерации HybridNewtonInterval или SimpleNewtonInterval
+    # lazy_quantization: для Interval последовательные и параллельный методы решают с отложенным округлением
+    # (Interval.deferredquantization), до precision знаков округляются только найденные подынтервалы
+    # workers != 1: ParallelNewtonInterval дает тот же результат, что последовательный HybridNewtonInterval;
+    # SimpleNewtonInterval (hybrid = False) и adaptive_precision у него нет, поэтому с ними - ValueError
+    serial = not vectorized and workers == 1
+    if not vectorized and workers != 1 and (not hybrid or adaptive_precision and backend is interval_lib.Interval):
+        raise ValueError("workers != 1 supports only hybrid = True without adaptive_precision")
+    unique = []
+    lazy_quantization = lazy_quantization and not vectorized and backend is interval_lib.Interval
+    quantization = interval_lib.Interval.deferredquantization() if lazy_quantization else contextlib.nullcontext()
+    if adaptive_precision and serial and hybrid and backend is interval_lib.Interval:
+        with quantization:
+            conversion, result, diff_func, second_diff_func, precisions = _AdaptivePrecisionNewtonInterval(
+                func, var, interval, e, cache, autodiff, centered, max_precision, operator, unique, stats, callback)
+        with interval_lib.Interval.workingprecision(*precisions):
+            if lazy_quantization:
+                result = _Quantized(result, unique)
+            return _WithEnds(conversion, result, interval, classify, diff_func, second_diff_func, backend, unique)
+
+    diff, second_diff, diff_func, second_diff_func, interval_second_diff, box_func = \
+        _DerivativeFunctions(func, var, backend, cache, autodiff and not vectorized, centered)
+    if vectorized:
+        diff_array_func = sym.utilities.lambdify(var, diff, modules=ARRAY_MODULES)
+        second_diff_array_func = sym.utilities.lambdify(var, second_diff, modules=ARRAY_MODULES)
+        conversion, result = VectorizedNewtonInterval(diff_array_func, second_diff_array_func, interval, e)
+    else:
+        with quantization:
+            if workers != 1:
+                conversion, result = ParallelNewtonInterval(func, interval, e, var, workers, chunksize,
+                                                            autodiff=autodiff, centered=centered, operator=operator,
+                                                            unique=unique, stats=stats, callback=callback)
+            elif hybrid:
+                conversion, result = HybridNewtonInterval(diff_func, interval_second_diff, interval, e,
+                                                          box_func=box_func, operator=operator, unique=unique,
+                                                          stats=stats, callback=callback)
+            else:
+                conversion, result = SimpleNewtonInterval(diff_func, interval_second_diff, interval, e, callback)
+        if lazy_quantization:
+            result = _Quantized(result, unique)
+    return _WithEnds(conversion, result, interval, classify, diff_func, second_diff_func, backend, unique)
+
+
+def IterCriticalPoints(func, interval, e, var=sym.Symbol('x'), backend=None, order='promise', max_boxes=100000,
+                       autodiff=False, centered=False, cache=None, operator='newton', stats=None, callback=None):
+    """
+    Потоковый вариант GetCriticalPoints(classify=True): генератор классифицированных CriticalPoint.
+
+    Сначала выдаются концы interval, затем точки из подынтервалов HybridNewtonInterval - каждая сразу,
+    как только её подынтервал окончателен (сужен до ширины e или больше не может быть обработан),
+    а не после решения на всем interval. Прекращение перебора (break, close()) останавливает решение,
+    поэтому первые точки на широких интервалах получаются быстрее. По умолчанию order = 'promise':
+    подынтервалы, где |f'| меньше, обрабатываются раньше, и первые корни находятся до обхода всего interval.
+    В отличие от GetCriticalPoints, соседние окончательные подынтервалы не объединяются.
+    Возвращаемое генератором значение (StopIteration.value, результат yield from) - conversion,
+    как у GetCriticalPoints, если перебор дошел до конца.
+    """
+    if cache is None:
+        cache = expression_cache
+    if backend is None:
+        backend = type(interval)
+    else:
+        interval = backend([interval[0], interval[1]])
+
+    _, _, diff_func, second_diff_func, interval_second_diff, box_func = \
+        _DerivativeFunctions(func, var, backend, cache, autodiff, centered)
+    yield from _EndPoints(interval, diff_func, backend)
+    conversion = True
+    for box, proven, converged in _HybridNewtonBoxes(diff_func, interval_second_diff, interval, e, order, max_boxes,
+                                                     box_func, operator, stats, callback):
+        conversion = conversion and converged
+        yield _ClassifiedPoint(box, second_diff_func, proven)
+    return conversion
+
+
+GlobalMinimum = collections.namedtuple('GlobalMinimum', ['x', 'value'])
+
+
+def GetGlobalMinimum(func, interval, e, var=sym.Symbol('x'), backend=None, max_boxes=100000, cache=None):
+    """
+    Поиск глобального минимума func на interval методом ветвей и границ без перечисления критических точек.
+
+    Подынтервалы хранятся в очереди по нижней границе func - лучшей из естественной интервальной оценки
+    и формы среднего значения f(m) + f'(X)(X - m). Верхняя граница минимума уточняется по значениям func
+    в серединах подынтервалов; подынтервалы, на которых нижняя граница func больше неё, отбрасываются.
+    Концы interval проверяются отдельно, поэтому внутренний подынтервал отбрасывается, если производная
+    на нём не содержит 0 (тест монотонности). Остальные подынтервалы сужаются шагом Ньютона для производной
+    и делятся пополам, если он их не сузил, до ширины e.
+
+    Возвращает GlobalMinimum(x, value): x (Intervals) - гарантированно содержит все точки глобального минимума,
+    value - интервал, содержащий значение минимума.
+    Если обработано больше max_boxes подынтервалов, оставшиеся подынтервалы входят в x без деления.
+    Производные и скомпилированные функции берутся из cache (ExpressionCache), по умолчанию из expression_cache.
+    """
+    if backend is None:
+        backend = type(interval)
+    else:
+        interval = backend([interval[0], interval[1]])
+
+    if cache is None:
+        cache = expression_cache
+    tape, (function, diff_func, second_diff_func) = cache.compile(cache.derivatives(func, var, 2), var, backend,
+                                                                  CUSTOM_MODULES)
+    if tape is not None:
+        value_and_diff = tape.outputs([0, 1])
+    else:
+        def value_and_diff(x):
+            return [function(x), diff_func(x)]
+
+    def evaluate(box):
+        return value_to_intervals(function(value_to_intervals(box)), backend)
+
+    ends = [backend([interval[0], interval[0]]), backend([interval[1], interval[1]])]
+    upper = min(_Hull(evaluate(box))[1] for box in ends + [backend.valueToInterval(interval.mid())])
+    counter = itertools.count()
+    queue = [(_Hull(evaluate(box))[0], next(counter), box) for box in ends + [interval]]
+    heapq.heapify(queue)
+    result = []
+    processed = 0
+
+    while queue:
+        box_lower, _, box = heapq.heappop(queue)
+        if box_lower > upper:
+            break
+        if box.width() <= e or processed >= max_boxes:
+            result.append((box_lower, box))
+            continue
+        processed += 1
+
+        for piece in NewtonStep(diff_func, second_diff_func, box):
+            # Шаг Ньютона оставил часть шире 3/4 подынтервала - делим её пополам
+            halves = [piece]
+            if 4 * piece.width() > 3 * box.width():
+                halves = _Bisect(piece)
+                if halves is None:
+                    result.append((box_lower, piece))
+                    continue
+            for half in halves:
+                half_range, diff_range = (value_to_intervals(part, backend)
+                                          for part in value_and_diff(value_to_intervals(half)))
+                if not diff_range.isAround(0):
+                    continue
+                middle = backend.valueToInterval(half.mid())
+                middle_value = evaluate(middle)
+                upper = min(upper, _Hull(middle_value)[1])
+                half_lower = _Hull(half_range)[0]
+                if half.width() > 0:
+                    centered = middle_value + diff_range * (value_to_intervals(half) - middle)
+                    half_lower = max(half_lower, _Hull(centered)[0])
+                if half_lower <= upper:
+                    heapq.heappush(queue, (half_lower, next(counter), half))
+
+    result = [(box_lower, box) for box_lower, box in result if box_lower <= upper]
+    minimizers = Intervals([box for _, box in result], backend)
+    value = backend([min(box_lower for box_lower, _ in result), upper])
+    return GlobalMinimum(x=minimizers, value=value)
+
+
 class Extrema(enum.Enum):
     Minimum = enum.auto()
     Maximum = enum.auto()
     Unknown = enum.auto()
+    Saddle = enum.auto()
 
     def __str__(self):
         return self.name
 
 
-CriticalPoint = collections.namedtuple('CriticalPoint', ['x', 'interval', 'type'])
+# unique = True: доказано, что в interval ровно один корень производной
+CriticalPoint = collections.namedtuple('CriticalPoint', ['x', 'interval', 'type', 'unique'], defaults=[False])
 
 
-def DiffClassification(critical_points, second_diff):
-    result = []
-    for interval in critical_points:
-        value_in_point = second_diff(value_to_intervals(interval))
-        if value_in_point > 0:
-            point_type = Extrema.Minimum
-        elif value_in_point < 0:
-            point_type = Extrema.Maximum
-        else:
-            point_type = Extrema.Unknown
-        point = CriticalPoint(x=interval.mid(), interval=interval, type=point_type)
-        result.append(point)
-    return result
+def DiffClassification(critical_points, second_diff, unique=None):
+    if unique is None:
+        unique = []
+    return [_ClassifiedPoint(interval, second_diff, any(interval.isIn(box) for box in unique))
+            for interval in critical_points]
+
+
+def _ClassifiedPoint(interval, second_diff, unique=False):
+    value_in_point = second_diff(value_to_intervals(interval))
+    if value_in_point > 0:
+        point_type = Extrema.Minimum
+    elif value_in_point < 0:
+        point_type = Extrema.Maximum
+    else:
+        point_type = Extrema.Unknown
+    return CriticalPoint(x=interval.mid(), interval=interval, type=point_type, unique=unique)
 
 
 def print_critical_points(critical_points):
     for point in critical_points:
-        print(f"Point {point.x}, interval = [{point.interval[0]}, {point.interval[1]}], type = {point.type}")
+        unique = ", unique" if point.unique else ""
+        print(f"Point {point.x}, interval = [{point.interval[0]}, {point.interval[1]}], type = {point.type}{unique}")
@@ -0,0 +1,146 @@
+import collections
+import hashlib
+import json
+import os
+
+import sympy as sym
+
+from expression_tape import CompileFunctions
+
+
+CacheStats = collections.namedtuple('CacheStats', ['hits', 'misses', 'disk_hits', 'evictions', 'size'])
+
+
+def BackendPrecision(backend):
+    '''
+    Параметры точности backend для ключей кэша, зависящих от backend
+            Параметры:
+                    backend (type): класс интервалов (Interval, FloatInterval, ...) или None
+            Возвращаемое значение:
+                    result (tuple): (precision, calcprecision, lazyquantization) текущего потока;
+                        None на месте параметров, которых у backend нет. Константы, вычисленные при
+                        одной точности или режиме округления Interval, при другой не годятся.
+    '''
+    return (getattr(backend, 'precision', None), getattr(backend, 'calcprecision', None),
+            getattr(backend, 'lazyquantization', None))
+
+
+class ExpressionCache:
+    """
+    Класс ExpressionCache - кэш символьной работы SymPy (разбор строки, производные, компиляция в функции)
+            Ключ - каноническая запись выражения (sym.srepr) и переменная.
+            Первый уровень - LRU в памяти не больше чем на max_size записей (самые давние вытесняются).
+            Второй, необязательный, уровень - каталог directory на диске: разобранные выражения и производные
+            сохраняются в нем в виде srepr (по файлу JSON на ключ) и переживают перезапуск процесса,
+            а также общие для процессов пула RunTests. Скомпилированные функции хранятся только в памяти.
+            Поля:
+                max_size (int): максимальное количество записей в памяти
+                directory (str): каталог дискового уровня или None
+            Методы:
+                sympy.Expr parse (self, text): разобранное выражение parse_expr(text)
+                list derivatives (self, func, var, order): [func, func', ..., func^(order)]
+                tuple compile (self, expressions, var, backend, modules): результат CompileFunctions
+                object get (self, key, build): значение по ключу key или build(), сохраненное в памяти
+                CacheStats stats (self): статистика: hits - попадания в память, misses - промахи памяти,
+                                         disk_hits - те из промахов, что найдены на диске, evictions - вытеснения
+                void clear (self): очистка памяти (но не диска) и статистики
+    """
+    def __init__(self, max_size=256, directory=None):
+        '''
+        Создание кэша
+                Параметры:
+                        max_size (int): максимальное количество записей в памяти
+                        directory (str): каталог дискового уровня, по умолчанию без него
+        '''
+        if max_size < 1:
+            raise ValueError("Cache size must be positive")
+        self.max_size = max_size
+        self.directory = directory
+        self.__entries = collections.OrderedDict()
+        self.__reset_stats()
+
+    def __reset_stats(self):
+        self.__hits = self.__misses = self.__disk_hits = self.__evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def stats(self):
+        return CacheStats(self.__hits, self.__misses, self.__disk_hits, self.__evictions, len(self.__entries))
+
+    def clear(self):
+        self.__entries.clear()
+        self.__reset_stats()
+
+    def __remember(self, key, value):
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def get(self, key, build):
+        if key in self.__entries:
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+        self.__misses += 1
+        value = build()
+        self.__remember(key, value)
+        return value
+
+    def __path(self, key):
+        name = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, name + '.json')
+
+    def __get_persistent(self, key, build):
+        # Значение - список выражений SymPy; на диске хранится как список srepr
+        if key in self.__entries or self.directory is None:
+            return self.get(key, build)
+
+        path = self.__path(key)
+        try:
+            with open(path) as file:
+                record = json.load(file)
+            if record['key'] != repr(key):
+                raise ValueError("Cache key collision")
+            value = [sym.sympify(text) for text in record['expressions']]
+        except (OSError, ValueError, KeyError, TypeError, sym.SympifyError):
+            value = None
+        if value is not None:
+            self.__disk_hits += 1
+            return self.get(key, lambda: value)
+
+        value = self.get(key, build)
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as file:
+            json.dump({'key': repr(key), 'expressions': [sym.srepr(expression) for expression in value]}, file)
+        os.replace(temporary, path)
+        return value
+
+    def parse(self, text):
+        text = text.strip()
+        return self.__get_persistent(('parse', text), lambda: [sym.parsing.sympy_parser.parse_expr(text)])[0]
+
+    def derivatives(self, func, var=sym.Symbol('x'), order=2):
+        key = ('derivatives', sym.srepr(func), sym.srepr(var), order)
+
+        def build():
+            result = [func]
+            for _ in range(order):
+                result.append(sym.diff(result[-1], var))
+            return result
+        return list(self.__get_persistent(key, build))
+
+    def compile(self, expressions, var=sym.Symbol('x'), backend=None, modules=None):
+        # Константы ленты округляются при текущей точности backend (и режиме округления Interval),
+        # поэтому они входят в ключ
+        key = ('compile', tuple(sym.srepr(expression) for expression in expressions), sym.srepr(var),
+               backend, BackendPrecision(backend), repr(modules))
+        return self.get(key, lambda: CompileFunctions(expressions, var, backend, modules))
+
+
+# Общий кэш для GetCriticalPoints, GetGlobalMinimum и RunTest; каталог дискового уровня
+# можно задать переменной окружения INTERVAL_CACHE_DIR
+expression_cache = ExpressionCache(directory=os.environ.get('INTERVAL_CACHE_DIR'))
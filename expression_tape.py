@@ -0,0 +1,191 @@
+import operator
+from fractions import Fraction
+
+import sympy as sym
+
+from intervals import *
+
+
+def _Reciprocal(value):
+    return 1 / value
+
+
+def _Power(power):
+    def power_function(value):
+        return value ** power
+    return power_function
+
+
+class ExpressionTape:
+    """
+    Класс ExpressionTape - скомпилированная последовательность интервальных операций для нескольких выражений SymPy
+            Выражения (например, f' и f'') проходят через sym.cse, поэтому общие подвыражения (exp(-x), sin(18*x), ...)
+            вычисляются один раз за вызов. Числовые константы заранее переводятся в Intervals выбранного backend
+            с внешним округлением (при текущих параметрах точности Interval).
+            Поддерживаются +, *, степени (рациональные - с точным показателем Fraction) и функции из таблицы
+            functions (по умолчанию sin, cos, exp, log, tan, atan, sinh, cosh, Abs);
+            для остальных функций конструктор выбрасывает NotImplementedError.
+            Лента работает с любыми значениями, поддерживающими интервальные операции с Intervals
+            (например, Jet из jet.py с таблицей функций JET_FUNCTIONS).
+            Если var - список переменных, аргумент x методов - список значений в том же порядке.
+            Поля:
+                backend (type): класс интервалов (Interval или FloatInterval)
+                operations (int): количество интервальных операций в ленте
+                executed (int): количество выполненных операций всеми лентами (поле класса, для бенчмарков)
+            Методы:
+                list __call__ (self, x): значения всех выражений на x за один проход по ленте
+                list evaluate (self, x): то же для уже подготовленного аргумента (Intervals, Jet), без преобразования
+                callable outputs (self, indices): функция одного аргумента, вычисляющая за один проход
+                                                 только выражения с номерами из indices (список значений)
+                callable output (self, index): функция одного аргумента, вычисляющая только выражение index
+    """
+    functions = {sym.sin: intervals_sin, sym.cos: intervals_cos, sym.exp: intervals_exp, sym.log: intervals_ln,
+                 sym.tan: intervals_tan, sym.atan: intervals_atan, sym.sinh: intervals_sinh, sym.cosh: intervals_cosh,
+                 sym.Abs: abs}
+    executed = 0
+
+    def __init__(self, expressions, var=sym.Symbol('x'), backend=None, functions=None):
+        '''
+        Компиляция выражений в ленту
+                Параметры:
+                        expressions (list): список выражений SymPy от переменной var
+                        var (sympy.Symbol | list): переменная или список переменных
+                        backend (type): класс интервалов, по умолчанию Intervals.backend
+                        functions (dict): таблица функций SymPy -> функция одного аргумента, по умолчанию
+                                          ExpressionTape.functions
+        '''
+        if backend is None:
+            backend = Intervals.backend
+        if functions is not None:
+            self.functions = functions
+        self.backend = backend
+        self.var = var
+        self.variables = list(var) if isinstance(var, (list, tuple)) else None
+        inputs = self.variables if self.variables is not None else [var]
+        self.registers = [None] * len(inputs)
+        self.instructions = []
+        self.__slot_of = {variable: slot for slot, variable in enumerate(inputs)}
+
+        replacements, reduced = sym.cse(expressions)
+        for symbol, expression in replacements:
+            self.__slot_of[symbol] = self.__compile(expression)
+        self.output_slots = [self.__compile(expression) for expression in reduced]
+        self.operations = len(self.instructions)
+
+    def __constant(self, expression):
+        backend = self.backend
+        if expression.is_Integer:
+            value = value_to_intervals(backend.valueToInterval(int(expression)))
+        elif expression.is_Rational:
+            value = value_to_intervals(backend.valueToInterval(int(expression.p))) / \
+                    value_to_intervals(backend.valueToInterval(int(expression.q)))
+        else:
+            value = value_to_intervals(backend.valueToInterval(str(sym.N(expression, 60))))
+        self.registers.append(value)
+        return len(self.registers) - 1
+
+    def __emit(self, function, arguments):
+        self.registers.append(None)
+        target = len(self.registers) - 1
+        self.instructions.append((function, tuple(arguments), target))
+        return target
+
+    def __fold(self, function, arguments):
+        result = arguments[0]
+        for argument in arguments[1:]:
+            result = self.__emit(function, (result, argument))
+        return result
+
+    def __compile(self, expression):
+        if expression in self.__slot_of:
+            return self.__slot_of[expression]
+
+        if expression.is_number:
+            slot = self.__constant(expression)
+        elif expression.is_Add:
+            # Константы - последними: левый операнд всегда значение ленты (Intervals или Jet)
+            arguments = sorted(expression.args, key=lambda argument: argument.is_number)
+            slot = self.__fold(operator.add, [self.__compile(argument) for argument in arguments])
+        elif expression.is_Mul:
+            coefficient, factors = expression.as_coeff_mul()
+            factors = sorted(factors, key=lambda factor: factor.is_number)
+            slot = self.__fold(operator.mul, [self.__compile(factor) for factor in factors])
+            if coefficient == -1:
+                slot = self.__emit(operator.neg, (slot,))
+            elif coefficient != 1:
+                slot = self.__emit(operator.mul, (slot, self.__compile(coefficient)))
+        elif expression.is_Pow:
+            base, power = expression.args
+            if power.is_Integer and power < 0:
+                slot = self.__compile(base ** -power) if power != -1 else self.__compile(base)
+                slot = self.__emit(_Reciprocal, (slot,))
+            elif power.is_Integer:
+                slot = self.__emit(_Power(int(power)), (self.__compile(base),))
+            elif power.is_Rational:
+                slot = self.__emit(_Power(Fraction(int(power.p), int(power.q))), (self.__compile(base),))
+            else:
+                slot = self.__emit(operator.pow, (self.__compile(base), self.__compile(power)))
+        elif expression.func in self.functions:
+            slot = self.__emit(self.functions[expression.func], (self.__compile(expression.args[0]),))
+        else:
+            raise NotImplementedError(f"Unsupported expression {expression}")
+
+        self.__slot_of[expression] = slot
+        return slot
+
+    def __prepare(self, x):
+        if self.variables is not None:
+            return [value_to_intervals(value, self.backend) for value in x]
+        return value_to_intervals(x, self.backend)
+
+    def __call__(self, x):
+        return self._evaluate(self.instructions, self.output_slots, self.__prepare(x))
+
+    def evaluate(self, x):
+        return self._evaluate(self.instructions, self.output_slots, x)
+
+    def _evaluate(self, instructions, outputs, x):
+        ExpressionTape.executed += len(instructions)
+        registers = self.registers.copy()
+        if self.variables is not None:
+            registers[:len(x)] = x
+        else:
+            registers[0] = x
+        for function, arguments, target in instructions:
+            registers[target] = function(*[registers[argument] for argument in arguments])
+        return [registers[output] for output in outputs]
+
+    def outputs(self, indices):
+        # Оставляем только инструкции, от которых зависят выходы indices
+        outputs = [self.output_slots[index] for index in indices]
+        needed = set(outputs)
+        instructions = []
+        for function, arguments, target in reversed(self.instructions):
+            if target in needed:
+                needed.update(arguments)
+                instructions.append((function, arguments, target))
+        instructions.reverse()
+
+        def evaluate(x):
+            return self._evaluate(instructions, outputs, self.__prepare(x))
+        return evaluate
+
+    def output(self, index):
+        evaluate = self.outputs([index])
+
+        def evaluate_one(x):
+            return evaluate(x)[0]
+        return evaluate_one
+
+
+def CompileFunctions(expressions, var=sym.Symbol('x'), backend=None, modules=None):
+    """
+    Возвращает пару (tape, functions): ленту ExpressionTape для expressions (None, если в выражениях есть
+    неподдерживаемые функции) и список функций одного аргумента для каждого выражения.
+    Без ленты функции строятся через lambdify с modules.
+    """
+    try:
+        tape = ExpressionTape(expressions, var, backend)
+    except NotImplementedError:
+        return None, [sym.utilities.lambdify(var, expression, modules=modules) for expression in expressions]
+    return tape, [tape.output(index) for index in range(len(expressions))]
@@ -0,0 +1,491 @@
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+
+def _down(value):
+    return math.nextafter(value, -math.inf)
+
+
+def _up(value):
+    return math.nextafter(value, math.inf)
+
+
+def _tofloat(value, rounding):
+    '''
+    Перевод числа в float с направленным округлением
+            Параметры:
+                    value (...): число, объект, из которого можно создать объект класса Decimal или float
+                    rounding (int): -1 - округление вниз, 1 - округление вверх
+            Возвращаемое значение:
+                    result (float): ближайшее число float, не большее (rounding = -1) или не меньшее (rounding = 1) исходного
+    '''
+    if isinstance(value, float):
+        return value
+    if isinstance(value, (int, str)):
+        value = Decimal(value)
+    result = float(value)
+    if isinstance(value, Decimal) and value.is_finite() and math.isfinite(result):
+        if rounding < 0 and Decimal(result) > value:
+            result = _down(result)
+        elif rounding > 0 and Decimal(result) < value:
+            result = _up(result)
+    return result
+
+
+def _call(function, value):
+    try:
+        return function(value)
+    except OverflowError:
+        return math.copysign(math.inf, value) if function is not math.cosh else math.inf
+
+
+def _pow(base, power):
+    try:
+        return base ** power
+    except ZeroDivisionError:
+        return math.inf
+    except OverflowError:
+        return math.inf
+
+
+class FloatInterval:
+    """
+    Класс FloatInterval - интервальная арифметика над числами float64
+            Концы интервала хранятся как float. После каждой операции результат расширяется наружу на одно
+            представимое число (math.nextafter), поэтому интервал всегда содержит точный результат.
+            Интерфейс совпадает с интерфейсом класса Interval, но точность фиксирована (53 бита мантиссы),
+            поэтому класс предназначен для быстрых вычислений с точностью порядка 1e-3...1e-10.
+            Как и Interval, объекты неизменяемы (концы - кортеж x), хешируются и могут быть ключами словарей.
+            Поля:
+                multiintervalmode (int): 0 - выключить результат деления из двух интервалов, 1 - включить       | Default: 1
+            Вспомогательные методы взаимодействия с полями:
+                void intervaldiv (): результат деления - всегда один интервал (multiintervalmode = 0)
+                void multiintervaldiv (): результат деления может быть двумя интервалами (multiintervalmode = 1)
+            Операторы, методы и математические функции: см. класс Interval
+            (sin, cos, tan, atan, sinh, cosh, exp, ln, sqrt, __abs__, ** Fraction).
+    """
+    multiintervalmode = 1
+
+    __slots__ = ('x',)
+
+    def __init__(self, x):
+        '''
+        Инициализация интервала
+                Параметры:
+                        x (List [x1, x2 ...]): список из хотя бы двух чисел или объектов, из которых можно создать
+                                               объект класса Decimal; концы переводятся в float с внешним округлением
+        '''
+        lower, upper = _tofloat(x[0], -1), _tofloat(x[1], 1)
+        if lower > upper:
+            lower, upper = _tofloat(x[1], -1), _tofloat(x[0], 1)
+        self.x = (lower, upper)
+
+    @staticmethod
+    def fromEndpoints(lower, upper):
+        '''
+        Создание интервала из концов другого интервала без преобразования
+                Параметры:
+                        lower (float): левый конец
+                        upper (float): правый конец, lower <= upper
+                Возвращаемое значение:
+                        result (FloatInterval): объект класса FloatInterval с концами (lower, upper);
+        '''
+        interval = object.__new__(FloatInterval)
+        interval.x = (lower, upper)
+        return interval
+
+    def __repr__(self):
+        return "[" + repr(self.x[0]) + ", " + repr(self.x[1]) + "]"
+
+    def __hash__(self):
+        # Точечный интервал равен (==) своему числу, поэтому и хешируется как это число
+        if self.x[0] == self.x[1]:
+            return hash(self.x[0])
+        return hash(self.x)
+
+    def mid(self):
+        '''
+        Получение середины интервала
+                Возвращаемое значение:
+                        middle (float): середина текущего интервала, с математическим округлением
+        '''
+        if math.isinf(self.x[0]) or math.isinf(self.x[1]):
+            return math.inf
+        return 0.5 * self.x[0] + 0.5 * self.x[1]
+
+    def width(self):
+        '''
+        Получение ширины интервала
+                Возвращаемое значение:
+                        width (float): ширина текущего интервала, с округлением вверх
+        '''
+        return _up(self.x[1] - self.x[0])
+
+    def scale(self, factor):
+        '''
+        Расширение/сужение интервала при неизменном центре
+                Параметры:
+                        factor (...): число
+                Возвращаемое значение:
+                        result (FloatInterval): новый интервал, расширенный в factor раз
+        '''
+        m = 0.5 * (self.x[0] + self.x[1])
+        r = _up(0.5 * (self.x[1] - self.x[0])) * float(factor)
+        return FloatInterval([_down(_down(m) - r), _up(_up(m) + r)])
+
+    def isIn(self, other):
+        '''
+        Проверка вложенности в другой интервал
+                Параметры:
+                        other (...): объект, из которого можно создать объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (boolean): результат предиката вложенности текущего интервала в другой интервал;
+        '''
+        ointerval = FloatInterval.valueToInterval(other)
+        return (self.x[0] >= ointerval.x[0]) and (self.x[1] <= ointerval.x[1])
+
+    def isAround(self, other):
+        '''
+        Проверка вложенности другого интервала
+                Параметры:
+                        other (...): объект, из которого можно создать объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (boolean): результат предиката вложенности другого интервала в текущий интервал;
+        '''
+        ointerval = FloatInterval.valueToInterval(other)
+        return (self.x[0] <= ointerval.x[0]) and (self.x[1] >= ointerval.x[1])
+
+    def __getitem__(self, item):
+        return self.x[item]
+
+    def __neg__(self):
+        return FloatInterval.fromEndpoints(-self.x[1], -self.x[0])
+
+    def __add__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return FloatInterval([_down(self.x[0] + ointerval.x[0]), _up(self.x[1] + ointerval.x[1])])
+
+    def __radd__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return ointerval.__add__(self)
+
+    def __sub__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return FloatInterval([_down(self.x[0] - ointerval.x[1]), _up(self.x[1] - ointerval.x[0])])
+
+    def __rsub__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return ointerval.__sub__(self)
+
+    def __mul__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        if math.isnan(self.x[0] + self.x[1] + ointerval.x[0] + ointerval.x[1]):
+            return FloatInterval([math.nan, math.nan])
+        products = [self.x[0] * ointerval.x[0], self.x[0] * ointerval.x[1],
+                    self.x[1] * ointerval.x[0], self.x[1] * ointerval.x[1]]
+        # 0 * Inf в интервальной арифметике считается равным 0
+        products = [0.0 if math.isnan(p) else p for p in products]
+        return FloatInterval([_down(min(products)), _up(max(products))])
+
+    def __rmul__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return ointerval.__mul__(self)
+
+    def __truediv__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        a, b = self.x
+        c, d = ointerval.x
+        if math.isnan(a) or math.isnan(b) or math.isnan(c) or math.isnan(d):
+            return FloatInterval([math.nan, math.nan])
+
+        if c > 0 or d < 0:
+            quotients = [q for q in (a / c, a / d, b / c, b / d) if not math.isnan(q)]
+            if not quotients:
+                return FloatInterval([-math.inf, math.inf])
+            return FloatInterval([_down(min(quotients)), _up(max(quotients))])
+
+        if (c == 0 and d == 0) or (a <= 0 <= b):
+            return FloatInterval([-math.inf, math.inf])
+        if c == 0:
+            if b < 0:
+                return FloatInterval([-math.inf, _up(b / d)])
+            return FloatInterval([_down(a / d), math.inf])
+        if d == 0:
+            if b < 0:
+                return FloatInterval([_down(b / c), math.inf])
+            return FloatInterval([-math.inf, _up(a / c)])
+
+        if not FloatInterval.multiintervalmode:
+            return FloatInterval([-math.inf, math.inf])
+        if b < 0:
+            return [FloatInterval([-math.inf, _up(b / d)]), FloatInterval([_down(b / c), math.inf])]
+        return [FloatInterval([-math.inf, _up(a / c)]), FloatInterval([_down(a / d), math.inf])]
+
+    def __abs__(self):
+        if self.x[0] >= 0:
+            return self
+        if self.x[1] <= 0:
+            return -self
+        return FloatInterval.fromEndpoints(0.0, max(-self.x[0], self.x[1]))
+
+    def __rationalpower(self, power):
+        # x^(p/q), q > 1: определена при x >= 0 и монотонна; погрешность float-показателя p/q
+        # дает относительную ошибку порядка |ln(x) p/q| * 2^-53, на неё результат и расширяется
+        a, b = self.x
+        if b < 0 or math.isnan(a) or math.isnan(b):
+            return FloatInterval([math.nan, math.nan])
+        a = max(a, 0.0)
+        if power.numerator == 1 and power.denominator == 2:
+            return FloatInterval([max(0.0, _down(math.sqrt(a))), _up(math.sqrt(b))])
+        exponent = power.numerator / power.denominator
+
+        def bounds(base):
+            value = _pow(base, exponent)
+            if value == 0 or math.isinf(value):
+                return value, value
+            error = value * 2.3e-16 * (4 + abs(math.log(base) * exponent))
+            return _down(value - error), _up(value + error)
+        low, high = bounds(a), bounds(b)
+        if exponent < 0:
+            low, high = high, low
+        return FloatInterval([max(0.0, low[0]), high[1]])
+
+    def __pow__(self, other):
+        if isinstance(other, Fraction) and other.denominator != 1:
+            return self.__rationalpower(other)
+        ointerval = FloatInterval.valueToInterval(other)
+        p, q = ointerval.x
+        a, b = self.x
+        if p == q and float(p).is_integer():
+            n = int(p)
+            if n == 0:
+                return FloatInterval([1.0, 1.0])
+            if n < 0:
+                return FloatInterval([1.0, 1.0]) / (self ** (-n))
+            if n % 2 == 0:
+                if a <= 0 <= b:
+                    return FloatInterval([0.0, _up(max(_pow(a, n), _pow(b, n)))])
+                low, high = sorted([_pow(a, n), _pow(b, n)])
+                return FloatInterval([max(0.0, _down(low)), _up(high)])
+            return FloatInterval([_down(_pow(a, n)), _up(_pow(b, n))])
+
+        if a < 0:
+            return FloatInterval([math.nan, math.nan])
+        powers = [_pow(a, p), _pow(a, q), _pow(b, p), _pow(b, q)]
+        return FloatInterval([max(0.0, _down(min(powers))), _up(max(powers))])
+
+    def __lt__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return self.x[1] < ointerval.x[0]
+
+    def __le__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return self.x[1] <= ointerval.x[0]
+
+    def __gt__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return self.x[0] > ointerval.x[1]
+
+    def __ge__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return self.x[0] >= ointerval.x[1]
+
+    def __eq__(self, other):
+        ointerval = FloatInterval.valueToInterval(other)
+        return self.x[0] == ointerval.x[0] and self.x[1] == ointerval.x[1]
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @staticmethod
+    def intervaldiv():
+        '''
+        Переключение в режим одноинтервального деления
+                Результат:
+                        Любая операция деления (__truediv__) объектов FloatInterval будет возвращать только один интервал;
+        '''
+        FloatInterval.multiintervalmode = 0
+
+    @staticmethod
+    def multiintervaldiv():
+        '''
+        Переключение в режим мультиинтервального деления
+                Результат:
+                        Операция деления (__truediv__) объектов FloatInterval сможет возвращать список из двух интервалов;
+        '''
+        FloatInterval.multiintervalmode = 1
+
+    @staticmethod
+    def valueToInterval(expr):
+        '''
+        Создание объекта FloatInterval из int, float, str, Decimal и списка двух объектов
+                Параметры:
+                        1. expr (...): объект, из которого можно создать объект класса Decimal;
+                        2. expr ([x1, x2..]): список из хотя бы двух элементов, из которых можно создать объекты класса Decimal;
+                Возвращаемое значение:
+                        result (FloatInterval): созданный объект класса FloatInterval;
+                            Округление: внешнее расширяющее.
+        '''
+        if isinstance(expr, (int, float, str, Decimal)):
+            return FloatInterval([expr, expr])
+        elif isinstance(expr, list):
+            return FloatInterval(expr)
+        return expr
+
+    @staticmethod
+    def __containsperiodpoint(x, shift):
+        # Есть ли в интервале точка shift + 2*pi*k; граница расширена на погрешность вычисления с float
+        pi2 = 2 * math.pi
+        tolerance = 1e-13 * (1 + max(abs(x.x[0]), abs(x.x[1])))
+        return math.ceil((x.x[0] - shift) / pi2 - tolerance) <= math.floor((x.x[1] - shift) / pi2 + tolerance)
+
+    @staticmethod
+    def sin(x):
+        '''
+        Вычисление интервала - синуса интервала
+                Параметры:
+                        x (FloatInterval): объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): объект класса FloatInterval, синус исходного интервала;
+                            Округление: внешнее расширяющее.
+        '''
+        x = FloatInterval.valueToInterval(x)
+        if not (math.isfinite(x.x[0]) and math.isfinite(x.x[1])) or x.x[1] - x.x[0] >= 2 * math.pi:
+            return FloatInterval([-1.0, 1.0])
+        y = [math.sin(x.x[0]), math.sin(x.x[1])]
+        b = 1.0 if FloatInterval.__containsperiodpoint(x, math.pi / 2) else min(1.0, _up(max(y)))
+        a = -1.0 if FloatInterval.__containsperiodpoint(x, -math.pi / 2) else max(-1.0, _down(min(y)))
+        return FloatInterval([a, b])
+
+    @staticmethod
+    def cos(x):
+        '''
+        Вычисление интервала - косинуса интервала
+                Параметры:
+                        x (FloatInterval): объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): объект класса FloatInterval, косинус исходного интервала;
+                            Округление: внешнее расширяющее.
+        '''
+        x = FloatInterval.valueToInterval(x)
+        if not (math.isfinite(x.x[0]) and math.isfinite(x.x[1])) or x.x[1] - x.x[0] >= 2 * math.pi:
+            return FloatInterval([-1.0, 1.0])
+        y = [math.cos(x.x[0]), math.cos(x.x[1])]
+        b = 1.0 if FloatInterval.__containsperiodpoint(x, 0.0) else min(1.0, _up(max(y)))
+        a = -1.0 if FloatInterval.__containsperiodpoint(x, math.pi) else max(-1.0, _down(min(y)))
+        return FloatInterval([a, b])
+
+    @staticmethod
+    def exp(x):
+        '''
+        Эксопонента интервала
+                Параметры:
+                        x (...): объект, из которого можно создать объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): новый интервал, соответствующий экспоненте от исходного;
+        '''
+        x = FloatInterval.valueToInterval(x)
+        try:
+            high = _up(math.exp(x.x[1]))
+        except OverflowError:
+            high = math.inf
+        try:
+            low = max(0.0, _down(math.exp(x.x[0])))
+        except OverflowError:
+            low = _down(math.inf)
+        return FloatInterval([low, high])
+
+    @staticmethod
+    def ln(x):
+        '''
+        Натуральный логарифм интервала
+                Параметры:
+                        x (...): объект, из которого можно создать объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): новый интервал, соответствующий натуралному логарифму от исходного;
+        '''
+        x = FloatInterval.valueToInterval(x)
+        if x.x[1] < 0 or math.isnan(x.x[0]) or math.isnan(x.x[1]):
+            return FloatInterval([math.nan, math.nan])
+        high = _up(math.log(x.x[1])) if x.x[1] > 0 else -math.inf
+        low = _down(math.log(x.x[0])) if x.x[0] > 0 else -math.inf
+        return FloatInterval([low, high])
+
+    @staticmethod
+    def sqrt(x):
+        '''
+        Квадратный корень интервала
+                Параметры:
+                        x (...): объект, из которого можно создать объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): новый интервал, квадратный корень неотрицательной части исходного;
+        '''
+        return FloatInterval.valueToInterval(x) ** Fraction(1, 2)
+
+    @staticmethod
+    def tan(x):
+        '''
+        Вычисление интервала - тангенса интервала
+                Параметры:
+                        x (FloatInterval): объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): объект класса FloatInterval, тангенс исходного интервала
+                                                (вся прямая, если интервал содержит полюс Пи/2 + k * Пи);
+                            Округление: внешнее расширяющее.
+        '''
+        x = FloatInterval.valueToInterval(x)
+        if not (math.isfinite(x.x[0]) and math.isfinite(x.x[1])) or x.x[1] - x.x[0] >= math.pi or \
+                FloatInterval.__containsperiodpoint(x, math.pi / 2) or \
+                FloatInterval.__containsperiodpoint(x, -math.pi / 2):
+            return FloatInterval([-math.inf, math.inf])
+        y = [math.tan(x.x[0]), math.tan(x.x[1])]
+        if y[0] > y[1]:
+            return FloatInterval([-math.inf, math.inf])
+        return FloatInterval([_down(_down(y[0])), _up(_up(y[1]))])
+
+    @staticmethod
+    def atan(x):
+        '''
+        Вычисление интервала - арктангенса интервала
+                Параметры:
+                        x (FloatInterval): объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): объект класса FloatInterval, арктангенс исходного интервала;
+                            Округление: внешнее расширяющее.
+        '''
+        x = FloatInterval.valueToInterval(x)
+        return FloatInterval([_down(math.atan(x.x[0])), _up(math.atan(x.x[1]))])
+
+    @staticmethod
+    def sinh(x):
+        '''
+        Гиперболический синус интервала
+                Параметры:
+                        x (FloatInterval): объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): объект класса FloatInterval, гиперболический синус исходного интервала;
+                            Округление: внешнее расширяющее.
+        '''
+        x = FloatInterval.valueToInterval(x)
+        return FloatInterval([_down(_down(_call(math.sinh, x.x[0]))), _up(_up(_call(math.sinh, x.x[1])))])
+
+    @staticmethod
+    def cosh(x):
+        '''
+        Гиперболический косинус интервала
+                Параметры:
+                        x (FloatInterval): объект класса FloatInterval;
+                Возвращаемое значение:
+                        result (FloatInterval): объект класса FloatInterval, гиперболический косинус исходного интервала;
+                            Округление: внешнее расширяющее.
+        '''
+        x = FloatInterval.valueToInterval(x)
+        y = [_call(math.cosh, x.x[0]), _call(math.cosh, x.x[1])]
+        if x.x[0] >= 0:
+            low, high = y
+        elif x.x[1] <= 0:
+            high, low = y
+        else:
+            low, high = 1.0, max(y)
+        return FloatInterval([max(1.0, _down(_down(low))), _up(_up(high))])
@@ -0,0 +1,157 @@
+import collections
+import contextvars
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import threading
+import time
+
+from interval import Interval
+from float_interval import FloatInterval
+
+
+# Операции, которые считает OperationCounter: арифметика и элементарные функции классов интервалов
+OPERATIONS = ['__neg__', '__abs__', '__add__', '__radd__', '__sub__', '__rsub__', '__mul__', '__rmul__',
+              '__truediv__', '__pow__', 'sin', 'cos', 'tan', 'atan', 'sinh', 'cosh', 'exp', 'ln', 'sqrt']
+
+# Включенные счетчики текущего потока (так же, как точность Interval в interval._working): обертки операций
+# ставятся на классы один раз и, пока кортеж пуст, только вызывают исходный метод
+_counters = contextvars.ContextVar('interval_operation_counters', default=())
+_hooked = set()
+_hooks_lock = threading.Lock()
+
+
+def _counted(cls, key, method, counters, args, kwargs):
+    counters = [counter for counter in counters if cls in counter.classes]
+    if not any(counter.timing for counter in counters):
+        for counter in counters:
+            counter.counts[key] += 1
+        return method(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return method(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        for counter in counters:
+            counter.counts[key] += 1
+            if counter.timing:
+                counter.times[key] += elapsed
+
+
+def _hook(cls, name, method):
+    key = f"{cls.__name__}.{name}"
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        counters = _counters.get()
+        if not counters:
+            return method(*args, **kwargs)
+        return _counted(cls, key, method, counters, args, kwargs)
+    return wrapper
+
+
+def _install_hooks(classes):
+    with _hooks_lock:
+        for cls in classes:
+            if cls in _hooked:
+                continue
+            for name in OPERATIONS:
+                attribute = inspect.getattr_static(cls, name, None)
+                if attribute is None:
+                    continue
+                if isinstance(attribute, staticmethod):
+                    setattr(cls, name, staticmethod(_hook(cls, name, attribute.__func__)))
+                else:
+                    setattr(cls, name, _hook(cls, name, attribute))
+            _hooked.add(cls)
+
+# Информация об итерации для callback решателей: номер итерации, количество подынтервалов (в очереди),
+# наибольшая и суммарная ширина подынтервалов и коэффициент сжатия (отношение суммарной ширины
+# после шага к ширине до шага)
+IterationInfo = collections.namedtuple('IterationInfo', ['iteration', 'boxes', 'max_width', 'sum_width',
+                                                         'contraction'])
+
+
+class OperationCounter:
+    """
+    Класс OperationCounter - счетчики вызовов (и, при timing = True, время) операций классов интервалов
+            Используется как менеджер контекста: внутри блока with считаются вызовы методов из OPERATIONS
+            у классов classes, сделанные в текущем потоке; операции других потоков в счетчик не попадают.
+            Обертки этих методов ставятся на классы один раз, при первом создании счетчика, и остаются:
+            когда в потоке нет включенных счетчиков, обертка только проверяет это и вызывает исходный метод.
+            Счетчики можно вкладывать и выключать в любом порядке, каждый считает операции своего блока with.
+            Вложенные вызовы (например, __radd__ через __add__) считаются отдельно.
+            Поля:
+                counts (collections.Counter): количество вызовов, ключ - "Класс.метод"
+                times (collections.Counter): суммарное время вызовов в секундах (только при timing = True)
+            Методы:
+                int total (self): общее количество вызовов
+                dict metrics (self, prefix): плоский словарь метрик "prefix.Класс.метод.count" / ".seconds"
+                                            для передачи в систему метрик
+    """
+    def __init__(self, classes=(Interval, FloatInterval), timing=False, sink=None):
+        '''
+        Создание счетчиков
+                Параметры:
+                        classes (tuple): классы интервалов, операции которых считаются
+                        timing (bool): измерять ли время операций (дороже, чем только подсчет)
+                        sink (callable): функция одного аргумента, которой при выходе из блока with
+                                         передается metrics()
+        '''
+        self.classes = classes
+        self.timing = timing
+        self.sink = sink
+        self.counts = collections.Counter()
+        self.times = collections.Counter()
+        _install_hooks(classes)
+
+    def __enter__(self):
+        _counters.set(_counters.get() + (self,))
+        return self
+
+    def __exit__(self, *exception):
+        _counters.set(tuple(counter for counter in _counters.get() if counter is not self))
+        if self.sink is not None:
+            self.sink(self.metrics())
+        return False
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def metrics(self, prefix='interval'):
+        result = {f"{prefix}.{key}.count": count for key, count in self.counts.items()}
+        if self.timing:
+            result.update({f"{prefix}.{key}.seconds": seconds for key, seconds in self.times.items()})
+        return result
+
+
+def IterationRecorder(sink=None):
+    """
+    Возвращает callback для решателей (SimpleNewtonInterval, HybridNewtonInterval, GetCriticalPoints),
+    который сохраняет IterationInfo каждой итерации в список (атрибут history callback)
+    и передает его в sink, если он задан
+    """
+    history = []
+
+    def callback(info):
+        history.append(info)
+        if sink is not None:
+            sink(info)
+    callback.history = history
+    return callback
+
+
+def Profile(function, *args, sort='cumulative', limit=20, output=None, **kwargs):
+    """
+    Запускает function(*args, **kwargs) под cProfile и возвращает пару (результат, pstats.Stats).
+    Если задан output (файловый объект), в него печатаются limit строк статистики, упорядоченной по sort.
+    С OperationCounter(timing=True) обертки операций видны в профиле под именами исходных методов.
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args, **kwargs)
+    stats = pstats.Stats(profiler, stream=output if output is not None else io.StringIO())
+    if output is not None:
+        stats.sort_stats(sort).print_stats(limit)
+    return result, stats
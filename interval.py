@@ -1,4 +1,8 @@
+import collections
+import contextvars
+from contextlib import contextmanager
 from decimal import *
+from fractions import Fraction
 
 
 def decsig(value):
@@ -20,7 +24,7 @@ def decisint(value):
             Возвращаемое значение:
                     result (bool): булево значение, где True - передано целое число
     '''
-    return (value // Decimal('1')) == value
+    return value.is_finite() and value.to_integral_value() == value
 
 
 def deciseven(value):
@@ -31,7 +35,7 @@ def deciseven(value):
             Возвращаемое значение:
                     result (bool): булево значение, где True - передано чётное целое число
     '''
-    return decisint(value) and (value % Decimal('2') == Decimal('0'))
+    return decisint(value) and (int(value) % 2 == 0)
 
 
 def decisodd(value):
@@ -42,7 +46,22 @@ def decisodd(value):
             Возвращаемое значение:
                     result (bool): булево значение, где True - передано нечётное целое число
     '''
-    return decisint(value) and (value % Decimal('2') == Decimal('1'))
+    return decisint(value) and (int(value) % 2 == 1)
+
+
+def decneg(value):
+    '''
+    Точная смена знака объекта Decimal без округления до точности контекста
+            Параметры:
+                    value (Decimal): число, объект класса Decimal
+            Возвращаемое значение:
+                    result (Decimal): число с противоположным знаком; нуль любого знака переходит в +0, NaN - в NaN
+    '''
+    return value.copy_negate() if value and not value.is_nan() else value.copy_abs()
+
+
+_quantcache = {}
+_quantumcache = {}
 
 
 def quantizestring(cnt):
@@ -52,145 +71,324 @@ def quantizestring(cnt):
                     cnt (int): число, необходимая точность округления
             Возвращаемое значение:
                     strquant (str): строка, конвертируемая в объект класса Decimal, для метода Decimal.quantize.
+                        Строки хранятся в кэше для каждой точности.
     '''
-    strquant = '0'
-    if (cnt <= 0):
-        return '1'
-    strquant = strquant + '.'
-    for i in range(cnt - 1):
-        strquant = strquant + '0'
-    strquant = strquant + '1'
+    strquant = _quantcache.get(cnt)
+    if strquant is None:
+        strquant = '1' if cnt <= 0 else '0.' + '0' * (cnt - 1) + '1'
+        _quantcache[cnt] = strquant
     return strquant
 
 
-def decpi():
+def decquantum(cnt):
+    '''
+    Получение единицы cnt-го знака после запятой как объекта класса Decimal
+            Параметры:
+                    cnt (int): число, необходимая точность округления
+            Возвращаемое значение:
+                    quantum (Decimal): Decimal(quantizestring(cnt)), аргумент метода Decimal.quantize.
+                        Значения хранятся в кэше для каждой точности.
+    '''
+    quantum = _quantumcache.get(cnt)
+    if quantum is None:
+        quantum = Decimal(quantizestring(cnt))
+        _quantumcache[cnt] = quantum
+    return quantum
+
+
+def deccontext(prec, rounding=ROUND_HALF_EVEN):
+    '''
+    Создание контекста вычислений для объектов класса Decimal
+            Параметры:
+                    prec (int): число, точность вычислений
+                    rounding (str): режим округления | Default: ROUND_HALF_EVEN
+            Возвращаемое значение:
+                    context (Context): новый контекст без ловушек с максимальным диапазоном порядков.
+                        Контекст используется только явно (context.add, context.multiply, ...) и не изменяется,
+                        поэтому один объект можно использовать из нескольких потоков.
+    '''
+    return Context(prec=prec, rounding=rounding, Emax=MAX_EMAX, Emin=MIN_EMIN, traps=[])
+
+
+_picache = {}
+
+
+def decpiconsts(context=None):
+    '''
+    Получение констант Пи, 2*Пи и Пи/2 как объектов класса Decimal
+            Параметры:
+                    context (Context): контекст, в котором округляется результат | Default: текущий контекст
+            Возвращаемое значение:
+                    (pi, pi2, pi05) (Decimal, Decimal, Decimal): значения Пи, 2*Пи и Пи/2.
+                        Значения вычисляются один раз для каждой точности и хранятся в кэше.
+                        Точность: зависит от контекста.
+                        Округление: зависит от контекста.
+    '''
+    if context is None:
+        context = getcontext()
+    consts = _picache.get(context.prec)
+    if consts is None:
+        ctx = deccontext(context.prec + 10)
+        lasts, t, s, n, na, d, da = 0, Decimal("3"), Decimal("3"), 1, 0, 0, 24
+        while s != lasts:
+            lasts = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = ctx.divide(ctx.multiply(t, n), d)
+            s = ctx.add(s, t)
+        consts = (s, ctx.multiply(2, s), ctx.divide(s, 2))
+        _picache[context.prec] = consts
+    return context.plus(consts[0]), context.plus(consts[1]), context.plus(consts[2])
+
+
+def decpi(context=None):
     '''
     Вычисление константы - числа Пи как объекта класса Decimal
             Параметры:
-                    -
+                    context (Context): контекст, в котором округляется результат | Default: текущий контекст
             Возвращаемое значение:
                     s (Decimal): число, объект класса Decimal, значение числа Пи, вычисленное итеративным методом.
-                        Точность: зависит от внешнего контекста.
-                        Округление: зависит от внешнего контекста.
-    '''
-    curcontext = getcontext().copy()
-    getcontext().prec += 10
-    getcontext().rounding = ROUND_HALF_EVEN
-    three = Decimal("3")
-    lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
-    while s != lasts:
-        lasts = s
-        n, na = n + na, na + 8
-        d, da = d + da, da + 32
-        t = (t * n) / d
-        s += t
-    setcontext(curcontext)
-    return +s
+                        Значение вычисляется один раз для каждой точности и хранится в кэше.
+                        Точность: зависит от контекста.
+                        Округление: зависит от контекста.
+    '''
+    return decpiconsts(context)[0]
+
+
+_halvings = 8
 
 
-def decsin(x):
+def decsincos(x, context=None):
     '''
-    Вычисление синуса числа - объекта класса Decimal
+    Одновременное вычисление синуса и косинуса числа - объекта класса Decimal
             Параметры:
                     x (Decimal): число, объект класса Decimal
+                    context (Context): контекст, в котором округляется результат | Default: текущий контекст
             Возвращаемое значение:
-                    s (Decimal): число, объект класса Decimal, значение sin(x), вычисленное с помощью разложения в ряд Тейлора
-                        Точность: зависит от внешнего контекста.
-                        Округление: зависит от внешнего контекста.
-    '''
-    curcontext = getcontext().copy()
-    getcontext().prec += 10
-    getcontext().rounding = ROUND_HALF_EVEN
-    while x > 0:
-        x -= Decimal("2") * decpi()
-    while x < 0:
-        x += Decimal("2") * decpi()
-    i, lasts, s, fact, num, sign = 1, 0, x, 1, x, 1
+                    (s, c) (Decimal, Decimal): значения sin(x) и cos(x).
+                        Аргумент за один шаг приводится к отрезку [-Пи/4, Пи/4] вычитанием k * Пи/2,
+                        затем делится на 2^8, ряды Тейлора для синуса и косинуса суммируются
+                        для малого аргумента, и результат восстанавливается формулами двойного угла.
+                        Точность: зависит от контекста.
+                        Округление: зависит от контекста.
+    '''
+    if context is None:
+        context = getcontext()
+    x = Decimal(x)
+    if not x.is_finite():
+        return Decimal("NaN"), Decimal("NaN")
+    # дополнительные цифры: 10 защитных, 3 на потери при удвоении угла и по одной на каждый разряд k
+    ctx = deccontext(context.prec + 13 + max(x.adjusted() + 1, 0))
+    add, subtract, multiply, divide = ctx.add, ctx.subtract, ctx.multiply, ctx.divide
+    pi, pi2, pi05 = decpiconsts(ctx)
+    k = divide(x, pi05).to_integral_value(rounding=ROUND_HALF_EVEN, context=ctx)
+    r = divide(subtract(x, multiply(k, pi05)), 2 ** _halvings)
+    r2 = multiply(r, r)
+
+    # члены рядов по модулю: r^(2n+1) / (2n+1)! для синуса и r^(2n) / (2n)! для косинуса
+    i, lasts, s, term, step = 1, None, r, r, subtract
     while s != lasts:
         lasts = s
+        term = divide(multiply(term, r2), (i + 1) * (i + 2))
+        s, step = step(s, term), (add if step is subtract else subtract)
+        i += 2
+    i, lasts, c, term, step = 0, None, Decimal("1"), Decimal("1"), subtract
+    while c != lasts:
+        lasts = c
+        term = divide(multiply(term, r2), (i + 1) * (i + 2))
+        c, step = step(c, term), (add if step is subtract else subtract)
         i += 2
-        fact *= i * (i - 1)
-        num *= x * x
-        sign *= -1
-        s += num / fact * sign
 
-    setcontext(curcontext)
-    return +s
+    for _ in range(_halvings):
+        s, c = multiply(2, multiply(s, c)), multiply(subtract(c, s), add(c, s))
 
+    quadrant = int(k) % 4
+    if quadrant == 1:
+        s, c = c, s.copy_negate()
+    elif quadrant == 2:
+        s, c = s.copy_negate(), c.copy_negate()
+    elif quadrant == 3:
+        s, c = c.copy_negate(), s
+    return context.plus(s), context.plus(c)
 
-def deccos(x):
+
+def decsin(x, context=None):
+    '''
+    Вычисление синуса числа - объекта класса Decimal
+            Параметры:
+                    x (Decimal): число, объект класса Decimal
+                    context (Context): контекст, в котором округляется результат | Default: текущий контекст
+            Возвращаемое значение:
+                    s (Decimal): число, объект класса Decimal, значение sin(x), вычисленное с помощью decsincos
+                        Точность: зависит от контекста.
+                        Округление: зависит от контекста.
+    '''
+    return decsincos(x, context)[0]
+
+
+def deccos(x, context=None):
     '''
     Вычисление косинуса числа - объекта класса Decimal
             Параметры:
                     x (Decimal): число, объект класса Decimal
+                    context (Context): контекст, в котором округляется результат | Default: текущий контекст
             Возвращаемое значение:
-                    s (Decimal): число, объект класса Decimal, значение cos(x), вычисленное с помощью разложения в ряд Тейлора
-                        Точность: зависит от внешнего контекста.
-                        Округление: зависит от внешнего контекста.
-    '''
-    curcontext = getcontext().copy()
-    getcontext().prec += 10
-    getcontext().rounding = ROUND_HALF_EVEN
-    while x > 0:
-        x -= Decimal("2") * decpi()
-    while x < 0:
-        x += Decimal("2") * decpi()
-    i, lasts, s, fact, num, sign = 0, 0, 1, 1, 1, 1
-    while s != lasts:
-        lasts = s
-        i += 2
-        fact *= i * (i - 1)
-        num *= x * x
-        sign *= -1
-        s += num / fact * sign
-    setcontext(curcontext)
-    return +s
+                    s (Decimal): число, объект класса Decimal, значение cos(x), вычисленное с помощью decsincos
+                        Точность: зависит от контекста.
+                        Округление: зависит от контекста.
+    '''
+    return decsincos(x, context)[1]
 
 
-def dectg(x):
+def dectg(x, context=None):
     '''
     Вычисление тангенса числа - объекта класса Decimal
             Параметры:
                     x (Decimal): число, объект класса Decimal
+                    context (Context): контекст, в котором округляется результат | Default: текущий контекст
             Возвращаемое значение:
                     s (Decimal): число, объект класса Decimal, значение tg(x) = sin(x) / cos(x);
-                        Точность: зависит от внешнего контекста.
-                        Округление: зависит от внешнего контекста.
+                        Точность: зависит от контекста.
+                        Округление: зависит от контекста.
     '''
-    getcontext().prec += 10
-    s = decsin(x) / deccos(x)
-    getcontext().prec -= 10
-    return +s
+    if context is None:
+        context = getcontext()
+    ctx = deccontext(context.prec + 10)
+    s, c = decsincos(x, ctx)
+    return context.plus(ctx.divide(s, c))
 
 
-def decctg(x):
+def decctg(x, context=None):
     '''
     Вычисление котангенса числа - объекта класса Decimal
             Параметры:
                     x (Decimal): число, объект класса Decimal
+                    context (Context): контекст, в котором округляется результат | Default: текущий контекст
             Возвращаемое значение:
                     s (Decimal): число, объект класса Decimal, значение ctg(x) = cos(x) / sin(x);
-                        Точность: зависит от внешнего контекста.
-                        Округление: зависит от внешнего контекста.
+                        Точность: зависит от контекста.
+                        Округление: зависит от контекста.
+    '''
+    if context is None:
+        context = getcontext()
+    ctx = deccontext(context.prec + 10)
+    return context.plus(ctx.divide(deccos(x, ctx), dectg(x, ctx)))
+
+
+def decatan(x, context=None):
+    '''
+    Вычисление арктангенса числа - объекта класса Decimal
+            Параметры:
+                    x (Decimal): число, объект класса Decimal
+                    context (Context): контекст, в котором округляется результат | Default: текущий контекст
+            Возвращаемое значение:
+                    s (Decimal): число, объект класса Decimal, значение arctg(x).
+                        При |x| > 1 используется arctg(x) = Пи/2 - arctg(1/x), затем аргумент трижды уменьшается
+                        по формуле arctg(x) = 2 * arctg(x / (1 + sqrt(1 + x^2))) и суммируется ряд Тейлора.
+                        Точность: зависит от контекста.
+                        Округление: зависит от контекста.
     '''
-    getcontext().prec += 10
-    s = deccos(x) / dectg(x)
-    getcontext().prec -= 10
-    return +s
+    if context is None:
+        context = getcontext()
+    x = Decimal(x)
+    if x.is_nan():
+        return Decimal("NaN")
+    ctx = deccontext(context.prec + 10)
+    add, subtract, multiply, divide = ctx.add, ctx.subtract, ctx.multiply, ctx.divide
+    pi, pi2, pi05 = decpiconsts(ctx)
+    if x.is_infinite():
+        return context.plus(pi05.copy_sign(x))
+
+    r = x.copy_abs()
+    inverted = r > 1
+    if inverted:
+        r = divide(1, r)
+    for _ in range(3):
+        r = divide(r, add(1, ctx.sqrt(add(1, multiply(r, r)))))
+    r2 = multiply(r, r)
+    n, lasts, s, term, step = 1, None, r, r, subtract
+    while s != lasts:
+        lasts = s
+        term = multiply(term, r2)
+        n += 2
+        s, step = step(s, divide(term, n)), (add if step is subtract else subtract)
+    s = multiply(s, 8)
+    if inverted:
+        s = subtract(pi05, s)
+    return context.plus(s.copy_sign(x))
+
+
+# Точности Interval и контексты вычислений с ними хранятся в переменной contextvars, а не в полях класса:
+# у каждого потока (и задачи asyncio) свой набор, setprecision, setcalcprecision и workingprecision
+# меняют только набор текущего контекста. Новые потоки начинают с точностей по умолчанию.
+_WorkingPrecision = collections.namedtuple('_WorkingPrecision', ['precision', 'calcprecision', 'floor', 'ceil', 'even',
+                                                                 'lazyquantization'])
+
+
+def _workingprecision(precision, calcprecision, lazyquantization=0):
+    return _WorkingPrecision(precision, calcprecision, deccontext(calcprecision, ROUND_FLOOR),
+                             deccontext(calcprecision, ROUND_CEILING), deccontext(calcprecision, ROUND_HALF_EVEN),
+                             lazyquantization)
+
+
+_working = contextvars.ContextVar('interval_working_precision', default=_workingprecision(10, 50))
+
+
+class _IntervalType(type):
+    # Interval.precision, Interval.calcprecision и Interval.lazyquantization читают и задают параметры текущего контекста
+    @property
+    def precision(cls):
+        return _working.get().precision
+
+    @precision.setter
+    def precision(cls, prec):
+        cls.setprecision(prec)
+
+    @property
+    def calcprecision(cls):
+        return _working.get().calcprecision
+
+    @calcprecision.setter
+    def calcprecision(cls, prec):
+        cls.setcalcprecision(prec)
+
+    @property
+    def lazyquantization(cls):
+        return _working.get().lazyquantization
 
+    @lazyquantization.setter
+    def lazyquantization(cls, mode):
+        _working.set(_working.get()._replace(lazyquantization=mode))
 
-class Interval:
+
+class Interval(metaclass=_IntervalType):
     """
     Класс Interval - интервальная арифметика с управляемой точностью
+            Объекты Interval неизменяемы: концы хранятся в кортеже x (округленными наружу до precision знаков
+            при создании), операции и методы возвращают новые интервалы. Интервалы хешируются по концам
+            и могут быть ключами словарей.
+            precision, calcprecision и lazyquantization свои в каждом потоке (см. _working): их изменение через
+            setprecision, setcalcprecision, workingprecision, lazyquantize, deferredquantization или присваивание
+            Interval.precision не влияет на другие потоки.
+            При lazyquantization = 1 округление до precision знаков откладывается: концы результатов операций
+            хранятся с точностью calcprecision (уже округленными наружу), а до precision знаков округляются
+            только на выходе - в quantized() и при выводе (__repr__).
             Поля:
                 precision (int): точность результата, необходимое количество значащих цифр после запятой        | Default: 10
                 calcprecision (int): точность вычислений, общее максимальное количество значащих цифр в числе   | Default: 50
                 multiintervalmode (int): 0 - выключить результат деления из двух интервалов, 1 - включить       | Default: 1
+                lazyquantization (int): 0 - округлять концы до precision знаков при создании, 1 - отложить       | Default: 0
             Вспомогательные методы взаимодействия с полями:
                 void intervaldiv (): результат деления - всегда один интервал (multiintervalmode = 0)
                 void multiintervaldiv (): результат деления может быть двумя интервалами (multiintervalmode = 1)
                 void setprecision (int prec): установить количество значащих цифр после запятой в prec (precision = prec)
                 void setcalcprecision (int prec): установить точность вычислений в x (calcprecision = prec)
+                workingprecision (int prec, int calcprec): менеджер контекста, временно устанавливающий обе точности
+                void lazyquantize (): отложенное округление концов (lazyquantization = 1)
+                void eagerquantize (): округление концов при создании (lazyquantization = 0)
+                deferredquantization (): менеджер контекста, временно включающий отложенное округление
+                Interval fromEndpoints (Decimal lower, Decimal upper): интервал из уже округленных концов lower <= upper
+                                             без преобразования и округления (для концов других интервалов)
             Операторы:
                 +:  Interval __add__ (self, Interval): сумма двух интервалов с внешним расширяющим округлением
                 -:  Interval __sub__ (self, Interval): разность двух интервалов с внешним расширяющим округлением
@@ -208,9 +406,11 @@ class Interval:
                 !=: Boolean __ne__ (self, Interval): оператор неравенства
 
             Методы:
+                Interval quantized (self): возвращает интервал с концами, округленными наружу до precision знаков
                 Interval mid (self): возвращает точечный интервал - середину исходного интервала, с математическим округлением
                 Interval scale (self, int factor): возвращает интервал с тем же центром, расширенный
                                              в factor раз, с внешним расширяющим округлением
+                int __hash__ (self): хеш концов интервала (точечного - хеш его числа, согласованный с ==)
                 Decimal width (self): возвращает ширину интервала (точно)
                 boolean isIn(self, Interval other): возвращает True, если исходный интервал внутри other, False иначе
                 boolean isAround(self, Interval other): возвращает True, если other внутри исходного интервала, False иначе
@@ -219,22 +419,25 @@ class Interval:
                 Interval exp (self): интервал экспоненты данного интервала, с внешним расширяющим округлением
                 Interval sin (self): интервал синуса данного интервала, с внешним расширяющим округлением
                 Interval cos (self): интервал косинуса данного интервала, с внешним расширяющим округлением
+                Interval tan (self): интервал тангенса (вся прямая, если интервал содержит полюс)
+                Interval atan (self): интервал арктангенса
+                Interval sinh (self), Interval cosh (self): интервалы гиперболических синуса и косинуса
+                Interval ln (self): интервал натурального логарифма (часть интервала левее 0 отбрасывается)
+                Interval sqrt (self): интервал квадратного корня (часть интервала левее 0 отбрасывается)
+                Interval __abs__ (self): интервал модуля
+                Interval ** Fraction: рациональная степень p/q (q > 1) неотрицательной части интервала,
+                                      монотонная, с точным показателем
+                Все функции - с внешним расширяющим округлением
 
     """
-    precision = 10
     multiintervalmode = 1
-    calcprecision = 50
-
-    __savedcontext = Context(prec=50, Emax=MAX_EMAX, Emin=MIN_EMIN, traps=[])
 
-    @staticmethod
-    def __savecontext():
-        Interval.__savedcontext = getcontext().copy()
-        setcontext(Context(prec=Interval.calcprecision, Emax=MAX_EMAX, Emin=MIN_EMIN, traps=[]))
+    # Контексты вычислений (_working.get().floor, .ceil, .even) неизменяемы и используются только явно
+    # (ctx.add, ctx.multiply, ...), глобальный контекст модуля decimal не меняется, поэтому операции
+    # реентерабельны и потокобезопасны
+    __negativezero = Decimal("-0")
 
-    @staticmethod
-    def __loadcontext():
-        setcontext(Interval.__savedcontext)
+    __slots__ = ('x',)
 
     def __init__(self, x):
         '''
@@ -242,18 +445,31 @@ class Interval:
                 Параметры:
                         x (List [x1, x2 ...]): список из хотя бы двух объектов, из которых можно создать объект класса Decimal
         '''
-        Interval.__savecontext()
-        self.x = [0, 0]
-        self.x[0] = Decimal(x[0])
-        self.x[1] = Decimal(x[1])
-        self.__correctize()
-        Interval.__loadcontext()
+        self.x = Interval.__correctize(Decimal(x[0]), Decimal(x[1]))
+
+    @staticmethod
+    def fromEndpoints(lower, upper):
+        '''
+        Создание интервала из концов другого интервала без преобразования и округления
+                Параметры:
+                        lower (Decimal): левый конец, уже округленный до precision знаков
+                        upper (Decimal): правый конец, уже округленный до precision знаков, lower <= upper
+                Возвращаемое значение:
+                        result (Interval): объект класса Interval с концами (lower, upper);
+        '''
+        interval = object.__new__(Interval)
+        interval.x = (lower, upper)
+        return interval
 
     def __repr__(self):
-        Interval.__savecontext()
-        self.__correctize()
-        Interval.__loadcontext()
-        return "[" + str(self.x[0]) + ", " + str(self.x[1]) + "]"
+        lower, upper = Interval.__quantized(*self.x) if _working.get().lazyquantization else self.x
+        return "[" + str(lower) + ", " + str(upper) + "]"
+
+    def __hash__(self):
+        # Точечный интервал равен (==) своему числу, поэтому и хешируется как это число
+        if self.x[0] == self.x[1]:
+            return hash(self.x[0])
+        return hash(self.x)
 
     def mid(self):
         '''
@@ -263,12 +479,15 @@ class Interval:
                             Точность: зависит от параметров Interval.
                             Округление: математическое.
         '''
-        Interval.__savecontext()
+        working = _working.get()
+        ctx = working.even
         middle = Decimal("Inf")
         if (self.x[0] != Decimal("-Inf") and self.x[1] != Decimal("Inf")):
-            middle = (Decimal("0.5") * (self.x[0] + self.x[1])).quantize(Decimal(quantizestring(self.precision)),
-                                                                         rounding=ROUND_HALF_EVEN)
-        Interval.__loadcontext()
+            middle = ctx.multiply(Decimal("0.5"), ctx.add(self.x[0], self.x[1]))
+            # При отложенном округлении середина остается с точностью calcprecision: округленная до precision
+            # знаков, она может оказаться вне интервала, который уже единицы precision-го знака
+            if not working.lazyquantization:
+                middle = middle.quantize(decquantum(working.precision), rounding=ROUND_HALF_EVEN, context=ctx)
         return middle
 
     def width(self):
@@ -279,25 +498,23 @@ class Interval:
                             Точность: зависит от параметров Interval.
                             Округление: нет (всегда точное значение в текущих параметрах).
         '''
-        return self.x[1] - self.x[0]
+        return _working.get().even.subtract(self.x[1], self.x[0])
 
     def scale(self, factor):
         '''
         Расширение/сужение интервала при неизменном центре
                 Параметры:
                         factor (...): число, объект, из которого можно создать объект класса Decimal
-                Результат:
-                        self расширяется в factor раз
-        '''
-        Interval.__savecontext()
-        m = Decimal("0.5") * (self.x[0] + self.x[1])
-        r = Decimal("0.5") * (self.x[1] - self.x[0])
-        getcontext().rounding = ROUND_FLOOR
-        self.x[0] = (m - Decimal(factor) * r)
-        getcontext().rounding = ROUND_CEILING
-        self.x[1] = (m + Decimal(factor) * r)
-        self.__correctize()
-        Interval.__loadcontext()
+                Возвращаемое значение:
+                        result (Interval): новый интервал, расширенный в factor раз
+        '''
+        working = _working.get()
+        floor, ceil = working.floor, working.ceil
+        factor = Decimal(factor)
+        m = [floor.multiply(Decimal("0.5"), floor.add(self.x[0], self.x[1])),
+             ceil.multiply(Decimal("0.5"), ceil.add(self.x[0], self.x[1]))]
+        r = ceil.multiply(factor.copy_abs(), ceil.multiply(Decimal("0.5"), ceil.subtract(self.x[1], self.x[0])))
+        return Interval([floor.subtract(m[0], r), ceil.add(m[1], r)])
 
     def isIn(self, other):
         '''
@@ -321,125 +538,223 @@ class Interval:
         ointerval = Interval.valueToInterval(other)
         return (self.x[0] <= ointerval.x[0]) and (self.x[1] >= ointerval.x[1])
 
-    def __correctize(self):
-        self.x = sorted(self.x)
-        if (self.x[0] != Decimal("Inf") and self.x[0] != Decimal("-Inf")):
-            self.x[0] = self.x[0].quantize(Decimal(quantizestring(self.precision)), rounding=ROUND_FLOOR)
-        if (self.x[1] != Decimal("Inf") and self.x[1] != Decimal("-Inf")):
-            self.x[1] = self.x[1].quantize(Decimal(quantizestring(self.precision)), rounding=ROUND_CEILING)
+    def quantized(self):
+        '''
+        Округление концов интервала до precision знаков после запятой
+                Возвращаемое значение:
+                        result (Interval): новый интервал, содержащий текущий, с концами, округленными наружу;
+                            нужен на выходе вычислений с отложенным округлением (lazyquantization = 1).
+        '''
+        return Interval.fromEndpoints(*Interval.__quantized(*self.x))
+
+    @staticmethod
+    def __correctize(lower, upper):
+        # NaN нельзя сравнивать (InvalidOperation в контексте по умолчанию): интервал NaN остается пустым
+        if lower.is_nan() or upper.is_nan():
+            return Decimal("NaN"), Decimal("NaN")
+        if lower > upper:
+            lower, upper = upper, lower
+        if _working.get().lazyquantization:
+            return lower, upper
+        return Interval.__quantized(lower, upper)
+
+    @staticmethod
+    def __quantized(lower, upper):
+        working = _working.get()
+        quant = decquantum(working.precision)
+        if lower.is_finite():
+            lower = lower.quantize(quant, rounding=ROUND_FLOOR, context=working.floor)
+        if upper.is_finite():
+            upper = upper.quantize(quant, rounding=ROUND_CEILING, context=working.ceil)
+        return lower, upper
 
     def __getitem__(self, item):
-        Interval.__savecontext()
-        self.__correctize()
-        Interval.__loadcontext()
         return self.x[item]
 
-    def __setitem__(self, key, value):
-        Interval.__savecontext()
-        self.x.__setitem__(key, Decimal(value))
-        self.__correctize()
-        Interval.__loadcontext()
-
     def __neg__(self):
-        ninterval = Interval(self.x)
-        Interval.__savecontext()
-        ninterval.x[0] = - self.x[1]
-        ninterval.x[1] = - self.x[0]
-        ninterval.__correctize()
-        Interval.__loadcontext()
-        return ninterval
+        # Смена знака точна и при отложенном округлении
+        return Interval.fromEndpoints(decneg(self.x[1]), decneg(self.x[0]))
 
     def __add__(self, other):
+        working = _working.get()
         ointerval = Interval.valueToInterval(other)
-        ninterval = Interval(self.x)
-        Interval.__savecontext()
-        getcontext().rounding = ROUND_FLOOR
-        ninterval.x[0] = self.x[0] + ointerval.x[0]
-        getcontext().rounding = ROUND_CEILING
-        ninterval.x[1] = self.x[1] + ointerval.x[1]
-        ninterval.__correctize()
-        Interval.__loadcontext()
-        return ninterval
+        return Interval([working.floor.add(self.x[0], ointerval.x[0]), working.ceil.add(self.x[1], ointerval.x[1])])
+
+    @staticmethod
+    def __empty():
+        # Интервал NaN - результат функции вне области определения (создается без сравнения концов)
+        return Interval.fromEndpoints(Decimal("NaN"), Decimal("NaN"))
+
+    @staticmethod
+    def __widened(lower, upper):
+        # Внешнее округление значений функций, вычисленных с точностью calcprecision: на единицу
+        # precision-го знака, умноженную на модуль значения, если он больше 1
+        working = _working.get()
+        floor, ceil = working.floor, working.ceil
+        ed = decquantum(working.precision)
+        if lower.is_finite():
+            lower = floor.subtract(lower, floor.multiply(ed, max(lower.copy_abs(), Decimal(1))))
+        if upper.is_finite():
+            upper = ceil.add(upper, ceil.multiply(ed, max(upper.copy_abs(), Decimal(1))))
+        return Interval([lower, upper])
+
+    @staticmethod
+    def __outward(lower, upper, exact_lower=False, exact_upper=False):
+        # Decimal.exp и Decimal.ln округляют к ближайшему при любом режиме контекста (ошибка не больше
+        # половины единицы последнего знака): неточные значения сдвигаются наружу на единицу последнего
+        # знака calcprecision. Без этого при отложенном округлении концы не содержали бы точных значений
+        working = _working.get()
+        if not exact_lower:
+            lower = working.floor.next_minus(lower)
+        if not exact_upper:
+            upper = working.ceil.next_plus(upper)
+        return Interval([lower, upper])
+
+    def __rationalpower(self, power):
+        # x^(p/q), q > 1: определена при x >= 0 и монотонна (возрастает при p > 0, убывает при p < 0)
+        lower, upper = self.x
+        if upper < 0:
+            return Interval.__empty()
+        if lower <= 0:
+            lower = Decimal(0)
+        if power.numerator == 1 and power.denominator == 2:
+            return Interval.sqrt(Interval.fromEndpoints(lower, upper))
+        even = _working.get().even
+        exponent = even.divide(power.numerator, power.denominator)
+        values = [even.power(lower, exponent), even.power(upper, exponent)]
+        if power < 0:
+            values.reverse()
+        return Interval.__widened(*values)
+
+    def __abs__(self):
+        if self.x[0].is_nan():
+            return self
+        if self.x[0] >= 0:
+            return self
+        if self.x[1] <= 0:
+            return -self
+        return Interval.fromEndpoints(Decimal(0), max(decneg(self.x[0]), self.x[1]))
+
+    # Углы (номер конца основания, номер конца показателя) для нижней и верхней границы x^y = exp(y ln x):
+    # по классам знаков ln x (0 - неотрицателен, 1 - неположителен, 2 - меняет знак) и y - как в умножении
+    __powercorners = {(0, 0): (((0, 0),), ((1, 1),)), (0, 1): (((1, 0),), ((0, 1),)), (0, 2): (((1, 0),), ((1, 1),)),
+                      (1, 0): (((0, 1),), ((1, 0),)), (1, 1): (((1, 1),), ((0, 0),)), (1, 2): (((0, 1),), ((0, 0),)),
+                      (2, 0): (((0, 1),), ((1, 1),)), (2, 1): (((1, 0),), ((0, 0),)),
+                      (2, 2): (((0, 1), (1, 0)), ((0, 0), (1, 1)))}
+
+    def __integerpower(self, n):
+        # Целая степень: монотонна на каждой полуоси, поэтому нужны только две степени концов
+        working = _working.get()
+        floor, ceil = working.floor, working.ceil
+        lower, upper = self.x
+        if lower.is_nan():
+            return self
+        if n == 0:
+            return Interval([1, 1])
+        if n < 0:
+            if lower > 0 or upper < 0:
+                return Interval([1, 1]) / self.__integerpower(-n)
+            # 0 на конце: степень берется на оставшейся полуоси
+            if lower == 0:
+                return Interval([floor.power(upper, n), "Inf"])
+            if upper == 0:
+                if n % 2:
+                    return Interval(["-Inf", ceil.power(lower, n)])
+                return Interval([floor.power(lower, n), "Inf"])
+            if n % 2:
+                return Interval(["-Inf", "Inf"])
+            return Interval([floor.power(max(decneg(lower), upper), n), "Inf"])
+        if n % 2 or lower >= 0:
+            return Interval([floor.power(lower, n), ceil.power(upper, n)])
+        if upper <= 0:
+            return Interval([floor.power(upper, n), ceil.power(lower, n)])
+        return Interval([0, ceil.power(max(decneg(lower), upper), n)])
 
     def __pow__(self, other):
-        Interval.__savecontext()
+        if isinstance(other, int):
+            return self.__integerpower(other)
+        if isinstance(other, Fraction) and other.denominator != 1:
+            return self.__rationalpower(other)
+        working = _working.get()
+        floor, ceil = working.floor, working.ceil
         ointerval = Interval.valueToInterval(other)
         if ((not decisint(ointerval.x[0])) or (not decisint(ointerval.x[1]))):
-            if (self.x[0] < Decimal("0") or self.x[1] < Decimal("0")):
-                Interval.__loadcontext()
-                return Interval(["NAN", "NAN"])
-            else:
-                getcontext().rounding = ROUND_FLOOR
-                vrd = [self.x[0] ** ointerval.x[0], self.x[0] ** ointerval.x[1],
-                       self.x[1] ** ointerval.x[0], self.x[1] ** ointerval.x[1]]
-                getcontext().rounding = ROUND_CEILING
-                vru = [self.x[0] ** ointerval.x[0], self.x[0] ** ointerval.x[1],
-                       self.x[1] ** ointerval.x[0], self.x[1] ** ointerval.x[1]]
-                ninterval = Interval([min(vrd), max(vrd)])
-                Interval.__loadcontext()
-                return ninterval
+            if self.x[0] < 0:
+                return Interval.__empty()
+            logclass = 0 if self.x[0] >= 1 else 1 if self.x[1] <= 1 else 2
+            powerclass = 0 if ointerval.x[0] >= 0 else 1 if ointerval.x[1] <= 0 else 2
+            lower_corners, upper_corners = Interval.__powercorners[logclass, powerclass]
+            return Interval([min(floor.power(self.x[i], ointerval.x[j]) for i, j in lower_corners),
+                             max(ceil.power(self.x[i], ointerval.x[j]) for i, j in upper_corners)])
         else:
             if (ointerval.x[0] == ointerval.x[1]):
-                if (deciseven(ointerval.x[0]) and decsig(self.x[0] != decsig(self.x[1]))):
-                    getcontext().rounding = ROUND_CEILING
-                    vru = [self.x[0] ** ointerval.x[0], self.x[1] ** ointerval.x[0]]
-                    ninterval = Interval([0, max(vru)])
-                    Interval.__loadcontext()
-                    return ninterval
-                getcontext().rounding = ROUND_FLOOR
-                vrd = [self.x[0] ** ointerval.x[0], self.x[1] ** ointerval.x[0]]
-                getcontext().rounding = ROUND_CEILING
-                vru = [self.x[0] ** ointerval.x[0], self.x[1] ** ointerval.x[0]]
-                ninterval = Interval([min(vrd), max(vrd)])
-                Interval.__loadcontext()
-                return ninterval
+                return self.__integerpower(int(ointerval.x[0]))
             else:
-                getcontext().rounding = ROUND_FLOOR
-                vrd = [self.x[0] ** ointerval.x[0], self.x[0] ** ointerval.x[1],
-                       self.x[1] ** ointerval.x[0], self.x[1] ** ointerval.x[1],
-                       self.x[0] ** (ointerval.x[0] + 1), self.x[0] ** (ointerval.x[1] - 1),
-                       self.x[1] ** (ointerval.x[0] + 1), self.x[1] ** (ointerval.x[1] - 1)]
-                getcontext().rounding = ROUND_CEILING
-                vru = [self.x[0] ** ointerval.x[0], self.x[0] ** ointerval.x[1],
-                       self.x[1] ** ointerval.x[0], self.x[1] ** ointerval.x[1],
-                       self.x[0] ** (ointerval.x[0] + 1), self.x[0] ** (ointerval.x[1] - 1),
-                       self.x[1] ** (ointerval.x[0] + 1), self.x[1] ** (ointerval.x[1] - 1)]
-                ninterval = Interval([min(vrd), max(vrd)])
-                Interval.__loadcontext()
-                return ninterval
+                lower = floor.add(ointerval.x[0], 1)
+                upper = floor.subtract(ointerval.x[1], 1)
+                vrd = [floor.power(self.x[0], ointerval.x[0]), floor.power(self.x[0], ointerval.x[1]),
+                       floor.power(self.x[1], ointerval.x[0]), floor.power(self.x[1], ointerval.x[1]),
+                       floor.power(self.x[0], lower), floor.power(self.x[0], upper),
+                       floor.power(self.x[1], lower), floor.power(self.x[1], upper)]
+                vru = [ceil.power(self.x[0], ointerval.x[0]), ceil.power(self.x[0], ointerval.x[1]),
+                       ceil.power(self.x[1], ointerval.x[0]), ceil.power(self.x[1], ointerval.x[1]),
+                       ceil.power(self.x[0], lower), ceil.power(self.x[0], upper),
+                       ceil.power(self.x[1], lower), ceil.power(self.x[1], upper)]
+                return Interval([min(vrd), max(vru)])
 
     def __radd__(self, other):
         ointerval = Interval.valueToInterval(other)
         return ointerval.__add__(self)
 
     def __sub__(self, other):
+        working = _working.get()
         ointerval = Interval.valueToInterval(other)
-        ninterval = Interval(self.x)
-        Interval.__savecontext()
-        getcontext().rounding = ROUND_FLOOR
-        ninterval.x[0] = self.x[0] - ointerval.x[1]
-        getcontext().rounding = ROUND_CEILING
-        ninterval.x[1] = self.x[1] - ointerval.x[0]
-        ninterval.__correctize()
-        Interval.__loadcontext()
-        return ninterval
+        return Interval([working.floor.subtract(self.x[0], ointerval.x[1]),
+                         working.ceil.subtract(self.x[1], ointerval.x[0])])
 
     def __rsub__(self, other):
         ointerval = Interval.valueToInterval(other)
         return ointerval.__sub__(self)
 
     def __mul__(self, other):
+        # Таблица из девяти случаев по знакам концов: каждая граница - одно произведение с нужным округлением,
+        # и только если оба множителя меняют знак - по два
+        working = _working.get()
+        floor, ceil = working.floor, working.ceil
         ointerval = Interval.valueToInterval(other)
-        Interval.__savecontext()
-        getcontext().rounding = ROUND_FLOOR
-        vrd = [self.x[0] * ointerval.x[0], self.x[0] * ointerval.x[1],
-               self.x[1] * ointerval.x[0], self.x[1] * ointerval.x[1]]
-        getcontext().rounding = ROUND_CEILING
-        vru = [self.x[0] * ointerval.x[0], self.x[0] * ointerval.x[1],
-               self.x[1] * ointerval.x[0], self.x[1] * ointerval.x[1]]
-        b = [min(vrd), max(vru)]
-        Interval.__loadcontext()
-        return Interval(b)  # __correctize inside
+        a0, a1 = self.x
+        b0, b1 = ointerval.x
+        if a0.is_nan() or b0.is_nan():
+            return Interval.__empty()
+        if a0 >= 0:
+            if b0 >= 0:
+                lower, upper = floor.multiply(a0, b0), ceil.multiply(a1, b1)
+            elif b1 <= 0:
+                lower, upper = floor.multiply(a1, b0), ceil.multiply(a0, b1) or Interval.__negativezero
+            else:
+                lower, upper = floor.multiply(a1, b0), ceil.multiply(a1, b1)
+        elif a1 <= 0:
+            if b0 >= 0:
+                lower, upper = floor.multiply(a0, b1), ceil.multiply(a1, b0) or Interval.__negativezero
+            elif b1 <= 0:
+                lower, upper = floor.multiply(a1, b1), ceil.multiply(a0, b0)
+            else:
+                lower, upper = floor.multiply(a0, b1), ceil.multiply(a0, b0)
+        else:
+            if b0 >= 0:
+                lower, upper = floor.multiply(a0, b1), ceil.multiply(a1, b1)
+            elif b1 <= 0:
+                lower, upper = floor.multiply(a1, b0), ceil.multiply(a0, b0)
+            else:
+                lower = min(floor.multiply(a0, b1), floor.multiply(a1, b0))
+                upper = max(ceil.multiply(a0, b0), ceil.multiply(a1, b1))
+        # Неположительное произведение с нулевой верхней границей получает -0 (см. __getNullType);
+        # 0 * Inf в интервальной арифметике считается равным 0
+        if lower.is_nan():
+            lower = Decimal(0)
+        if upper.is_nan():
+            upper = Decimal(0)
+        return Interval([lower, upper])  # __correctize inside
 
     def __rmul__(self, other):
         ointerval = Interval.valueToInterval(other)
@@ -467,43 +782,58 @@ class Interval:
 
 
     def __truediv__(self, other):
+        working = _working.get()
+        floor, ceil = working.floor, working.ceil
         ointerval = Interval.valueToInterval(other)
-        Interval.__savecontext()
+        a0, a1 = self.x
+        b0, b1 = ointerval.x
+        if not (a0.is_nan() or b0.is_nan()) and (b0 > 0 or b1 < 0):
+            # Делитель не содержит 0: по одному делению на границу по знакам концов
+            if b0 > 0:
+                if a0 >= 0:
+                    lower, upper = floor.divide(a0, b1), ceil.divide(a1, b0)
+                elif a1 <= 0:
+                    lower, upper = floor.divide(a0, b0), ceil.divide(a1, b1)
+                else:
+                    lower, upper = floor.divide(a0, b0), ceil.divide(a1, b0)
+            else:
+                if a0 >= 0:
+                    lower, upper = floor.divide(a1, b1), ceil.divide(a0, b0)
+                elif a1 <= 0:
+                    lower, upper = floor.divide(a1, b0), ceil.divide(a0, b1)
+                else:
+                    lower, upper = floor.divide(a1, b1), ceil.divide(a0, b1)
+            # Inf / Inf - в общий случай ниже
+            if not (lower.is_nan() or upper.is_nan()):
+                return Interval([lower, upper])
+
         stype = self.__getNullType()
         otype = ointerval.__getNullType()
         if (stype == 4 or otype == 4):
-            Interval.__loadcontext()
-            return Interval(["nan", "nan"])
+            return Interval.__empty()
 
         if ((stype == 3 and otype == 0) or (otype < 3 and stype < 3)):
-            getcontext().rounding = ROUND_FLOOR
-            vrd = [self.x[0] / ointerval.x[0], self.x[0] / ointerval.x[1],
-                   self.x[1] / ointerval.x[0], self.x[1] / ointerval.x[1]]
-            getcontext().rounding = ROUND_CEILING
-            vru = [self.x[0] / ointerval.x[0], self.x[0] / ointerval.x[1],
-                   self.x[1] / ointerval.x[0], self.x[1] / ointerval.x[1]]
+            vrd = [floor.divide(self.x[0], ointerval.x[0]), floor.divide(self.x[0], ointerval.x[1]),
+                   floor.divide(self.x[1], ointerval.x[0]), floor.divide(self.x[1], ointerval.x[1])]
+            vru = [ceil.divide(self.x[0], ointerval.x[0]), ceil.divide(self.x[0], ointerval.x[1]),
+                   ceil.divide(self.x[1], ointerval.x[0]), ceil.divide(self.x[1], ointerval.x[1])]
             vrd = [i for i in vrd if (not Decimal.is_nan(i))]
             vru = [i for i in vru if (not Decimal.is_nan(i))]
             if (len(vrd) == 0 or len(vru) == 0):
                 if (stype == otype):
-                    Interval.__loadcontext()
                     return Interval(["0", "Inf"])
                 else:
-                    Interval.__loadcontext()
                     return Interval(["-Inf", "-0"])
             b = [min(vrd), max(vru)]
             return Interval(b)
 
         if (otype == 3 and stype == 0):
             if (not Interval.multiintervalmode):
-                Interval.__loadcontext()
                 return Interval(["-Inf", "Inf"])
             b1 = self / Interval([ointerval.x[0], Decimal("-0")])
             b2 = self / Interval([Decimal("0"), ointerval.x[1]])
-            Interval.__loadcontext()
             return [b1, b2]
 
-        Interval.__loadcontext()
         return Interval(["-Inf", "Inf"])
 
     def __lt__(self, other):
@@ -550,6 +880,43 @@ class Interval:
         Interval.multiintervalmode = 1
 
 
+    @staticmethod
+    def lazyquantize():
+        '''
+        Переключение в режим отложенного округления
+                Результат:
+                        Концы результатов операций Interval не округляются до precision знаков (остаются
+                        округленными наружу с точностью calcprecision), до precision знаков их округляет quantized();
+        '''
+        Interval.lazyquantization = 1
+
+
+    @staticmethod
+    def eagerquantize():
+        '''
+        Переключение в режим округления при создании
+                Результат:
+                        Концы каждого нового объекта Interval округляются наружу до precision знаков;
+        '''
+        Interval.lazyquantization = 0
+
+
+    @staticmethod
+    @contextmanager
+    def deferredquantization():
+        '''
+        Временное включение отложенного округления (для блока with)
+                Результат:
+                        Внутри блока with действует режим lazyquantization = 1 (только в текущем потоке),
+                        после выхода из него восстанавливается прежний режим;
+        '''
+        token = _working.set(_working.get()._replace(lazyquantization=1))
+        try:
+            yield
+        finally:
+            _working.reset(token)
+
+
     @staticmethod
     def setprecision(prec):
         '''
@@ -559,7 +926,7 @@ class Interval:
                 Результат:
                         Точность результатов операций Interval становится равной prec;
         '''
-        Interval.precision = prec
+        _working.set(_working.get()._replace(precision=prec))
 
 
     @staticmethod
@@ -571,7 +938,27 @@ class Interval:
                 Результат:
                         Точность вычислений операций Interval становится равной prec;
         '''
-        Interval.calcprecision = prec
+        working = _working.get()
+        _working.set(_workingprecision(working.precision, prec, working.lazyquantization))
+
+
+    @staticmethod
+    @contextmanager
+    def workingprecision(prec, calcprec):
+        '''
+        Временная установка точности результата и точности вычислений (для блока with)
+                Параметры:
+                        prec (int): число, точность результатов операций Interval внутри блока;
+                        calcprec (int): число, точность вычислений операций Interval внутри блока;
+                Результат:
+                        Внутри блока with действуют точности prec и calcprec (только в текущем потоке),
+                        после выхода из него восстанавливаются прежние значения precision и calcprecision;
+        '''
+        token = _working.set(_workingprecision(prec, calcprec, _working.get().lazyquantization))
+        try:
+            yield
+        finally:
+            _working.reset(token)
 
 
     @staticmethod
@@ -610,26 +997,25 @@ class Interval:
                             Точность: зависит от параметров Interval.
                             Округление: внешнее расширяющее.
         '''
-        Interval.__savecontext()
-        ed = Decimal(quantizestring(Interval.precision)).quantize(Decimal(quantizestring(Interval.precision)),
-                                                                  rounding=ROUND_CEILING)
-        getcontext().rounding = ROUND_FLOOR
-        yrd = [decsin(x[0]) - ed, decsin(x[1]) - ed]
-        getcontext().rounding = ROUND_CEILING
-        yru = [decsin(x[0]) + ed, decsin(x[1]) + ed]
-        pi2 = Decimal("2") * decpi()
-        pi05 = decpi() / Decimal("2")
-        if ((x[0] - pi05) / pi2).quantize(Decimal("1"), rounding=ROUND_CEILING) <= ((x[1] - pi05) / pi2).quantize(
-                Decimal("1"), rounding=ROUND_FLOOR):
+        working = _working.get()
+        floor, ceil = working.floor, working.ceil
+        if (not x[0].is_finite()) or (not x[1].is_finite()):
+            return Interval(["-1", "1"])
+        ed = decquantum(working.precision)
+        y = [decsin(x[0], working.even), decsin(x[1], working.even)]
+        yrd = [floor.subtract(y[0], ed), floor.subtract(y[1], ed)]
+        yru = [ceil.add(y[0], ed), ceil.add(y[1], ed)]
+        pi, pi2, pi05 = decpiconsts(ceil)
+        if ceil.divide(ceil.subtract(x[0], pi05), pi2).quantize(Decimal("1"), rounding=ROUND_CEILING, context=ceil) <= \
+                ceil.divide(ceil.subtract(x[1], pi05), pi2).quantize(Decimal("1"), rounding=ROUND_FLOOR, context=ceil):
             b = Decimal("1")
         else:
             b = max(yru)
-        if ((x[0] + pi05) / pi2).quantize(Decimal("1"), rounding=ROUND_CEILING) <= ((x[1] + pi05) / pi2).quantize(
-                Decimal("1"), rounding=ROUND_FLOOR):
+        if ceil.divide(ceil.add(x[0], pi05), pi2).quantize(Decimal("1"), rounding=ROUND_CEILING, context=ceil) <= \
+                ceil.divide(ceil.add(x[1], pi05), pi2).quantize(Decimal("1"), rounding=ROUND_FLOOR, context=ceil):
             a = Decimal("-1")
         else:
             a = min(yrd)
-        Interval.__loadcontext()
         return Interval([a, b])
 
 
@@ -644,25 +1030,25 @@ class Interval:
                             Точность: зависит от параметров Interval.
                             Округление: внешнее расширяющее.
         '''
-        Interval.__savecontext()
-        ed = Decimal(quantizestring(Interval.precision)).quantize(Decimal(quantizestring(Interval.precision)),
-                                                                  rounding=ROUND_CEILING)
-        getcontext().rounding = ROUND_FLOOR
-        yrd = [deccos(x[0]) - ed, deccos(x[1]) - ed]
-        getcontext().rounding = ROUND_CEILING
-        yru = [deccos(x[0]) + ed, deccos(x[1]) + ed]
-        pi2 = 2 * decpi()
-        if (x[0] / pi2).quantize(Decimal("1"), rounding=ROUND_CEILING) <= (x[1] / pi2).quantize(Decimal("1"),
-                                                                                                rounding=ROUND_FLOOR):
+        working = _working.get()
+        floor, ceil = working.floor, working.ceil
+        if (not x[0].is_finite()) or (not x[1].is_finite()):
+            return Interval(["-1", "1"])
+        ed = decquantum(working.precision)
+        y = [deccos(x[0], working.even), deccos(x[1], working.even)]
+        yrd = [floor.subtract(y[0], ed), floor.subtract(y[1], ed)]
+        yru = [ceil.add(y[0], ed), ceil.add(y[1], ed)]
+        pi, pi2, pi05 = decpiconsts(ceil)
+        if ceil.divide(x[0], pi2).quantize(Decimal("1"), rounding=ROUND_CEILING, context=ceil) <= \
+                ceil.divide(x[1], pi2).quantize(Decimal("1"), rounding=ROUND_FLOOR, context=ceil):
             b = Decimal("1")
         else:
             b = max(yru)
-        if ((x[0] - decpi()) / pi2).quantize(Decimal("1"), rounding=ROUND_CEILING) <= ((x[1] - decpi()) / pi2).quantize(
-                Decimal("1"), rounding=ROUND_FLOOR):
+        if ceil.divide(ceil.subtract(x[0], pi), pi2).quantize(Decimal("1"), rounding=ROUND_CEILING, context=ceil) <= \
+                ceil.divide(ceil.subtract(x[1], pi), pi2).quantize(Decimal("1"), rounding=ROUND_FLOOR, context=ceil):
             a = Decimal("-1")
         else:
             a = min(yrd)
-        Interval.__loadcontext()
         return Interval([a, b])
 
 
@@ -675,15 +1061,12 @@ class Interval:
                 Возвращаемое значение:
                         result (Interval): новый интервал, соответствующий экспоненте от исходного;
         '''
+        even = _working.get().even
         ninterval = Interval(x)
-        Interval.__savecontext()
-        getcontext().rounding = ROUND_FLOOR
-        ninterval.x[0] = Decimal.exp(ninterval.x[0])
-        getcontext().rounding = ROUND_CEILING
-        ninterval.x[1] = Decimal.exp(ninterval.x[1])
-        ninterval.__correctize()
-        Interval.__loadcontext()
-        return ninterval
+        lower, upper = ninterval.x
+        # exp точна только в 0 и на бесконечностях
+        return Interval.__outward(lower.exp(context=even), upper.exp(context=even),
+                                  not lower or not lower.is_finite(), not upper or not upper.is_finite())
 
 
     @staticmethod
@@ -696,12 +1079,120 @@ class Interval:
                         result (Interval): новый интервал, соответствующий натуралному логарифму от исходного;
         '''
         ninterval = Interval(x)
-        Interval.__savecontext()
-        getcontext().rounding = ROUND_FLOOR
-        ninterval.x[0] = Decimal.ln(ninterval.x[0])
-        getcontext().rounding = ROUND_CEILING
-        ninterval.x[1] = Decimal.ln(ninterval.x[1])
-        ninterval.__correctize()
-        Interval.__loadcontext()
-        return ninterval
+        if ninterval.x[1] < 0:
+            return Interval.__empty()
+        even = _working.get().even
+        lower, upper = ninterval.x
+        # ln точен только в 1, в 0 и на бесконечности
+        return Interval.__outward(Decimal("-Inf") if lower <= 0 else lower.ln(context=even), upper.ln(context=even),
+                                  lower <= 0 or lower == 1 or not lower.is_finite(),
+                                  not upper or upper == 1 or not upper.is_finite())
+
+
+    @staticmethod
+    def sqrt(x):
+        '''
+        Квадратный корень интервала
+                Параметры:
+                        x (...): объект, из которого можно создать объект класса Interval;
+                Возвращаемое значение:
+                        result (Interval): новый интервал, квадратный корень неотрицательной части исходного;
+                            Точность: зависит от параметров Interval.
+                            Округление: внешнее расширяющее.
+        '''
+        # Decimal.sqrt всегда округляет к ближайшему, поэтому концы расширяются через __widened
+        even = _working.get().even
+        ninterval = Interval.valueToInterval(x)
+        if ninterval.x[1].is_nan() or ninterval.x[1] < 0:
+            return Interval.__empty()
+        lower = Decimal(0) if ninterval.x[0] <= 0 else ninterval.x[0].sqrt(context=even)
+        lower, upper = Interval.__widened(lower, ninterval.x[1].sqrt(context=even)).x
+        return Interval([max(lower, Decimal(0)), upper])
+
+
+    @staticmethod
+    def tan(x):
+        '''
+        Вычисление интервала - тангенса интервала
+                Параметры:
+                        x (Interval): объект класса Interval;
+                Возвращаемое значение:
+                        result (Interval): объект класса Interval, тангенс исходного интервала;
+                            Тангенс возрастает между полюсами Пи/2 + k * Пи: если полюса в интервале нет,
+                            результат - значения на концах, иначе вся прямая.
+                            Точность: зависит от параметров Interval.
+                            Округление: внешнее расширяющее.
+        '''
+        working = _working.get()
+        ceil = working.ceil
+        if (not x[0].is_finite()) or (not x[1].is_finite()):
+            return Interval(["-Inf", "Inf"])
+        pi, pi2, pi05 = decpiconsts(ceil)
+        if ceil.divide(ceil.subtract(x[0], pi05), pi).quantize(Decimal("1"), rounding=ROUND_CEILING, context=ceil) <= \
+                ceil.divide(ceil.subtract(x[1], pi05), pi).quantize(Decimal("1"), rounding=ROUND_FLOOR, context=ceil):
+            return Interval(["-Inf", "Inf"])
+        y = [dectg(x[0], working.even), dectg(x[1], working.even)]
+        if y[0] > y[1]:
+            # Полюс рядом с концом, не отделенный при текущей точности
+            return Interval(["-Inf", "Inf"])
+        return Interval.__widened(y[0], y[1])
+
+
+    @staticmethod
+    def atan(x):
+        '''
+        Вычисление интервала - арктангенса интервала
+                Параметры:
+                        x (Interval): объект класса Interval;
+                Возвращаемое значение:
+                        result (Interval): объект класса Interval, арктангенс исходного интервала (функция возрастает);
+                            Точность: зависит от параметров Interval.
+                            Округление: внешнее расширяющее.
+        '''
+        even = _working.get().even
+        return Interval.__widened(decatan(x[0], even), decatan(x[1], even))
+
+
+    @staticmethod
+    def __sinhcosh(value):
+        even = _working.get().even
+        exp, inverse = value.exp(context=even), decneg(value).exp(context=even)
+        return even.divide(even.subtract(exp, inverse), 2), even.divide(even.add(exp, inverse), 2)
+
 
+    @staticmethod
+    def sinh(x):
+        '''
+        Гиперболический синус интервала
+                Параметры:
+                        x (Interval): объект класса Interval;
+                Возвращаемое значение:
+                        result (Interval): объект класса Interval, гиперболический синус исходного интервала
+                                           (функция возрастает);
+                            Точность: зависит от параметров Interval.
+                            Округление: внешнее расширяющее.
+        '''
+        return Interval.__widened(Interval.__sinhcosh(x[0])[0], Interval.__sinhcosh(x[1])[0])
+
+
+    @staticmethod
+    def cosh(x):
+        '''
+        Гиперболический косинус интервала
+                Параметры:
+                        x (Interval): объект класса Interval;
+                Возвращаемое значение:
+                        result (Interval): объект класса Interval, гиперболический косинус исходного интервала
+                                           (убывает при x < 0, возрастает при x > 0, минимум 1 в нуле);
+                            Точность: зависит от параметров Interval.
+                            Округление: внешнее расширяющее.
+        '''
+        if x[0].is_nan():
+            return Interval.__empty()
+        y = [Interval.__sinhcosh(x[0])[1], Interval.__sinhcosh(x[1])[1]]
+        if x[0] >= 0:
+            return Interval.__widened(y[0], y[1])
+        if x[1] <= 0:
+            return Interval.__widened(y[1], y[0])
+        upper = Interval.__widened(Decimal(1), max(y))[1]
+        return Interval([Decimal(1), upper])
@@ -0,0 +1,264 @@
+from decimal import Decimal
+
+import numpy as np
+
+from float_interval import FloatInterval, _tofloat
+
+
+def round_down(values, ulps=1):
+    for _ in range(ulps):
+        values = np.nextafter(values, -np.inf)
+    return values
+
+
+def round_up(values, ulps=1):
+    for _ in range(ulps):
+        values = np.nextafter(values, np.inf)
+    return values
+
+
+# Погрешность numpy для sin, cos, exp, log, sqrt, tan, arctan, sinh, cosh не превосходит нескольких ulp
+# (зависит от реализации SIMD-ядер)
+_FUNCTION_ULPS = 4
+
+
+class IntervalArray:
+    """
+    Класс IntervalArray - массив интервалов в виде структуры массивов
+            Левые и правые концы хранятся в двух непрерывных массивах numpy.float64 (lower, upper).
+            Все операции выполняются поэлементно для всего массива сразу и округляются наружу
+            (np.nextafter), поэтому каждый элемент результата содержит точный результат операции.
+            Поля:
+                lower (numpy.ndarray): левые концы интервалов
+                upper (numpy.ndarray): правые концы интервалов
+            Операторы:
+                +, -, *, /: поэлементные операции с другим IntervalArray или числом; если делитель содержит 0,
+                            результатом для этого элемента будет [-Inf, Inf]
+                **: возведение в целую степень, а также в нецелую степень для неотрицательных интервалов
+                abs: поэлементный модуль
+            Методы:
+                IntervalArray fromIntervals (intervals): создание из списка или Intervals объектов Interval/FloatInterval
+                list toIntervals (self): список объектов FloatInterval
+                numpy.ndarray mid (self): середины интервалов
+                numpy.ndarray width (self): ширины интервалов
+            Математические функции:
+                array_sin, array_cos, array_exp, array_log, array_sqrt, array_tan, array_atan, array_sinh, array_cosh
+    """
+    # numpy не должен превращать IntervalArray в массив объектов в выражениях вида numpy.float64 * IntervalArray
+    __array_ufunc__ = None
+
+    def __init__(self, lower, upper=None):
+        '''
+        Инициализация массива интервалов
+                Параметры:
+                        lower (array_like): левые концы интервалов
+                        upper (array_like): правые концы интервалов, по умолчанию совпадают с левыми (точечные интервалы)
+        '''
+        self.lower = np.ascontiguousarray(lower, dtype=np.float64)
+        if upper is None:
+            self.upper = self.lower.copy()
+        else:
+            self.upper = np.ascontiguousarray(upper, dtype=np.float64)
+
+    @staticmethod
+    def fromIntervals(intervals):
+        lower = [_tofloat(interval[0], -1) for interval in intervals]
+        upper = [_tofloat(interval[1], 1) for interval in intervals]
+        return IntervalArray(lower, upper)
+
+    def toIntervals(self):
+        return [FloatInterval.fromEndpoints(float(lower), float(upper))
+                for lower, upper in zip(self.lower, self.upper)]
+
+    @staticmethod
+    def valueToIntervalArray(expr):
+        if isinstance(expr, IntervalArray):
+            return expr
+        if isinstance(expr, (Decimal, str)):
+            return IntervalArray(_tofloat(expr, -1), _tofloat(expr, 1))
+        return IntervalArray(expr)
+
+    def __len__(self):
+        return len(self.lower)
+
+    def __repr__(self):
+        return "IntervalArray(" + ", ".join(f"[{l!r}, {u!r}]" for l, u in zip(self.lower, self.upper)) + ")"
+
+    def mid(self):
+        return 0.5 * self.lower + 0.5 * self.upper
+
+    def width(self):
+        return round_up(self.upper - self.lower)
+
+    def __neg__(self):
+        return IntervalArray(-self.upper, -self.lower)
+
+    def __abs__(self):
+        lower = np.where(self.lower >= 0, self.lower, np.where(self.upper <= 0, -self.upper, 0.0))
+        return IntervalArray(lower, np.maximum(np.abs(self.lower), np.abs(self.upper)))
+
+    def __add__(self, other):
+        other = IntervalArray.valueToIntervalArray(other)
+        return IntervalArray(round_down(self.lower + other.lower), round_up(self.upper + other.upper))
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        other = IntervalArray.valueToIntervalArray(other)
+        return IntervalArray(round_down(self.lower - other.upper), round_up(self.upper - other.lower))
+
+    def __rsub__(self, other):
+        return IntervalArray.valueToIntervalArray(other).__sub__(self)
+
+    def __mul__(self, other):
+        other = IntervalArray.valueToIntervalArray(other)
+        with np.errstate(invalid='ignore'):
+            products = np.stack([self.lower * other.lower, self.lower * other.upper,
+                                 self.upper * other.lower, self.upper * other.upper])
+        nan = np.isnan(self.lower + self.upper + other.lower + other.upper)
+        # 0 * Inf в интервальной арифметике считается равным 0
+        products = np.where(np.isnan(products), 0.0, products)
+        lower = np.where(nan, np.nan, round_down(products.min(axis=0)))
+        upper = np.where(nan, np.nan, round_up(products.max(axis=0)))
+        return IntervalArray(lower, upper)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        other = IntervalArray.valueToIntervalArray(other)
+        return self * other.inversed()
+
+    def __rtruediv__(self, other):
+        return IntervalArray.valueToIntervalArray(other).__truediv__(self)
+
+    def inversed(self):
+        '''
+        Поэлементное вычисление 1 / x
+                Возвращаемое значение:
+                        result (IntervalArray): массив обратных интервалов; для интервалов, содержащих 0 внутри,
+                                                результат [-Inf, Inf], для интервалов с концом в 0 - полупрямая
+        '''
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lower = round_down(1.0 / self.upper)
+            upper = round_up(1.0 / self.lower)
+        lower = np.where(self.upper == 0, -np.inf, lower)
+        upper = np.where(self.lower == 0, np.inf, upper)
+        straddles = (self.lower < 0) & (self.upper > 0)
+        lower = np.where(straddles, -np.inf, lower)
+        upper = np.where(straddles, np.inf, upper)
+        return IntervalArray(lower, upper)
+
+    def __pow__(self, power):
+        if isinstance(power, IntervalArray):
+            if not (np.all(power.lower == power.upper) and np.all(power.lower == power.lower[0])):
+                raise ValueError("Wrong power")
+            power = float(power.lower[0])
+        power = float(power)
+        if power.is_integer():
+            n = int(power)
+            if n == 0:
+                return IntervalArray(np.ones_like(self.lower))
+            if n < 0:
+                return (self ** (-n)).inversed()
+            with np.errstate(over='ignore'):
+                lower_power = self.lower ** n
+                upper_power = self.upper ** n
+            if n % 2 == 1:
+                return IntervalArray(round_down(lower_power, _FUNCTION_ULPS), round_up(upper_power, _FUNCTION_ULPS))
+            contains_zero = (self.lower <= 0) & (self.upper >= 0)
+            lower = np.where(contains_zero, 0.0, np.maximum(0.0, round_down(np.minimum(lower_power, upper_power), _FUNCTION_ULPS)))
+            upper = round_up(np.maximum(lower_power, upper_power), _FUNCTION_ULPS)
+            return IntervalArray(lower, upper)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            powers = np.stack([self.lower ** power, self.upper ** power])
+        lower = np.maximum(0.0, round_down(powers.min(axis=0), _FUNCTION_ULPS))
+        upper = round_up(powers.max(axis=0), _FUNCTION_ULPS)
+        negative = self.lower < 0
+        return IntervalArray(np.where(negative, np.nan, lower), np.where(negative, np.nan, upper))
+
+
+def _contains_period_point(x, shift, period=2 * np.pi):
+    # Есть ли в интервале точка shift + period*k; граница расширена на погрешность вычисления с float
+    tolerance = 1e-13 * (1 + np.maximum(np.abs(x.lower), np.abs(x.upper)))
+    return np.ceil((x.lower - shift) / period - tolerance) <= np.floor((x.upper - shift) / period + tolerance)
+
+
+def _periodic(x, function, maximum_shift, minimum_shift):
+    x = IntervalArray.valueToIntervalArray(x)
+    values = np.stack([function(x.lower), function(x.upper)])
+    upper = np.minimum(1.0, round_up(values.max(axis=0), _FUNCTION_ULPS))
+    lower = np.maximum(-1.0, round_down(values.min(axis=0), _FUNCTION_ULPS))
+    whole = ~(np.isfinite(x.lower) & np.isfinite(x.upper)) | (x.upper - x.lower >= 2 * np.pi)
+    upper = np.where(whole | _contains_period_point(x, maximum_shift), 1.0, upper)
+    lower = np.where(whole | _contains_period_point(x, minimum_shift), -1.0, lower)
+    return IntervalArray(lower, upper)
+
+
+def array_sin(x):
+    with np.errstate(invalid='ignore'):
+        return _periodic(x, np.sin, np.pi / 2, -np.pi / 2)
+
+
+def array_cos(x):
+    with np.errstate(invalid='ignore'):
+        return _periodic(x, np.cos, 0.0, np.pi)
+
+
+def array_exp(x):
+    x = IntervalArray.valueToIntervalArray(x)
+    with np.errstate(over='ignore'):
+        return IntervalArray(np.maximum(0.0, round_down(np.exp(x.lower), _FUNCTION_ULPS)),
+                             round_up(np.exp(x.upper), _FUNCTION_ULPS))
+
+
+def array_log(x):
+    x = IntervalArray.valueToIntervalArray(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lower = np.where(x.lower > 0, round_down(np.log(x.lower), _FUNCTION_ULPS), -np.inf)
+        upper = np.where(x.upper > 0, round_up(np.log(x.upper), _FUNCTION_ULPS), -np.inf)
+    negative = x.upper < 0
+    return IntervalArray(np.where(negative, np.nan, lower), np.where(negative, np.nan, upper))
+
+
+def array_sqrt(x):
+    x = IntervalArray.valueToIntervalArray(x)
+    with np.errstate(invalid='ignore'):
+        lower = np.where(x.lower > 0, np.maximum(0.0, round_down(np.sqrt(x.lower), _FUNCTION_ULPS)), 0.0)
+        upper = round_up(np.sqrt(x.upper), _FUNCTION_ULPS)
+    negative = x.upper < 0
+    return IntervalArray(np.where(negative, np.nan, lower), np.where(negative, np.nan, upper))
+
+
+def array_tan(x):
+    # Тангенс возрастает между полюсами pi/2 + pi*k: если полюса в интервале нет - значения на концах
+    x = IntervalArray.valueToIntervalArray(x)
+    with np.errstate(invalid='ignore'):
+        lower = round_down(np.tan(x.lower), _FUNCTION_ULPS)
+        upper = round_up(np.tan(x.upper), _FUNCTION_ULPS)
+        whole = ~(np.isfinite(x.lower) & np.isfinite(x.upper)) | (x.upper - x.lower >= np.pi) | \
+            _contains_period_point(x, np.pi / 2, np.pi) | (lower > upper)
+    return IntervalArray(np.where(whole, -np.inf, lower), np.where(whole, np.inf, upper))
+
+
+def array_atan(x):
+    x = IntervalArray.valueToIntervalArray(x)
+    return IntervalArray(round_down(np.arctan(x.lower), _FUNCTION_ULPS), round_up(np.arctan(x.upper), _FUNCTION_ULPS))
+
+
+def array_sinh(x):
+    x = IntervalArray.valueToIntervalArray(x)
+    with np.errstate(over='ignore'):
+        return IntervalArray(round_down(np.sinh(x.lower), _FUNCTION_ULPS), round_up(np.sinh(x.upper), _FUNCTION_ULPS))
+
+
+def array_cosh(x):
+    # Убывает при x < 0, возрастает при x > 0, минимум 1 в нуле
+    x = IntervalArray.valueToIntervalArray(x)
+    with np.errstate(over='ignore'):
+        values = np.stack([np.cosh(x.lower), np.cosh(x.upper)])
+    contains_zero = (x.lower <= 0) & (x.upper >= 0)
+    lower = np.where(contains_zero, 1.0, np.maximum(1.0, round_down(values.min(axis=0), _FUNCTION_ULPS)))
+    return IntervalArray(lower, round_up(values.max(axis=0), _FUNCTION_ULPS))
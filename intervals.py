@@ -1,18 +1,40 @@
 from interval import Interval
+from float_interval import FloatInterval
 from decimal import Decimal
 
 import math
-from copy import deepcopy
+from bisect import bisect_left
+from heapq import merge
+
+
+INTERVAL_TYPES = (Interval, FloatInterval)
 
 
 class Intervals:
-    def __init__(self, intervals):
+    backend = Interval
+
+    def __init__(self, intervals, backend=None):
         assert isinstance(intervals, list), "Can create intervals only from list of intervals"
         for interval in intervals:
-            assert isinstance(interval, Interval), "Can create intervals only from list of intervals"
-        self.data = deepcopy(intervals)
+            assert isinstance(interval, INTERVAL_TYPES), "Can create intervals only from list of intervals"
+        if backend is not None:
+            self.backend = backend
+        self.data = intervals
         self._normalize()
 
+    @staticmethod
+    def _from_sorted(data, backend):
+        # data уже упорядочен по левым концам и состоит из непересекающихся интервалов
+        result = Intervals.__new__(Intervals)
+        result.backend = backend
+        result.data = data
+        return result
+
+    def get_backend(self):
+        if self.data:
+            return type(self.data[0])
+        return self.backend
+
     def __len__(self):
         return len(self.data)
 
@@ -36,7 +58,7 @@ class Intervals:
         return result
 
     def __eq__(self, other):
-        other = value_to_intervals(other)
+        other = value_to_intervals(other, self.get_backend())
         if len(self) != len(other):
             return False
 
@@ -46,7 +68,7 @@ class Intervals:
         return True
 
     def __gt__(self, other):
-        other = value_to_intervals(other)
+        other = value_to_intervals(other, self.get_backend())
         for interval1 in self:
             for interval2 in other:
                 if not (interval1 > interval2):
@@ -54,7 +76,7 @@ class Intervals:
         return True
 
     def __lt__(self, other):
-        other = value_to_intervals(other)
+        other = value_to_intervals(other, self.get_backend())
         for interval1 in self:
             for interval2 in other:
                 if not (interval1 < interval2):
@@ -76,9 +98,9 @@ class Intervals:
     def __add__(self, other):
         result = []
         for interval1 in self:
-            for interval2 in value_to_intervals(other):
+            for interval2 in value_to_intervals(other, self.get_backend()):
                 result.append(interval1 + interval2)
-        return Intervals(result)
+        return Intervals(result, self.get_backend())
 
     def __radd__(self, other):
         return self.__add__(other)
@@ -86,27 +108,25 @@ class Intervals:
     def __sub__(self, other):
         result = []
         for interval1 in self:
-            for interval2 in value_to_intervals(other):
+            for interval2 in value_to_intervals(other, self.get_backend()):
                 result.append(interval1 - interval2)
-        return Intervals(result)
+        return Intervals(result, self.get_backend())
 
     def __rsub__(self, other):
-        other_intervals = value_to_intervals(other)
+        other_intervals = value_to_intervals(other, self.get_backend())
         return other_intervals.__sub__(self)
 
 
     def __neg__(self):
-        result = []
-        for interval in self:
-            result.append(-interval)
-        return Intervals(result)
+        result = [-interval for interval in reversed(self.data)]
+        return Intervals._from_sorted(result, self.get_backend())
 
     def __mul__(self, other):
         result = []
         for interval1 in self:
-            for interval2 in value_to_intervals(other):
+            for interval2 in value_to_intervals(other, self.get_backend()):
                 result.append(interval1 * interval2)
-        return Intervals(result)
+        return Intervals(result, self.get_backend())
 
     def __rmul__(self, other):
         return self.__mul__(other)
@@ -120,102 +140,173 @@ class Intervals:
         result = []
         for interval in self:
             result.append(interval ** power)
-        return value_to_intervals(result)
+        return Intervals(result, self.get_backend())
+
+    def __abs__(self):
+        return Intervals([abs(interval) for interval in self], self.get_backend())
 
     def inversed(self):
         result = []
         for interval in self:
-            value = Interval([Decimal('1'), Decimal('1')]) / interval
+            value = type(interval)([Decimal('1'), Decimal('1')]) / interval
 
-            if isinstance(value[0], Interval):
+            if isinstance(value[0], INTERVAL_TYPES):
                 result.append(value[0])
                 result.append(value[1])
             else:
                 result.append(value)
-        return Intervals(result)
+        return Intervals(result, self.get_backend())
 
     def __truediv__(self, other):
-        other = value_to_intervals(other)
-        result = Intervals([])
+        other = value_to_intervals(other, self.get_backend())
+        result = []
 
         for interval in self:
             for other_interval in other:
-                result.union(value_to_intervals(interval / other_interval))
-        return result
+                value = interval / other_interval
+                if isinstance(value, list):
+                    result.extend(value)
+                else:
+                    result.append(value)
+        return Intervals(result, self.get_backend())
 
     def __rtruediv__(self, other):
-        other = value_to_intervals(other)
+        other = value_to_intervals(other, self.get_backend())
         return other.__truediv__(self)
 
     def append(self, interval):
-        self.data.append(Interval(interval.x.copy()))
-        self._normalize()
+        # Вставка одного интервала: двоичный поиск позиции и слияние только с соседями
+        data = self.data
+        left_end, right_end = interval.x[0], interval.x[1]
+        start = bisect_left(data, left_end, key=_left_end)
+        if start > 0 and data[start - 1].x[1] >= left_end:
+            start -= 1
+        stop = start
+        while stop < len(data) and data[stop].x[0] <= right_end:
+            stop += 1
+        if stop - start == 0:
+            data.insert(start, interval)
+            return
+        if stop - start == 1 and data[start].isAround(interval):
+            return
+        left_end = min(left_end, data[start].x[0])
+        right_end = max(right_end, data[stop - 1].x[1])
+        data[start:stop] = [type(interval).fromEndpoints(left_end, right_end)]
 
     def union(self, intervals):
-        intervals = value_to_intervals(intervals)
-        for interval in intervals:
-            self.data.append(Interval(interval.x.copy()))
-        self._normalize()
+        intervals = value_to_intervals(intervals, self.get_backend())
+        if len(intervals) < 8:
+            for interval in intervals:
+                self.append(interval)
+            return
+        self.data = _merge_sorted(merge(self.data, intervals.data, key=_left_end))
 
     def intersect(self, intervals):
-        intervals = value_to_intervals(intervals)
+        # Проход двумя указателями по двум упорядоченным наборам непересекающихся интервалов
+        intervals = value_to_intervals(intervals, self.get_backend())
+        old, new = self.data, intervals.data
         result = []
-        for new_interval in intervals:
-            for old_interval in self:
-                left_end = max(old_interval[0], new_interval[0])
-                right_end = min(old_interval[1], new_interval[1])
-                intersection_part = Interval([left_end, right_end])
-                if left_end <= right_end:
-                    result.append(intersection_part)
+        i = j = 0
+        while i < len(old) and j < len(new):
+            old_interval, new_interval = old[i], new[j]
+            left_end = max(old_interval.x[0], new_interval.x[0])
+            right_end = min(old_interval.x[1], new_interval.x[1])
+            if left_end <= right_end:
+                if left_end == old_interval.x[0] and right_end == old_interval.x[1]:
+                    result.append(old_interval)
+                else:
+                    result.append(type(old_interval).fromEndpoints(left_end, right_end))
+            if old_interval.x[1] < new_interval.x[1]:
+                i += 1
+            else:
+                j += 1
         self.data = result
-        self._normalize()
-
 
     def _normalize(self):
-        self.data.sort(key=lambda x: x[0])
+        self.data = _merge_sorted(sorted(self.data, key=_left_end))
 
-        normalized = []
-        for interval in self:
-            if normalized and normalized[-1][1] >= interval[0]:
-                normalized[-1][1] = max(normalized[-1][1], interval[1])
-            else:
-                normalized.append(interval)
-        self.data = normalized
+
+def _left_end(interval):
+    return interval.x[0]
+
+
+def _merge_sorted(intervals):
+    # Слияние пересекающихся и соприкасающихся интервалов из упорядоченной по левым концам последовательности
+    normalized = []
+    for interval in intervals:
+        if normalized and normalized[-1].x[1] >= interval.x[0]:
+            if interval.x[1] > normalized[-1].x[1]:
+                normalized[-1] = type(interval).fromEndpoints(normalized[-1].x[0], interval.x[1])
+        else:
+            normalized.append(interval)
+    return normalized
 
 
 def intervals_sin(x):
     x = value_to_intervals(x)
-    result = [Interval.sin(interval) for interval in x]
-    return Intervals(result)
+    result = [type(interval).sin(interval) for interval in x]
+    return Intervals(result, x.get_backend())
 
 
 def intervals_cos(x):
     x = value_to_intervals(x)
-    result = [Interval.cos(interval) for interval in x]
-    return Intervals(result)
+    result = [type(interval).cos(interval) for interval in x]
+    return Intervals(result, x.get_backend())
 
 
 def intervals_exp(x):
     x = value_to_intervals(x)
-    result = [Interval.exp(interval) for interval in x]
-    return Intervals(result)
+    result = [type(interval).exp(interval) for interval in x]
+    return Intervals(result, x.get_backend())
 
 
 def intervals_ln(x):
     x = value_to_intervals(x)
-    result = [Interval.sin(interval) for interval in x]
-    return Intervals(result)
+    result = [type(interval).ln(interval) for interval in x]
+    return Intervals(result, x.get_backend())
+
+
+def intervals_sqrt(x):
+    x = value_to_intervals(x)
+    result = [type(interval).sqrt(interval) for interval in x]
+    return Intervals(result, x.get_backend())
+
+
+def intervals_tan(x):
+    x = value_to_intervals(x)
+    result = [type(interval).tan(interval) for interval in x]
+    return Intervals(result, x.get_backend())
+
+
+def intervals_atan(x):
+    x = value_to_intervals(x)
+    result = [type(interval).atan(interval) for interval in x]
+    return Intervals(result, x.get_backend())
+
+
+def intervals_sinh(x):
+    x = value_to_intervals(x)
+    result = [type(interval).sinh(interval) for interval in x]
+    return Intervals(result, x.get_backend())
+
+
+def intervals_cosh(x):
+    x = value_to_intervals(x)
+    result = [type(interval).cosh(interval) for interval in x]
+    return Intervals(result, x.get_backend())
 
 
-def value_to_intervals(expr):
+def value_to_intervals(expr, backend=None):
     if isinstance(expr, Intervals):
         return expr
-    elif isinstance(expr, Interval):
+    elif isinstance(expr, INTERVAL_TYPES):
         return Intervals([expr])
     elif isinstance(expr, list):
-        return Intervals(expr)
+        return Intervals(expr, backend)
     else:
-        return Intervals([Interval.valueToInterval(expr)])
+        if backend is None:
+            backend = Intervals.backend
+        return Intervals([backend.valueToInterval(expr)], backend)
 
 
 def print_as_points(intervals):
@@ -0,0 +1,200 @@
+from fractions import Fraction
+
+import sympy as sym
+
+from intervals import *
+from expression_tape import ExpressionTape
+
+
+class Jet:
+    """
+    Класс Jet - интервальное автоматическое дифференцирование второго порядка (прямой режим)
+            Хранит интервальные оценки значения функции и её производных по переменной и переносит их
+            через арифметику Intervals и элементарные функции (JET_FUNCTIONS).
+            Поля:
+                value (Intervals): оценка значения f
+                d1 (Intervals): оценка f'
+                d2 (Intervals | None): оценка f''; None - вторая производная не вычисляется (первый порядок)
+            Операторы:
+                +, -, *, /: с другим Jet того же порядка или с константой (Intervals, число)
+                **: возведение в постоянную степень (целую, Fraction или интервал)
+            Методы:
+                Jet variable (x, backend, order): переменная дифференцирования порядка order (1 или 2)
+    """
+    # True только у самой переменной: d1 = 1, d2 = 0 точно, умножения на них можно пропустить
+    _variable = False
+
+    def __init__(self, value, d1, d2=None):
+        self.value = value
+        self.d1 = d1
+        self.d2 = d2
+
+    @staticmethod
+    def variable(x, backend=None, order=2):
+        x = value_to_intervals(x, backend)
+        backend = x.get_backend()
+        result = Jet(x, value_to_intervals(1, backend), value_to_intervals(0, backend) if order == 2 else None)
+        result._variable = True
+        return result
+
+    def __repr__(self):
+        return f"Jet({self.value}; {self.d1}; {self.d2})"
+
+    def _chain(self, value, first, second):
+        # (g(u))' = g'(u) u', (g(u))'' = g''(u) u'^2 + g'(u) u''; second - функция, вычисляющая g''(u)
+        if self._variable:
+            return Jet(value, first, None if self.d2 is None else second())
+        if self.d2 is None:
+            return Jet(value, first * self.d1)
+        return Jet(value, first * self.d1, second() * self.d1 ** 2 + first * self.d2)
+
+    def __neg__(self):
+        return Jet(-self.value, -self.d1, None if self.d2 is None else -self.d2)
+
+    def __add__(self, other):
+        if isinstance(other, Jet):
+            return Jet(self.value + other.value, self.d1 + other.d1,
+                       None if self.d2 is None else self.d2 + other.d2)
+        return Jet(self.value + other, self.d1, self.d2)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return self.__add__(-other)
+
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
+    def __mul__(self, other):
+        if isinstance(other, Jet):
+            d2 = None
+            if self.d2 is not None:
+                d2 = self.d2 * other.value + 2 * (self.d1 * other.d1) + self.value * other.d2
+            return Jet(self.value * other.value, self.d1 * other.value + self.value * other.d1, d2)
+        return Jet(self.value * other, self.d1 * other, None if self.d2 is None else self.d2 * other)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def inversed(self):
+        inversed = 1 / self.value
+        square = inversed * inversed
+        return self._chain(inversed, -square, lambda: 2 * (square * inversed))
+
+    def __truediv__(self, other):
+        if isinstance(other, Jet):
+            return self * other.inversed()
+        return self * (1 / value_to_intervals(other, self.value.get_backend()))
+
+    def __rtruediv__(self, other):
+        return self.inversed() * other
+
+    def __pow__(self, power):
+        value = self.value
+        if isinstance(power, int):
+            if power == 0:
+                return Jet(value ** 0, self.d1 * 0, None if self.d2 is None else self.d2 * 0)
+            if power == 1:
+                return self
+            if power == 2:
+                return self._chain(value ** 2, 2 * value, lambda: 2)
+            return self._chain(value ** power, power * value ** (power - 1),
+                               lambda: power * (power - 1) * value ** (power - 2))
+        if isinstance(power, Fraction):
+            # Рациональная степень: значения - точной степенью Fraction, множители p/q - интервалом
+            backend = value.get_backend()
+            factor = value_to_intervals(power.numerator, backend) / power.denominator
+            return self._chain(value ** power, factor * value ** (power - 1),
+                               lambda: factor * (factor - 1) * value ** (power - 2))
+        # Нецелая постоянная степень (интервал power)
+        power = value_to_intervals(power, value.get_backend())
+        return self._chain(value ** power, power * value ** (power - 1),
+                           lambda: power * (power - 1) * value ** (power - 2))
+
+
+def jet_sin(x):
+    sin, cos = intervals_sin(x.value), intervals_cos(x.value)
+    return x._chain(sin, cos, lambda: -sin)
+
+
+def jet_cos(x):
+    sin, cos = intervals_sin(x.value), intervals_cos(x.value)
+    return x._chain(cos, -sin, lambda: -cos)
+
+
+def jet_exp(x):
+    exp = intervals_exp(x.value)
+    return x._chain(exp, exp, lambda: exp)
+
+
+def jet_log(x):
+    inversed = 1 / x.value
+    return x._chain(intervals_ln(x.value), inversed, lambda: -(inversed * inversed))
+
+
+def jet_tan(x):
+    tan = intervals_tan(x.value)
+    first = tan ** 2 + 1
+    return x._chain(tan, first, lambda: 2 * (tan * first))
+
+
+def jet_atan(x):
+    first = 1 / (x.value ** 2 + 1)
+    return x._chain(intervals_atan(x.value), first, lambda: -2 * (x.value * first ** 2))
+
+
+def jet_sinh(x):
+    sinh, cosh = intervals_sinh(x.value), intervals_cosh(x.value)
+    return x._chain(sinh, cosh, lambda: sinh)
+
+
+def jet_cosh(x):
+    sinh, cosh = intervals_sinh(x.value), intervals_cosh(x.value)
+    return x._chain(cosh, sinh, lambda: cosh)
+
+
+def jet_abs(x):
+    # |u|' = sign(u); |u|'' = 0 вне нуля, а если u может быть 0 - не ограничена
+    value = x.value
+    backend = value.get_backend()
+    if value > 0 or value < 0:
+        sign, second = value_to_intervals(1 if value > 0 else -1, backend), value_to_intervals(0, backend)
+    else:
+        sign = value_to_intervals([backend([-1, 1])], backend)
+        second = value_to_intervals([backend(["-Inf", "Inf"])], backend)
+    return x._chain(abs(value), sign, lambda: second)
+
+
+JET_FUNCTIONS = {sym.sin: jet_sin, sym.cos: jet_cos, sym.exp: jet_exp, sym.log: jet_log, sym.tan: jet_tan,
+                 sym.atan: jet_atan, sym.sinh: jet_sinh, sym.cosh: jet_cosh, sym.Abs: jet_abs}
+
+
+class JetDerivatives:
+    """
+    Класс JetDerivatives - f' и f'' за один проход по ленте исходного выражения f с аргументом Jet,
+    без символьного дифференцирования
+            Методы:
+                Jet __call__ (self, x, order): значения f, f' и (при order = 2) f'' на x
+                Intervals diff (self, x): оценка f' на x
+                Intervals second_diff (self, x): оценка f'' на x
+                list derivatives (self, x): [f'(x), f''(x)] за одно вычисление
+    """
+    def __init__(self, func, var=sym.Symbol('x'), backend=None):
+        if any(not power.exp.is_number for power in func.atoms(sym.Pow)):
+            raise NotImplementedError(f"Unsupported expression {func}")
+        self.tape = ExpressionTape([func], var, backend, functions=JET_FUNCTIONS)
+        self.backend = self.tape.backend
+
+    def __call__(self, x, order=2):
+        return self.tape.evaluate(Jet.variable(x, self.backend, order))[0]
+
+    def diff(self, x):
+        return self(x, order=1).d1
+
+    def second_diff(self, x):
+        return self(x).d2
+
+    def derivatives(self, x):
+        jet = self(x)
+        return [jet.d1, jet.d2]
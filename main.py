@@ -1,6 +1,13 @@
+import contextlib
+import io
+import multiprocessing
+import os
 import re
+import time
 
 from critical_points import *
+from expression_cache import expression_cache
+from interval_array import IntervalArray
 from terminal_colors import *
 
 from decimal import Decimal
@@ -8,10 +15,32 @@ import interval
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import numpy as np
 
 
-def RunTest(test, vocal=None, draw=False):
+TEST_FORMAT = r"expression = ([^;]+); interval = \[([^;,]+), ([^;,]+)\]; e = ([^;]+); expected = ([^;]+)"
+
+
+def ParseTest(test):
+    """
+    Разбирает тест в формате RunTest и возвращает (expression, [левый конец, правый конец], e, expected):
+    концы - float, e и expected - Decimal
+    """
+    m = re.match(TEST_FORMAT, test)
+    expression = expression_cache.parse(m.group(1))
+    return expression, [float(m.group(2)), float(m.group(3))], Decimal(m.group(4)), Decimal(m.group(5))
+
+
+def ReadTests(file='tests.txt'):
+    """
+    Возвращает список тестов из файла без комментариев (строк, начинающихся с #) и пустых строк
+    """
+    with open(file, 'r') as f:
+        return [line for line in f.readlines() if line[0] != '#' and line[0] != '\n']
+
+
+def RunTest(test, vocal=None, draw=False, backend=None):
     """
     Принимает тест в формате
     expression = выражение; interval = [левый конец, правый конец]; e = число; expected = число
@@ -21,14 +50,15 @@ def RunTest(test, vocal=None, draw=False):
     У vocal 3 возможных значения: None, True и False
     В режиме True функция печатает поданный ей на вход тест и результат вычисления
     В остальных режимах функция ничего не печатает
+
+    backend - класс интервалов (Interval или FloatInterval); по умолчанию выбирается по точности решения e / 10
+    (DefaultBackend): FloatInterval при e / 10 не меньше 1e-10, иначе Interval
     """
 
-    test_format = r"expression = ([^;]+); interval = \[([^;,]+), ([^;,]+)\]; e = ([^;]+); expected = ([^;]+)"
-    m = re.match(test_format, test)
-    expression = sym.parsing.sympy_parser.parse_expr(m.group(1))
-    interval = Interval([float(m.group(2)), float(m.group(3))])
-    e = Decimal(m.group(4))
-    expected = Decimal(m.group(5))
+    expression, ends, e, expected = ParseTest(test)
+    if backend is None:
+        backend = DefaultBackend(e / 10)
+    interval = backend(ends)
 
     conversion, critical_points = GetCriticalPoints(expression, interval, e / 10, classify=True)
     if vocal:
@@ -44,7 +74,7 @@ def RunTest(test, vocal=None, draw=False):
 
     for point in critical_points:
         interval = point.interval
-        if interval.isAround(expected) or abs(interval.mid() - expected) < e:
+        if interval.isAround(expected) or abs(interval.mid() - type(interval.mid())(expected)) < e:
             if vocal:
                 print_green("Passed!")
                 print()
@@ -56,7 +86,48 @@ def RunTest(test, vocal=None, draw=False):
         return False
 
 
-def RunTests(file='tests.txt', vocal=None, draw=False):
+def _RunTestTimed(test, vocal=None, draw=False, backend=None):
+    start = time.perf_counter()
+    exception = None
+    result = False
+    try:
+        result = RunTest(test, vocal, draw, backend)
+    except (ValueError, TypeError, AttributeError) as e:
+        exception = e
+    return result, exception, time.perf_counter() - start
+
+
+def _RunTestCaptured(args):
+    index, test, vocal, backend = args
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result, exception, elapsed = _RunTestTimed(test, vocal, backend=backend)
+    return index, result, exception, elapsed, output.getvalue()
+
+
+def _IterTestResults(tests, vocal, draw, workers, backend=None):
+    """
+    Возвращает результаты тестов по мере их завершения в виде кортежей
+    (номер теста, результат, исключение или None, время в секундах, напечатанный тестом текст)
+    """
+    if workers == 1 or draw:
+        for index, test in enumerate(tests):
+            if vocal:
+                print_yellow(f"Running test {index}")
+            result, exception, elapsed = _RunTestTimed(test, vocal, draw, backend)
+            yield index, result, exception, elapsed, ""
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        jobs = [(index, test, vocal, backend) for index, test in enumerate(tests)]
+        for index, result, exception, elapsed, output in pool.imap_unordered(_RunTestCaptured, jobs):
+            if vocal:
+                print_yellow(f"Running test {index}")
+                print(output, end='')
+            yield index, result, exception, elapsed, output
+
+
+def RunTests(file='tests.txt', vocal=None, draw=False, workers=1, backend=None):
     """
     Открывает файл file и читает из него тесты в формате
     expression = выражение; interval = [левый конец, правый конец]; e = число; expected = число
@@ -65,90 +136,144 @@ def RunTests(file='tests.txt', vocal=None, draw=False):
     В режиме None функция ничего не печатает и выбрасывает AssertionError в случае провала тестов
     В режиме False функция печатает результат тестов
     В режиме True функция печатает каждый тест в отдельности и итоговый результат
+
+    workers - количество процессов для параллельного запуска тестов (None - по числу ядер).
+    При workers != 1 результаты печатаются по мере завершения тестов, а не в порядке файла.
+    Рисование (draw=True) всегда выполняется последовательно.
+    backend - класс интервалов для всех тестов (Interval или FloatInterval), по умолчанию - как в RunTest.
+    Во всех режимах, кроме None, печатается общее время работы и время каждого теста
     """
-    with open(file, 'r') as f:
-        tests = f.readlines()
-        tests_finished = 0
-        tests_not_passed = 0
-        tests_fail_to_match = 0
-        for line in tests:
-            if line[0] == '#' or line[0] == '\n':
-                continue
-
-            try:
-                if vocal:
-                    print_yellow(f"Running test {tests_finished}")
-                result = RunTest(line, vocal, draw)
-                if not result:
-                    tests_not_passed += 1
-            except (ValueError, TypeError, AttributeError) as e:
-                tests_fail_to_match += 1
-                if vocal:
-                    print_red(f"Failed to match test {tests_finished}")
-                    print_red("Exception:")
-                    print(e)
-                    print()
-
-                if vocal is None:
-                    raise
-            tests_finished += 1
-
-
-        tests_passed = tests_finished - tests_fail_to_match - tests_not_passed
-        if vocal is None:
-            if tests_passed != tests_finished:
-                raise AssertionError(f"Tests not passed: failed to match {tests_fail_to_match}, "
-                                     f"failed {tests_not_passed}")
-            else:
-                return
-
-        if tests_finished != 0:
-            print_yellow(f"Run {tests_finished} tests")
-            if tests_fail_to_match != 0:
-                print_red(f"Failed to match {tests_fail_to_match} tests")
-
-            print_green(f"Passed {tests_passed}")
-            if tests_passed != tests_finished:
-                print_red(f"Failed {tests_not_passed}")
-            else:
-                print_green(f"All tests passed")
-
-
-def DrawPoints(critical_points, expression, interval):
-    func = sym.utilities.lambdify(['x'], expression)
-    x = np.linspace(float(interval[0]), float(interval[1]), 1000)
-    y = list(map(func, x))
-
-    fig, ax = plt.subplots(figsize=(10, 5))
-    plt.plot(x, y, color='b', label=str(expression))
-
-    first_minimum = True
-    first_maximum = True
-    first_unknown = True
-    for p in critical_points:
-        area = (p.interval[0], p.interval[1])
-        point = (func(float(p.x)), func(float(p.x)))
-        if p.type == Extrema.Minimum:
-            if first_minimum:
-                plt.plot(area, point, 'ro-', label='minimum points')
-                first_minimum = False
-            else:
-                plt.plot(area, point, 'ro-')
-        elif p.type == Extrema.Maximum:
-            if first_maximum:
-                plt.plot(area, point, 'go-', label='maximum points')
-                first_maximum = False
-            else:
-                plt.plot(area, point, 'go-')
+    tests = ReadTests(file)
+
+    start = time.perf_counter()
+    tests_finished = 0
+    tests_not_passed = 0
+    tests_fail_to_match = 0
+    timings = {}
+    for index, result, exception, elapsed, output in _IterTestResults(tests, vocal, draw, workers, backend):
+        timings[index] = elapsed
+        if exception is not None:
+            tests_fail_to_match += 1
+            if vocal:
+                print_red(f"Failed to match test {index}")
+                print_red("Exception:")
+                print(exception)
+                print()
+
+            if vocal is None:
+                raise exception
+        elif not result:
+            tests_not_passed += 1
+        if vocal:
+            print(f"Test {index} time: {elapsed:.3f} s")
+            print()
+        tests_finished += 1
+    wall_time = time.perf_counter() - start
+
+    tests_passed = tests_finished - tests_fail_to_match - tests_not_passed
+    if vocal is None:
+        if tests_passed != tests_finished:
+            raise AssertionError(f"Tests not passed: failed to match {tests_fail_to_match}, "
+                                 f"failed {tests_not_passed}")
         else:
-            if first_unknown:
-                plt.plot(area, point, 'yo-', label='unknown points')
-                first_unknown = False
-            else:
-                plt.plot(area, point, 'yo-')
+            return
+
+    if tests_finished != 0:
+        print_yellow(f"Run {tests_finished} tests")
+        if tests_fail_to_match != 0:
+            print_red(f"Failed to match {tests_fail_to_match} tests")
+
+        print_green(f"Passed {tests_passed}")
+        if tests_passed != tests_finished:
+            print_red(f"Failed {tests_not_passed}")
+        else:
+            print_green(f"All tests passed")
+
+        print_yellow(f"Wall time {wall_time:.3f} s, total test time {sum(timings.values()):.3f} s")
+        if not vocal:
+            for index in sorted(timings):
+                print(f"Test {index} time: {timings[index]:.3f} s")
+
+
+def RangeBands(expression, interval, bands=32, var=sym.Symbol('x')):
+    """
+    Интервальные оценки expression на bands равных частях interval, вычисленные сразу для всех частей
+    (IntervalArray). Возвращает (edges, lower, upper): bands + 1 границ частей и массивы концов оценок.
+    """
+    edges = np.linspace(float(interval[0]), float(interval[1]), bands + 1)
+    func = sym.utilities.lambdify(var, expression, modules=ARRAY_MODULES)
+    with np.errstate(all='ignore'):
+        values = IntervalArray.valueToIntervalArray(func(IntervalArray(edges[:-1], edges[1:])))
+    return edges, np.broadcast_to(values.lower, bands), np.broadcast_to(values.upper, bands)
+
+
+def _PlotPoints(ax, critical_points, expression, interval, bands, samples=1000, var=sym.Symbol('x')):
+    # Кривая и значения в критических точках вычисляются векторно (lambdify с numpy) за два вызова
+    func = sym.utilities.lambdify(var, expression, modules='numpy')
+    x = np.linspace(float(interval[0]), float(interval[1]), samples)
+    points_x = np.array([float(p.x) for p in critical_points])
+    with np.errstate(all='ignore'):
+        y = np.broadcast_to(np.asarray(func(x), dtype=float), x.shape)
+        points_y = np.broadcast_to(np.asarray(func(points_x), dtype=float), points_x.shape)
+    ax.plot(x, y, color='b', label=str(expression))
+
+    if bands:
+        finite = y[np.isfinite(y)]
+        edges, lower, upper = RangeBands(expression, interval, bands, var)
+        ax.fill_between(edges, np.append(lower, lower[-1]), np.append(upper, upper[-1]), step='post',
+                        color='b', alpha=0.15, label='range enclosure')
+        # Оценки на частях бывают бесконечными или намного шире кривой: масштаб задает кривая
+        if finite.size:
+            margin = 0.1 * (finite.max() - finite.min()) or 1
+            ax.set_ylim(finite.min() - margin, finite.max() + margin)
 
+    styles = {Extrema.Minimum: ('ro-', 'minimum points'), Extrema.Maximum: ('go-', 'maximum points')}
+    labelled = set()
+    for p, value in zip(critical_points, points_y):
+        style, label = styles.get(p.type, ('yo-', 'unknown points'))
+        ax.plot((p.interval[0], p.interval[1]), (value, value), style, label=None if label in labelled else label)
+        labelled.add(label)
     ax.legend()
-    plt.show()
+
+
+def DrawPoints(critical_points, expression, interval, output=None, bands=32):
+    """
+    Рисует график expression на interval, критические точки и интервальные оценки значений на bands частях
+    interval (bands = 0 - без них). Без output график показывается в окне (plt.show()), иначе сохраняется
+    в файл output (формат по расширению: png, svg, ...) без pyplot и оконной системы (Agg),
+    поэтому функцию можно вызывать в процессах пула.
+    """
+    if output is None:
+        fig, ax = plt.subplots(figsize=(10, 5))
+        _PlotPoints(ax, critical_points, expression, interval, bands)
+        plt.show()
+        return
+
+    fig = Figure(figsize=(10, 5))
+    _PlotPoints(fig.subplots(), critical_points, expression, interval, bands)
+    fig.savefig(output)
+
+
+def RenderTests(file='all_tests.txt', directory='plots', format='png', workers=None, bands=32, backend=None):
+    """
+    Решает тесты из file (как RunTest, в том числе с тем же выбором backend) и сохраняет графики DrawPoints в directory/test_<номер>.<format>.
+    Графики рисуются в отдельном пуле из workers процессов (None - по числу ядер), пока основной процесс
+    решает следующие тесты. Возвращает список путей к файлам.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    with multiprocessing.Pool(workers) as pool:
+        jobs = []
+        for index, test in enumerate(ReadTests(file)):
+            expression, ends, e, _ = ParseTest(test)
+            interval = (backend or DefaultBackend(e / 10))(ends)
+            _, critical_points = GetCriticalPoints(expression, interval, e / 10, classify=True)
+            path = os.path.join(directory, f"test_{index}.{format}")
+            jobs.append(pool.apply_async(DrawPoints, (critical_points, expression, interval, path, bands)))
+            paths.append(path)
+        for job in jobs:
+            job.get()
+    return paths
 
 
 if __name__ == '__main__':
@@ -0,0 +1,329 @@
+import heapq
+import itertools
+import math
+
+import numpy
+import sympy as sym
+
+from intervals import *
+from expression_tape import ExpressionTape
+from expression_cache import BackendPrecision, expression_cache
+from critical_points import CUSTOM_MODULES, Extrema, CriticalPoint
+
+
+_BISECTION_POINT = '0.4876543'
+
+
+class IntervalVector:
+    """
+    Класс IntervalVector - брус в R^n (вектор интервалов одного класса)
+            Поля:
+                x (list): координаты, объекты Interval или FloatInterval
+                backend (type): класс координат
+            Методы:
+                list mid (self): середины координат
+                list widths (self): ширины координат
+                width (self): наибольшая ширина координаты
+                int widest (self): номер координаты наибольшей ширины
+                IntervalVector replace (self, index, interval): копия бруса с другой координатой index
+                list bisect (self, index): две части бруса по координате index (деление в точке _BISECTION_POINT
+                                           ширины) или None, если координату нельзя разделить при текущей точности
+                boolean isIn (self, other): True, если брус внутри другого бруса
+    """
+    def __init__(self, x, backend=None):
+        '''
+        Инициализация бруса
+                Параметры:
+                        x (list): список координат - объектов Interval/FloatInterval или пар концов
+                        backend (type): класс координат, по умолчанию класс первой координаты или Intervals.backend
+        '''
+        if backend is None:
+            backend = next((type(value) for value in x if isinstance(value, INTERVAL_TYPES)), Intervals.backend)
+        self.backend = backend
+        self.x = [value if isinstance(value, backend) else backend([value[0], value[1]]) for value in x]
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, item):
+        return self.x[item]
+
+    def __iter__(self):
+        return iter(self.x)
+
+    def __repr__(self):
+        return "(" + " x ".join(str(value) for value in self.x) + ")"
+
+    def mid(self):
+        return [value.mid() for value in self.x]
+
+    def widths(self):
+        return [value.width() for value in self.x]
+
+    def width(self):
+        return max(self.widths())
+
+    def widest(self):
+        widths = self.widths()
+        return widths.index(max(widths))
+
+    def replace(self, index, interval):
+        x = list(self.x)
+        x[index] = interval
+        return IntervalVector(x, self.backend)
+
+    def bisect(self, index):
+        # Деление немного левее середины: корни в "круглых" точках (середины исходного бруса) не попадают
+        # на границу половин и не повторяются в нескольких соседних брусах результата
+        value = self.x[index]
+        lower, upper = value[0], value[1]
+        middle = lower + (upper - lower) * type(lower)(_BISECTION_POINT)
+        if not (lower < middle < upper):
+            return None
+        return [self.replace(index, self.backend([value[0], middle])),
+                self.replace(index, self.backend([middle, value[1]]))]
+
+    def isIn(self, other):
+        return all(value.isIn(other_value) for value, other_value in zip(self.x, other))
+
+
+def _Hull(values, backend):
+    values = value_to_intervals(values, backend)
+    if not values:
+        return backend([-math.inf, math.inf])
+    return backend([values[0][0], values[-1][1]])
+
+
+def _Middle(value):
+    # Середина интервала как float (для предобуславливателя)
+    lower, upper = float(value[0]), float(value[1])
+    return 0.5 * lower + 0.5 * upper
+
+
+def _Radius(value):
+    return 0.5 * (float(value[1]) - float(value[0]))
+
+
+class GradientHessian:
+    """
+    Класс GradientHessian - интервальные градиент и матрица Гессе функции нескольких переменных
+            Градиент и верхний треугольник матрицы Гессе строятся sym.diff и компилируются в одну ленту
+            ExpressionTape с общими подвыражениями (если в выражении есть неподдерживаемые функции - lambdify).
+            Методы:
+                list gradient (self, x): градиент в брусе или точке x (список интервалов backend)
+                tuple __call__ (self, x): (градиент, матрица Гессе) в брусе x
+    """
+    def __init__(self, func, variables, backend=None):
+        '''
+        Построение градиента и матрицы Гессе
+                Параметры:
+                        func (sympy.Expr): функция
+                        variables (list): список переменных sympy.Symbol
+                        backend (type): класс интервалов, по умолчанию Intervals.backend
+        '''
+        if backend is None:
+            backend = Intervals.backend
+        self.backend = backend
+        self.variables = list(variables)
+        n = len(self.variables)
+        gradient = [sym.diff(func, variable) for variable in self.variables]
+        self.__pairs = [(i, j) for i in range(n) for j in range(i, n)]
+        hessian = [sym.diff(gradient[i], self.variables[j]) for i, j in self.__pairs]
+        expressions = gradient + hessian
+        try:
+            tape = ExpressionTape(expressions, self.variables, backend)
+            self.__all, self.__gradient = tape, tape.outputs(list(range(n)))
+        except NotImplementedError:
+            functions = sym.utilities.lambdify(self.variables, expressions, modules=CUSTOM_MODULES)
+            gradient_functions = sym.utilities.lambdify(self.variables, gradient, modules=CUSTOM_MODULES)
+            self.__all = lambda x: functions(*[value_to_intervals(value, backend) for value in x])
+            self.__gradient = lambda x: gradient_functions(*[value_to_intervals(value, backend) for value in x])
+
+    def gradient(self, x):
+        return [_Hull(value, self.backend) for value in self.__gradient(list(x))]
+
+    def __call__(self, x):
+        n = len(self.variables)
+        values = [_Hull(value, self.backend) for value in self.__all(list(x))]
+        hessian = [[None] * n for _ in range(n)]
+        for (i, j), value in zip(self.__pairs, values[n:]):
+            hessian[i][j] = hessian[j][i] = value
+        return values[:n], hessian
+
+
+def _Preconditioner(hessian):
+    # Обратная к матрице середин; если она вырождена или не определена - единичная матрица
+    middle = numpy.array([[_Middle(value) for value in row] for row in hessian])
+    if numpy.all(numpy.isfinite(middle)):
+        try:
+            inverse = numpy.linalg.inv(middle)
+            if numpy.all(numpy.isfinite(inverse)):
+                return inverse
+        except numpy.linalg.LinAlgError:
+            pass
+    return numpy.eye(len(hessian))
+
+
+def GaussSeidelStep(derivatives, box, hessian=None):
+    """
+    Шаг интервального метода Ньютона для системы grad f = 0 с предобусловленным методом Гаусса-Зейделя.
+
+    Для бруса X с серединой m и интервальной матрицей Гессе H(X) система Y H(X) (x - m) = -Y grad f(m),
+    Y - обратная к матрице середин H(X), решается по координатам: новая координата i -
+    m_i - (r_i + sum_{j != i} M_ij (X_j - m_j)) / M_ii, пересеченная с X_i, где уже уточненные координаты
+    используются сразу. Если M_ii содержит 0, деление расширенное: при щели шаг останавливается
+    и брус делится по ней.
+
+    Возвращает пару (boxes, unique): boxes - список брусов, содержащих все корни градиента из box
+    (пустой - корней нет, два - деление по щели); unique = True, если образ бруса строго внутри него,
+    то есть в box ровно один корень градиента.
+    """
+    backend = box.backend
+    n = len(box)
+    if hessian is None:
+        hessian = derivatives(box)[1]
+    middle = [backend.valueToInterval(value) for value in box.mid()]
+    value = derivatives.gradient(middle)
+    preconditioner = [[backend.valueToInterval(float(y)) for y in row] for row in _Preconditioner(hessian)]
+
+    def product(row, column):
+        total = preconditioner[row][0] * column(0)
+        for k in range(1, n):
+            total = total + preconditioner[row][k] * column(k)
+        return total
+
+    x = list(box.x)
+    unique = True
+    for i in range(n):
+        diagonal = product(i, lambda k: hessian[k][i])
+        numerator = product(i, lambda k: value[k])
+        for j in range(n):
+            if j != i:
+                numerator = numerator + product(i, lambda k: hessian[k][j]) * (x[j] - middle[j])
+        image = value_to_intervals(middle[i], backend) - value_to_intervals(numerator, backend) / \
+            value_to_intervals(diagonal, backend)
+        unique = unique and len(image) == 1 and box[i][0] < image[0][0] and image[0][1] < box[i][1]
+        pieces = value_to_intervals(x[i], backend)
+        pieces.intersect(image)
+        if not pieces:
+            return [], False
+        if len(pieces) > 1:
+            return [IntervalVector(x[:i] + [piece] + x[i + 1:], backend) for piece in pieces], False
+        x[i] = pieces[0]
+    return [IntervalVector(x, backend)], unique
+
+
+def _SplitIndex(split, box, hessian):
+    if split == 'widest':
+        return box.widest()
+    if split == 'smear':
+        # Наибольшее возможное изменение градиента вдоль координаты: max_i |H_ij| * w_j
+        widths = box.widths()
+        smear = [max(max(abs(float(hessian[i][j][0])), abs(float(hessian[i][j][1]))) for i in range(len(box)))
+                 * float(widths[j]) for j in range(len(box))]
+        if not all(math.isfinite(value) for value in smear) or max(smear) == 0:
+            return box.widest()
+        return smear.index(max(smear))
+    raise ValueError(f"Unknown split {split}")
+
+
+def HessianClassification(boxes, derivatives, unique=None):
+    """
+    Классификация критических точек по знакоопределенности интервальной матрицы Гессе на брусе.
+
+    Для интервальной матрицы [Hc - D, Hc + D] собственные значения любой симметричной матрицы из неё
+    отличаются от собственных значений Hc не больше чем на ||D||_F (теорема Вейля), поэтому
+    lambda_min(Hc) > ||D||_F - минимум, lambda_max(Hc) < -||D||_F - максимум, иначе, если
+    lambda_min(Hc) < -||D||_F и lambda_max(Hc) > ||D||_F - седловая точка, в остальных случаях - Unknown.
+    К ||D||_F добавляется запас на погрешность вычисления собственных значений в float.
+    unique - список брусов с доказанной единственностью корня градиента (поле unique у CriticalPoint).
+    """
+    if unique is None:
+        unique = []
+    result = []
+    for box in boxes:
+        hessian = derivatives(box)[1]
+        middle = numpy.array([[_Middle(value) for value in row] for row in hessian])
+        radius = numpy.array([[_Radius(value) for value in row] for row in hessian])
+        point_type = Extrema.Unknown
+        if numpy.all(numpy.isfinite(middle)) and numpy.all(numpy.isfinite(radius)):
+            eigenvalues = numpy.linalg.eigvalsh(middle)
+            bound = numpy.linalg.norm(radius) + 8 * len(box) * numpy.finfo(float).eps * numpy.linalg.norm(middle)
+            if eigenvalues[0] > bound:
+                point_type = Extrema.Minimum
+            elif eigenvalues[-1] < -bound:
+                point_type = Extrema.Maximum
+            elif eigenvalues[0] < -bound and eigenvalues[-1] > bound:
+                point_type = Extrema.Saddle
+        proven = any(box.isIn(other) for other in unique)
+        result.append(CriticalPoint(x=box.mid(), interval=box, type=point_type, unique=proven))
+    return result
+
+
+def GetCriticalPointsND(func, box, e, variables, classify=False, split='widest', max_boxes=100000, cache=None,
+                        _debug=False):
+    """
+    Поиск всех критических точек (корней градиента) функции нескольких переменных в брусе box.
+
+    Брусы хранятся в очереди с приоритетом (сначала самые широкие). Брус отбрасывается, если интервальный
+    градиент на нём не содержит 0 хотя бы по одной координате, иначе к нему применяется GaussSeidelStep.
+    Если шаг уменьшил сумму ширин координат меньше чем до 3/4, брус делится пополам по координате
+    наибольшей ширины (split = 'widest') или наибольшего возможного изменения градиента (split = 'smear').
+    Брусы с доказанной единственностью корня дальше только сужаются шагом, без проверки градиента.
+
+    box - IntervalVector или список пар концов (тогда координаты - Intervals.backend).
+    Возвращает пару (conversion, result): result - список брусов ширины не больше e (или CriticalPoint при
+    classify = True, тип определяется HessianClassification); conversion = False, если какой-то брус нельзя
+    разделить при текущей точности или обработано больше max_boxes брусов - такие брусы тоже входят в result.
+    """
+    if cache is None:
+        cache = expression_cache
+    if not isinstance(box, IntervalVector):
+        box = IntervalVector(box)
+    backend = box.backend
+    derivatives = cache.get(('gradient hessian', sym.srepr(func), tuple(sym.srepr(variable) for variable in variables),
+                             backend, BackendPrecision(backend)),
+                            lambda: GradientHessian(func, variables, backend))
+
+    counter = itertools.count()
+    queue = [(-box.width(), next(counter), box, False)]
+    result = []
+    unique = []
+    conversion = True
+    processed = 0
+    while queue:
+        if processed >= max_boxes:
+            conversion = False
+            result.extend(box for _, _, box, _ in queue)
+            break
+        _, _, box, proven = heapq.heappop(queue)
+        if box.width() <= e:
+            result.append(box)
+            if proven:
+                unique.append(box)
+            continue
+        processed += 1
+
+        gradient, hessian = derivatives(box)
+        if not (proven or all(value.isAround(0) for value in gradient)):
+            continue
+        pieces, inside = GaussSeidelStep(derivatives, box, hessian)
+        proven = proven or inside
+        box_size = sum(box.widths())
+        for piece in pieces:
+            if 4 * sum(piece.widths()) <= 3 * box_size:
+                heapq.heappush(queue, (-piece.width(), next(counter), piece, proven))
+                continue
+            halves = piece.bisect(_SplitIndex(split, piece, hessian))
+            if halves is None:
+                conversion = False
+                result.append(piece)
+                continue
+            for half in halves:
+                heapq.heappush(queue, (-half.width(), next(counter), half, False))
+
+    if _debug:
+        print(f"Processed {processed} boxes")
+    if classify:
+        result = HessianClassification(result, derivatives, unique)
+    return conversion, result
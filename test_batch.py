@@ -0,0 +1,65 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from batch import RunBatch, SolveProblem, SolveStream
+
+
+PROBLEM = {'id': 'cubic', 'expression': 'x**3 - 3*x', 'interval': ['-2', '3'], 'e': '1e-8'}
+
+
+@pytest.mark.parametrize('backend', ['decimal', 'float'])
+def test_solve_problem(backend):
+    result = SolveProblem({**PROBLEM, 'backend': backend})
+    assert result['id'] == 'cubic' and result['conversion']
+    interior = [point for point in result['points'] if point['interval'][0] != point['interval'][1]]
+    for root, point_type in [(-1, 'Maximum'), (1, 'Minimum')]:
+        found = [point for point in interior
+                 if Decimal(point['interval'][0]) <= root <= Decimal(point['interval'][1])]
+        assert len(found) == 1 and found[0]['type'].endswith(point_type) and found[0]['unique']
+        assert Decimal(found[0]['interval'][1]) - Decimal(found[0]['interval'][0]) <= Decimal('1e-8')
+
+
+def _lines(count):
+    lines = ['# комментарий\n', '\n']
+    for index in range(count):
+        if index % 5 == 3:
+            lines.append('{"id": %d, "expression": "sin(x"}\n' % index)
+        else:
+            lines.append(json.dumps({'id': index, 'expression': f'sin({index + 1}*x)', 'interval': ['0', '3'],
+                                     'e': '1e-6', 'backend': 'float'}) + '\n')
+    return lines
+
+
+@pytest.mark.parametrize('workers, window', [(1, None), (2, None), (2, 3)])
+def test_stream_keeps_order_and_reports_errors(workers, window):
+    lines = _lines(12)
+    results = list(SolveStream(lines, workers, window))
+    assert [result['id'] for result in results] == list(range(12))
+    assert [result['line'] for result in results] == list(range(3, 15))
+    assert [('error' in result) for result in results] == [index % 5 == 3 for index in range(12)]
+    assert all(result['conversion'] for result in results if 'error' not in result)
+
+
+def test_stream_reads_input_lazily():
+    consumed = []
+
+    def lines():
+        for number, line in enumerate(_lines(40)):
+            consumed.append(number)
+            yield line
+
+    stream = SolveStream(lines(), workers=2, window=4)
+    next(stream)
+    stream.close()
+    # 2 строки комментариев и не больше window задач в работе
+    assert len(consumed) <= 2 + 4
+
+
+def test_run_batch_writes_one_line_per_problem():
+    output = io.StringIO()
+    errors = RunBatch(io.StringIO(''.join(_lines(6))), output)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert errors == 1 and len(results) == 6
@@ -0,0 +1,142 @@
+from decimal import Decimal
+
+import mpmath
+import pytest
+import sympy as sym
+
+from critical_points import DefaultBackend, GetCriticalPoints, GetGlobalMinimum, IterCriticalPoints
+from float_interval import FloatInterval
+from instrumentation import IterationRecorder
+from interval import Interval
+from intervals import Intervals
+
+
+x = sym.Symbol('x')
+FUNCTION = sym.sin(x) + sym.sin(10 * x / 3)
+BOX = [2.7, 7.5]
+E = 1e-5
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy_quantization': True}, {'operator': 'krawczyk', 'classify': True},
+                                     {'autodiff': True}], ids=['default', 'lazy', 'krawczyk', 'autodiff'])
+def test_parallel_matches_serial_options(options):
+    serial = GetCriticalPoints(FUNCTION, Interval(BOX), E, **options)
+    parallel = GetCriticalPoints(FUNCTION, Interval(BOX), E, workers=2, **options)
+    assert parallel == serial
+
+
+def test_parallel_callback():
+    serial, parallel = IterationRecorder(), IterationRecorder()
+    serial_stats, parallel_stats = {}, {}
+    GetCriticalPoints(FUNCTION, Interval(BOX), E, callback=serial, stats=serial_stats)
+    GetCriticalPoints(FUNCTION, Interval(BOX), E, workers=2, callback=parallel, stats=parallel_stats)
+    assert len(parallel.history) == len(serial.history) == serial_stats['iterations'] == parallel_stats['iterations']
+    assert [info.iteration for info in parallel.history] == list(range(1, len(serial.history) + 1))
+
+
+@pytest.mark.parametrize('options', [{'hybrid': False}, {'adaptive_precision': True}])
+def test_parallel_rejects_serial_only_options(options):
+    with pytest.raises(ValueError):
+        GetCriticalPoints(FUNCTION, Interval(BOX), E, workers=2, **options)
+
+
+def _contains(box, value):
+    return mpmath.mpf(str(box.x[0])) <= value <= mpmath.mpf(str(box.x[1]))
+
+
+# (функция, отрезок, точки глобального минимума); внутренние точки уточняются mpmath по нулю производной,
+# концы отрезка берутся как есть
+GLOBAL_MINIMA = [
+    (FUNCTION, BOX, [5.1457]),
+    (sym.cos(x), [0, 10], [mpmath.pi, 3 * mpmath.pi]),
+    (x ** 3 - 3 * x, [-3, 2], [-3]),
+    (x ** 2, [-1, 2], [0]),
+]
+
+
+@pytest.mark.parametrize('backend', [Interval, FloatInterval])
+@pytest.mark.parametrize('function, box, minima', GLOBAL_MINIMA, ids=[str(case[0]) for case in GLOBAL_MINIMA])
+def test_global_minimum_contains_exact_minima(backend, function, box, minima):
+    exact = sym.lambdify(x, function, 'mpmath')
+    diff = sym.lambdify(x, sym.diff(function, x), 'mpmath')
+    minima = [point if point in box else mpmath.findroot(diff, point) for point in minima]
+    result = GetGlobalMinimum(function, backend(box), 1e-6)
+    for point in minima:
+        assert any(_contains(piece, point) for piece in result.x)
+        assert _contains(result.value, exact(point))
+    assert result.x.sum_width() < 1e-5
+
+
+def _derivative_roots(function, box, samples=2000):
+    # Корни f' на отрезке: смены знака на мелкой сетке, уточненные mpmath
+    diff = sym.lambdify(x, sym.diff(function, x), 'mpmath')
+    points = mpmath.linspace(box[0], box[1], samples)
+    return [mpmath.findroot(diff, (left, right), solver='anderson')
+            for left, right in zip(points, points[1:]) if diff(left) * diff(right) < 0]
+
+
+@pytest.mark.parametrize('operator', ['newton', 'hansen-sengupta', 'krawczyk'])
+@pytest.mark.parametrize('backend', [Interval, FloatInterval])
+def test_unique_boxes_hold_one_root(operator, backend):
+    roots = _derivative_roots(FUNCTION, BOX)
+    conversion, points = GetCriticalPoints(FUNCTION, backend(BOX), E, classify=True, operator=operator)
+    # Концы отрезка GetCriticalPoints добавляет в конец списка
+    interior = points[:-2]
+    assert conversion and len(interior) == len(roots)
+    for root in roots:
+        assert sum(_contains(point.interval, root) for point in interior) == 1
+    assert all(point.unique for point in interior)
+
+
+def test_double_root_is_not_certified():
+    # f' = (x - 1)^2: корень кратный, единственность шагом Ньютона не доказывается
+    conversion, points = GetCriticalPoints((x - 1) ** 3 / 3, Interval([0, 3]), E, classify=True)
+    assert any(_contains(point.interval, 1) for point in points)
+    assert not any(point.unique for point in points)
+
+
+def test_operators_find_the_same_boxes():
+    newton = GetCriticalPoints(FUNCTION, Interval(BOX), E, operator='newton')
+    assert GetCriticalPoints(FUNCTION, Interval(BOX), E, operator='hansen-sengupta') == newton
+
+
+def _drain(generator):
+    # Все точки генератора и его возвращаемое значение (conversion)
+    points = []
+    while True:
+        try:
+            points.append(next(generator))
+        except StopIteration as stop:
+            return stop.value, points
+
+
+@pytest.mark.parametrize('order', ['promise', 'width'])
+@pytest.mark.parametrize('backend', [Interval, FloatInterval])
+def test_iter_matches_get_critical_points(order, backend):
+    conversion, points = _drain(IterCriticalPoints(FUNCTION, backend(BOX), E, order=order))
+    expected_conversion, expected = GetCriticalPoints(FUNCTION, backend(BOX), E, classify=True)
+    assert conversion == expected_conversion
+    merged = Intervals([point.interval for point in points], backend)
+    assert merged == Intervals([point.interval for point in expected], backend)
+    assert {point.type for point in points} == {point.type for point in expected}
+    assert all(point.unique for point in points[2:])
+
+
+def test_iter_stops_solving_early():
+    full, partial = {}, {}
+    list(IterCriticalPoints(FUNCTION, Interval(BOX), E, stats=full))
+    generator = IterCriticalPoints(FUNCTION, Interval(BOX), E, stats=partial)
+    first = [next(generator) for _ in range(3)]
+    generator.close()
+    # Концы отрезка, затем первая внутренняя точка
+    assert [point.interval.x for point in first[:2]] == [(end, end) for end in Interval(BOX).x]
+    assert first[2].interval.width() <= E
+    assert 0 < partial['iterations'] < full['iterations']
+
+
+@pytest.mark.parametrize('e, backend', [(1e-3, FloatInterval), (Decimal('1e-10'), FloatInterval),
+                                        (1e-12, Interval)])
+def test_default_backend_follows_e(e, backend):
+    assert DefaultBackend(e) is backend
+    _, points = GetCriticalPoints(FUNCTION, BOX, e)
+    assert points and all(isinstance(point, backend) for point in points)
@@ -0,0 +1,190 @@
+import contextlib
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import mpmath
+import pytest
+
+import main
+from critical_points import GetCriticalPoints
+from float_interval import FloatInterval
+from interval import Interval
+from interval_array import (IntervalArray, array_atan, array_cos, array_cosh, array_exp, array_log, array_sin,
+                            array_sinh, array_sqrt, array_tan)
+
+
+# Проверки внешнего округления: результат каждой операции должен содержать точные (mpmath) значения
+# функции в концах, внутренних точках и точках экстремумов бруса для всех backend и режимов округления.
+# Проверки решателей: параллельный и векторизованный GetCriticalPoints на all_tests.txt против последовательного.
+
+mpmath.mp.dps = 80
+TOLERANCE = mpmath.mpf(10) ** -70
+
+BOXES = 150
+
+UNARY = {
+    'neg': (lambda x: -x, lambda v: -v),
+    'abs': (abs, abs),
+    'square': (lambda x: x ** 2, lambda v: v ** 2),
+    'cube': (lambda x: x ** 3, lambda v: v ** 3),
+    'exp': ('exp', mpmath.exp),
+    'sin': ('sin', mpmath.sin),
+    'cos': ('cos', mpmath.cos),
+    'tan': ('tan', mpmath.tan),
+    'atan': ('atan', mpmath.atan),
+    'sinh': ('sinh', mpmath.sinh),
+    'cosh': ('cosh', mpmath.cosh),
+}
+
+# Функции, определенные только при x >= 0 (ln и отрицательная степень - при x > 0)
+POSITIVE = {
+    'ln': ('ln', mpmath.log),
+    'sqrt': ('sqrt', mpmath.sqrt),
+    'power 1.5': (lambda x: x ** 1.5, lambda v: v ** mpmath.mpf(1.5)),
+    'inverse square': (lambda x: x ** -2, lambda v: v ** -2),
+}
+
+BINARY = {
+    'add': (lambda x, y: x + y, lambda u, v: u + v),
+    'sub': (lambda x, y: x - y, lambda u, v: u - v),
+    'mul': (lambda x, y: x * y, lambda u, v: u * v),
+    'div': (lambda x, y: x / y, lambda u, v: u / v),
+}
+
+ARRAY_FUNCTIONS = {'exp': array_exp, 'ln': array_log, 'sqrt': array_sqrt, 'sin': array_sin, 'cos': array_cos,
+                   'tan': array_tan, 'atan': array_atan, 'sinh': array_sinh, 'cosh': array_cosh}
+
+
+def _interval(lower, upper):
+    return Interval([lower, upper])
+
+
+def _float_interval(lower, upper):
+    return FloatInterval([float(lower), float(upper)])
+
+
+def _interval_array(lower, upper):
+    return IntervalArray([float(lower)], [float(upper)])
+
+
+def _ends(result):
+    if isinstance(result, IntervalArray):
+        return result.lower[0], result.upper[0]
+    return result.x
+
+
+def _mpf(value):
+    # Decimal('Infinity') mpmath из строки не разбирает
+    if isinstance(value, Decimal):
+        return mpmath.mpf(str(value)) if value.is_finite() else mpmath.mpf(float(value))
+    return mpmath.mpf(value)
+
+
+BACKENDS = {
+    'Interval': (_interval, contextlib.nullcontext),
+    'Interval lazy': (_interval, Interval.deferredquantization),
+    'FloatInterval': (_float_interval, contextlib.nullcontext),
+    'IntervalArray': (_interval_array, contextlib.nullcontext),
+}
+
+
+def _apply(function, backend, *arguments):
+    if not isinstance(function, str):
+        return function(*arguments)
+    if backend == 'IntervalArray':
+        return ARRAY_FUNCTIONS[function](*arguments)
+    return getattr(type(arguments[0]), function)(*arguments)
+
+
+def _samples(lower, upper, count=9):
+    # Концы, равномерная сетка внутри и точки k*pi/2 (экстремумы sin, cos; 0 - минимум abs, cosh, x^2)
+    points = [lower + (upper - lower) * k / (count - 1) for k in range(count)]
+    half_pi = mpmath.pi / 2
+    k = mpmath.ceil(lower / half_pi)
+    while k * half_pi <= upper:
+        points.append(k * half_pi)
+        k += 1
+    return points
+
+
+def _boxes(seed, low, high, count=BOXES):
+    generator = random.Random(seed)
+    boxes = []
+    for i in range(count):
+        lower = generator.uniform(low, high)
+        width = 0 if i % 10 == 0 else generator.choice([1e-6, 1e-2, 1, 3]) * generator.random()
+        boxes.append((f"{lower:.6f}", f"{lower + width:.6f}"))
+    return boxes
+
+
+def _check(result, values):
+    # Допуск - на собственную погрешность mpmath (80 знаков), много меньшую погрешностей backend
+    lower, upper = (_mpf(end) for end in _ends(result))
+    missed = [value for value in values
+              if not lower - TOLERANCE * max(1, abs(value)) <= value <= upper + TOLERANCE * max(1, abs(value))]
+    assert not missed, f"{_ends(result)} does not contain {missed[0]}"
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('name', list(UNARY) + list(POSITIVE))
+def test_unary_enclosure(backend, name):
+    make, mode = BACKENDS[backend]
+    function, exact = {**UNARY, **POSITIVE}[name]
+    low = 1e-3 if name in ('ln', 'inverse square') else 0 if name in POSITIVE else -4
+    with mode():
+        for lower, upper in _boxes(name, low, 4):
+            x = make(lower, upper)
+            result = _apply(function, backend, x)
+            _check(result, [exact(point) for point in _samples(*(_mpf(end) for end in _ends(x)))])
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('name', BINARY)
+def test_binary_enclosure(backend, name):
+    make, mode = BACKENDS[backend]
+    function, exact = BINARY[name]
+    with mode():
+        for i, ((a, b), (c, d)) in enumerate(zip(_boxes(name, -4, 4), _boxes(name + ' divisor', 0.5, 4))):
+            # Делитель не содержит 0: положительный или отрицательный через раз
+            x, y = make(a, b), make(c, d) if i % 2 else -make(c, d)
+            result = _apply(function, backend, x, y)
+            _check(result, [exact(u, v) for u in _samples(*(_mpf(end) for end in _ends(x)), 3)
+                            for v in _samples(*(_mpf(end) for end in _ends(y)), 3)])
+
+
+@pytest.mark.parametrize('backend', ['Interval', 'Interval lazy', 'FloatInterval'])
+def test_rational_power_enclosure(backend):
+    make, mode = BACKENDS[backend]
+    with mode():
+        for lower, upper in _boxes('rational power', 0, 4):
+            x = make(lower, upper)
+            result = x ** Fraction(1, 3)
+            _check(result, [mpmath.cbrt(point) for point in _samples(*(_mpf(end) for end in _ends(x)))])
+
+
+TESTS = main.ReadTests('all_tests.txt')
+
+
+def _found(critical_points, expected, e):
+    return any(point.isAround(expected) or abs(point.mid() - type(point.mid())(expected)) < e
+               for point in critical_points)
+
+
+@pytest.mark.parametrize('test', TESTS)
+def test_parallel_matches_serial(test):
+    expression, ends, e, expected = main.ParseTest(test)
+    serial = GetCriticalPoints(expression, Interval(ends), e / 10)
+    parallel = GetCriticalPoints(expression, Interval(ends), e / 10, workers=2)
+    assert parallel == serial
+
+
+@pytest.mark.parametrize('test', TESTS)
+@pytest.mark.parametrize('options', [{'vectorized': True}, {'lazy_quantization': True}, {'autodiff': True}],
+                         ids=['vectorized', 'lazy', 'autodiff'])
+def test_finds_serial_points(test, options):
+    expression, ends, e, expected = main.ParseTest(test)
+    _, serial = GetCriticalPoints(expression, Interval(ends), e / 10)
+    _, result = GetCriticalPoints(expression, Interval(ends), e / 10, **options)
+    assert _found(serial, expected, e)
+    assert _found(result, expected, e)
@@ -0,0 +1,73 @@
+import pytest
+import sympy as sym
+
+from expression_cache import BackendPrecision, ExpressionCache
+from float_interval import FloatInterval
+from interval import Interval
+
+
+x = sym.Symbol('x')
+
+
+def test_lru_eviction_and_stats():
+    cache = ExpressionCache(max_size=2)
+    builds = []
+
+    def build(value):
+        return lambda: builds.append(value) or value
+
+    assert cache.get('a', build(1)) == 1
+    assert cache.get('b', build(2)) == 2
+    assert cache.get('a', build(0)) == 1
+    assert cache.get('c', build(3)) == 3
+    assert cache.get('b', build(4)) == 4
+    assert builds == [1, 2, 3, 4]
+    assert cache.stats() == (1, 4, 0, 2, 2)
+    cache.clear()
+    assert cache.stats() == (0, 0, 0, 0, 0)
+
+
+def test_rejects_empty_cache():
+    with pytest.raises(ValueError):
+        ExpressionCache(max_size=0)
+
+
+def test_derivatives_are_cached():
+    cache = ExpressionCache()
+    func = cache.parse('sin(x) * x ** 2')
+    assert cache.parse(' sin(x) * x ** 2 ') is func
+    first = cache.derivatives(func, x, 2)
+    assert first == [func, sym.diff(func, x), sym.diff(func, x, 2)]
+    assert cache.derivatives(func, x, 2) == first
+    assert cache.stats().hits == 2
+
+
+def test_disk_level_survives_new_cache(tmp_path):
+    func = sym.exp(x) * sym.cos(x)
+    ExpressionCache(directory=str(tmp_path)).derivatives(func, x, 2)
+    cache = ExpressionCache(directory=str(tmp_path))
+    assert cache.derivatives(func, x, 2) == [func, sym.diff(func, x), sym.diff(func, x, 2)]
+    assert cache.stats().disk_hits == 1
+
+
+def test_corrupt_disk_entry_is_rebuilt(tmp_path):
+    ExpressionCache(directory=str(tmp_path)).parse('x + 1')
+    for path in tmp_path.iterdir():
+        path.write_text('{broken')
+    cache = ExpressionCache(directory=str(tmp_path))
+    assert cache.parse('x + 1') == x + 1
+    assert cache.stats().disk_hits == 0
+
+
+def test_compile_key_depends_on_backend_precision():
+    cache = ExpressionCache()
+    expressions = [x / 3]
+    first = cache.compile(expressions, x, Interval)
+    assert cache.compile(expressions, x, Interval) is first
+    with Interval.workingprecision(20, 60):
+        assert cache.compile(expressions, x, Interval) is not first
+    with Interval.deferredquantization():
+        assert BackendPrecision(Interval) == (Interval.precision, Interval.calcprecision, 1)
+        assert cache.compile(expressions, x, Interval) is not first
+    assert cache.compile(expressions, x, FloatInterval) is not first
+    assert BackendPrecision(FloatInterval) == (None, None, None)
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from float_interval import FloatInterval
+from instrumentation import OPERATIONS, OperationCounter
+from interval import Interval
+
+
+@pytest.mark.parametrize('cls', [Interval, FloatInterval])
+def test_counts_every_operation(cls):
+    x = cls([1, 2])
+    with OperationCounter(classes=(cls,)) as counter:
+        -x, abs(x), x + x, 1 + x, x - x, 1 - x, x * x, 2 * x, x / x, x ** 2
+        for name in ['sin', 'cos', 'tan', 'atan', 'sinh', 'cosh', 'exp', 'ln', 'sqrt']:
+            getattr(cls, name)(x)
+    assert set(OPERATIONS) <= {key.split('.')[1] for key in counter.counts}
+
+
+def test_counts_only_inside_block():
+    x = Interval([1, 2])
+    counter = OperationCounter()
+    x + x
+    with counter:
+        x + x
+    x + x
+    assert counter.counts == {'Interval.__add__': 1}
+
+
+def test_overlapping_counters():
+    x = Interval([1, 2])
+    outer, inner = OperationCounter(), OperationCounter(timing=True)
+    outer.__enter__()
+    inner.__enter__()
+    Interval.sqrt(x)
+    outer.__exit__(None, None, None)
+    Interval.sqrt(x)
+    inner.__exit__(None, None, None)
+    Interval.sqrt(x)
+    assert outer.counts == {'Interval.sqrt': 1}
+    assert inner.counts == {'Interval.sqrt': 2}
+    assert inner.metrics()['interval.Interval.sqrt.seconds'] > 0
+
+
+def test_other_threads_are_not_counted():
+    x = Interval([1, 2])
+    started, stop = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        while not stop.is_set():
+            x * x
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    started.wait()
+    try:
+        with OperationCounter() as counter:
+            for _ in range(100):
+                x * x
+    finally:
+        stop.set()
+        thread.join()
+    assert counter.counts == {'Interval.__mul__': 100}
@@ -0,0 +1,25 @@
+import pytest
+
+from interval import Interval
+
+
+# Интервал NaN (результат функции вне области определения) проходит через операции без исключений
+NAN_OPERATIONS = {
+    'add': lambda x: x + 1,
+    'radd': lambda x: 1 + x,
+    'mul': lambda x: x * Interval([-1, 3]),
+    'rmul': lambda x: Interval([-1, 3]) * x,
+    'neg': lambda x: -x,
+    'abs': abs,
+    'power': lambda x: x ** 2,
+    'sqrt': Interval.sqrt,
+}
+
+
+@pytest.mark.parametrize('name', NAN_OPERATIONS)
+@pytest.mark.parametrize('nan', [lambda: Interval(['nan', 'nan']), lambda: Interval.ln(Interval([-2, -1]))],
+                         ids=['constructor', 'ln'])
+def test_nan_interval(nan, name):
+    result = NAN_OPERATIONS[name](nan())
+    assert result.x[0].is_nan() and result.x[1].is_nan()
+    assert repr(result) == '[NaN, NaN]'
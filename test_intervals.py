@@ -0,0 +1,81 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from float_interval import FloatInterval
+from interval import Interval
+from intervals import Intervals
+
+
+def _random_boxes(generator, count):
+    boxes = []
+    for _ in range(count):
+        lower = generator.randint(-100, 100)
+        boxes.append((lower, lower + generator.randint(0, 10)))
+    return boxes
+
+
+def _merged(boxes):
+    # Эталон: объединение пересекающихся и соприкасающихся отрезков
+    result = []
+    for lower, upper in sorted(boxes):
+        if result and result[-1][1] >= lower:
+            result[-1] = (result[-1][0], max(result[-1][1], upper))
+        else:
+            result.append((lower, upper))
+    return result
+
+
+def _intersection(first, second):
+    # Эталон: попарные пересечения отрезков двух объединений
+    return _merged([(max(a, c), min(b, d)) for a, b in _merged(first) for c, d in _merged(second)
+                    if max(a, c) <= min(b, d)])
+
+
+def _ends(intervals):
+    return [(int(interval.x[0]), int(interval.x[1])) for interval in intervals]
+
+
+def _make(backend, boxes):
+    return Intervals([backend([lower, upper]) for lower, upper in boxes], backend)
+
+
+@pytest.mark.parametrize('backend', [Interval, FloatInterval])
+@pytest.mark.parametrize('seed', range(20))
+def test_set_algebra_matches_reference(backend, seed):
+    generator = random.Random(seed)
+    first = _random_boxes(generator, generator.randint(0, 30))
+    second = _random_boxes(generator, generator.randint(0, 30))
+
+    assert _ends(_make(backend, first)) == _merged(first)
+
+    appended = _make(backend, [])
+    for lower, upper in first:
+        appended.append(backend([lower, upper]))
+    assert _ends(appended) == _merged(first)
+
+    union = _make(backend, first)
+    union.union(_make(backend, second))
+    assert _ends(union) == _merged(first + second)
+
+    intersection = _make(backend, first)
+    intersection.intersect(_make(backend, second))
+    assert _ends(intersection) == _intersection(first, second)
+
+    assert _ends(-_make(backend, first)) == [(-upper, -lower) for lower, upper in reversed(_merged(first))]
+
+
+def test_inputs_are_not_mutated():
+    boxes = [Interval([3, 5]), Interval([0, 1]), Interval([1, 2])]
+    intervals = Intervals(boxes)
+    intervals.append(Interval([4, 8]))
+    intervals.union(Intervals([Interval([-1, 0])]))
+    assert [box.x for box in boxes] == [Interval([3, 5]).x, Interval([0, 1]).x, Interval([1, 2]).x]
+    assert _ends(intervals) == [(-1, 2), (3, 8)]
+
+
+def test_division_by_interval_with_zero():
+    result = Intervals([Interval([1, 2])]) / Intervals([Interval([-1, 1])])
+    assert len(result) == 2
+    assert result[0].x == (Decimal('-Infinity'), -1) and result[1].x == (1, Decimal('Infinity'))
@@ -0,0 +1,48 @@
+import math
+
+import pytest
+import sympy as sym
+
+from critical_points import Extrema
+from float_interval import FloatInterval
+from interval import Interval
+from multivariate import GetCriticalPointsND, IntervalVector
+
+
+x, y = sym.symbols('x y')
+
+# (функция, брус, точные критические точки с типами)
+CASES = [
+    (x ** 3 - 3 * x + y ** 2, [(-2, 2), (-1, 1)], {(-1, 0): Extrema.Saddle, (1, 0): Extrema.Minimum}),
+    (sym.sin(x) * sym.cos(y), [(-2, 2), (-2, 2)],
+     {(math.pi / 2, 0): Extrema.Maximum, (-math.pi / 2, 0): Extrema.Minimum,
+      (0, math.pi / 2): Extrema.Saddle, (0, -math.pi / 2): Extrema.Saddle}),
+    (-(x ** 2) - 2 * y ** 2 + x * y, [(-1, 1.5), (-1, 1.5)], {(0, 0): Extrema.Maximum}),
+]
+
+
+def _contains(box, point):
+    return all(float(value[0]) <= coordinate <= float(value[1]) for value, coordinate in zip(box, point))
+
+
+@pytest.mark.parametrize('split', ['widest', 'smear'])
+@pytest.mark.parametrize('backend', [Interval, FloatInterval])
+@pytest.mark.parametrize('function, box, expected', CASES, ids=[str(case[0]) for case in CASES])
+def test_finds_and_classifies_critical_points(function, box, expected, backend, split):
+    conversion, points = GetCriticalPointsND(function, IntervalVector(box, backend), 1e-6, [x, y], classify=True,
+                                             split=split)
+    assert conversion and len(points) == len(expected)
+    for exact, point_type in expected.items():
+        found = [point for point in points if _contains(point.interval, exact)]
+        assert len(found) == 1
+        assert found[0].type == point_type and found[0].unique
+        assert found[0].interval.width() <= 1e-6
+
+
+def test_no_critical_points():
+    assert GetCriticalPointsND(x + y ** 2, [(-1, 1), (-1, 1)], 1e-6, [x, y]) == (True, [])
+
+
+def test_max_boxes_keeps_unfinished_boxes():
+    conversion, boxes = GetCriticalPointsND(sym.sin(x) * sym.cos(y), [(-2, 2), (-2, 2)], 1e-6, [x, y], max_boxes=3)
+    assert not conversion and boxes